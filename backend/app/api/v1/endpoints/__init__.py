@@ -2,10 +2,20 @@ from .auth import router as auth_router
 from .applications import router as applications_router
 from .analytics import router as analytics_router
 from .links import router as links_router
+from .events import router as events_router
+from .files import router as files_router
+from .admin import router as admin_router
+from .agent import router as agent_router
+from .health import router as health_router
 
 __all__ = [
     'auth_router',
     'applications_router',
     'analytics_router',
-    'links_router'
+    'links_router',
+    'events_router',
+    'files_router',
+    'admin_router',
+    'agent_router',
+    'health_router'
 ] 
\ No newline at end of file
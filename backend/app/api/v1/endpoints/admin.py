@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from typing import Dict, Optional
+import hmac
+
+from app.core.config import settings
+from app.core.deadlines import timeout_counts
+from app.core.query_profiler import slow_query_log
+from app.core.response_cache import response_cache
+from app.core.single_flight import single_flight
+
+router = APIRouter()
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    # Admin routes are invisible unless a token is configured
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@router.get("/slow-queries", response_model=Dict, dependencies=[Depends(require_admin)])
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    collection: Optional[str] = Query(None, description="Only commands on this collection")
+) -> Dict:
+    entries = slow_query_log.recent()
+    if collection:
+        entries = [entry for entry in entries if entry["collection"] == collection]
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "explain_sample_rate": slow_query_log.sample_rate,
+        "entries": entries[:limit]
+    }
+
+@router.get("/timeouts", response_model=Dict, dependencies=[Depends(require_admin)])
+async def get_timeouts() -> Dict:
+    """Requests that ran out of their deadline on this worker, by method and route template."""
+    return {"timeouts": dict(timeout_counts)}
+
+@router.get("/coalescing", response_model=Dict, dependencies=[Depends(require_admin)])
+async def get_coalescing() -> Dict:
+    """Identical concurrent reads this worker answered from one Mongo call,
+    by route, alongside the response cache they sit in front of."""
+    return {
+        "single_flight": {
+            **single_flight.stats,
+            "in_flight": single_flight.in_flight(),
+            "coalesced_by_route": dict(single_flight.coalesced_by_route)
+        },
+        "response_cache": response_cache.stats
+    }
@@ -1,24 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.encoders import jsonable_encoder
 from typing import Optional
 from datetime import datetime
-import boto3
-from botocore.exceptions import ClientError
-import os
+from bson import ObjectId
+from pymongo import ReturnDocument
 
 from app.models.agent import AgentInDB, AgentSettings
 from app.core.database import mongodb
 from app.api.v1.endpoints.auth import get_current_agent
-from app.core.config import settings
+from app.core.storage import StorageError, get_storage
+from app.core.images import InvalidImage, store_image_variants
+from app.core.response_cache import branding_cache
 
 router = APIRouter()
 
-# Initialize S3 client
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.AWS_REGION
-)
+# Settings written by the image upload routes, never taken from the client
+SERVER_MANAGED_SETTINGS = {"logo_variants", "background_image_variants"}
 
 @router.get("/settings", response_model=AgentSettings)
 async def get_agent_settings(
@@ -33,18 +30,54 @@ async def update_agent_settings(
 ) -> AgentSettings:
     db = mongodb.get_db()
     
-    # Update agent settings
+    # Only the fields the client sent are written, one path each, so the
+    # rest of the subdocument survives; image variants are server-generated
+    # and only ever written by the upload routes
+    changes = jsonable_encoder(settings_update.dict(exclude_unset=True, exclude=SERVER_MANAGED_SETTINGS))
+    update = {f"settings.{name}": value for name, value in changes.items()}
+    update["updated_at"] = datetime.utcnow()
+    
+    agent = await db.agents.find_one_and_update(
+        {"_id": ObjectId(current_agent.id)},
+        {"$set": update},
+        projection={"settings": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if not agent:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    
+    # Applicant landing pages on this worker pick up the new branding immediately
+    branding_cache.invalidate(str(current_agent.id))
+    
+    return AgentSettings(**(agent.get("settings") or {}))
+
+async def replace_branding_image(current_agent: AgentInDB, file: UploadFile, kind: str, folder: str, url_field: str, variants_field: str) -> dict:
+    try:
+        # Resize and re-encode off the event loop; the original is not kept
+        storage = get_storage()
+        prefix = f"{folder}/{current_agent.id}/{datetime.utcnow().timestamp()}"
+        variants = await store_image_variants(storage, prefix, file.file, kind)
+    except InvalidImage:
+        raise HTTPException(status_code=400, detail="Unsupported or corrupt image")
+    
+    # The largest variant stands in for the single URL older clients read
+    image_url = variants[-1].url
+    
+    # Update agent settings with the new URLs
+    db = mongodb.get_db()
     await db.agents.update_one(
-        {"_id": current_agent.id},
+        {"_id": ObjectId(current_agent.id)},
         {
             "$set": {
-                "settings": settings_update.dict(),
+                f"settings.{url_field}": image_url,
+                f"settings.{variants_field}": [variant.dict() for variant in variants],
                 "updated_at": datetime.utcnow()
             }
         }
     )
+    branding_cache.invalidate(str(current_agent.id))
     
-    return settings_update
+    return {"url": image_url, "variants": [variant.dict() for variant in variants]}
 
 @router.post("/settings/logo")
 async def upload_logo(
@@ -52,35 +85,9 @@ async def upload_logo(
     current_agent: AgentInDB = Depends(get_current_agent)
 ):
     try:
-        # Generate a unique filename
-        file_extension = file.filename.split('.')[-1]
-        filename = f"logos/{current_agent.id}/{datetime.utcnow().timestamp()}.{file_extension}"
-        
-        # Upload to S3
-        s3_client.upload_fileobj(
-            file.file,
-            settings.AWS_BUCKET_NAME,
-            filename,
-            ExtraArgs={'ACL': 'public-read'}
-        )
-        
-        # Generate the public URL
-        logo_url = f"https://{settings.AWS_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{filename}"
-        
-        # Update agent settings with the new logo URL
-        db = mongodb.get_db()
-        await db.agents.update_one(
-            {"_id": current_agent.id},
-            {
-                "$set": {
-                    "settings.logo_url": logo_url,
-                    "updated_at": datetime.utcnow()
-                }
-            }
-        )
-        
-        return {"logo_url": logo_url}
-    except ClientError as e:
+        result = await replace_branding_image(current_agent, file, "logo", "logos", "logo_url", "logo_variants")
+        return {"logo_url": result["url"], "logo_variants": result["variants"]}
+    except StorageError as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload logo: {str(e)}")
     finally:
         file.file.close()
@@ -91,35 +98,9 @@ async def upload_background(
     current_agent: AgentInDB = Depends(get_current_agent)
 ):
     try:
-        # Generate a unique filename
-        file_extension = file.filename.split('.')[-1]
-        filename = f"backgrounds/{current_agent.id}/{datetime.utcnow().timestamp()}.{file_extension}"
-        
-        # Upload to S3
-        s3_client.upload_fileobj(
-            file.file,
-            settings.AWS_BUCKET_NAME,
-            filename,
-            ExtraArgs={'ACL': 'public-read'}
-        )
-        
-        # Generate the public URL
-        background_url = f"https://{settings.AWS_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{filename}"
-        
-        # Update agent settings with the new background URL
-        db = mongodb.get_db()
-        await db.agents.update_one(
-            {"_id": current_agent.id},
-            {
-                "$set": {
-                    "settings.background_image_url": background_url,
-                    "updated_at": datetime.utcnow()
-                }
-            }
-        )
-        
-        return {"background_url": background_url}
-    except ClientError as e:
+        result = await replace_branding_image(current_agent, file, "background", "backgrounds", "background_image_url", "background_image_variants")
+        return {"background_url": result["url"], "background_image_variants": result["variants"]}
+    except StorageError as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload background: {str(e)}")
     finally:
-        file.file.close() 
\ No newline at end of file
+        file.file.close()
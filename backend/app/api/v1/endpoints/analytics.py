@@ -1,127 +1,234 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import logging
 
 from app.models.agent import AgentInDB
 from app.models.application import ApplicationStatus
 from app.core.database import mongodb
 from app.core.auth import get_current_agent
+from app.core.lifecycle import ARCHIVE_COLLECTION
+from app.core.response_cache import serve_with_etag
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+class TimeGranularity(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+# How far back to look when no start date is given
+DEFAULT_PERIODS = {
+    TimeGranularity.DAY: 30,
+    TimeGranularity.WEEK: 4,
+    TimeGranularity.MONTH: 12,
+}
+
+PERIOD_LABEL_FORMATS = {
+    TimeGranularity.DAY: "%Y-%m-%d",
+    TimeGranularity.WEEK: "%Y-%m-%d",
+    TimeGranularity.MONTH: "%Y-%m",
+}
+
+def resolve_timezone(agent: AgentInDB, name: Optional[str]) -> ZoneInfo:
+    name = name or agent.settings.timezone or "UTC"
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {name}")
+
+def as_utc(moment: datetime) -> datetime:
+    # Naive datetimes are treated as UTC, matching how they are stored
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+def match_with_archive(query: Dict) -> List[Dict]:
+    # Closed applications move to the archive after ARCHIVE_AFTER_DAYS but
+    # still count towards every total
+    return [
+        {"$match": query},
+        {"$unionWith": {"coll": ARCHIVE_COLLECTION, "pipeline": [{"$match": query}]}}
+    ]
+
+def truncate_to_period(moment: datetime, granularity: TimeGranularity, zone: ZoneInfo) -> datetime:
+    local = moment.astimezone(zone).replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == TimeGranularity.WEEK:
+        local -= timedelta(days=local.weekday())
+    elif granularity == TimeGranularity.MONTH:
+        local = local.replace(day=1)
+    # Re-attach the zone so the offset matches the new wall time across DST
+    return local.replace(tzinfo=zone).astimezone(timezone.utc)
+
+async def count_by_period(
+    db,
+    agent_id: str,
+    granularity: TimeGranularity,
+    zone: ZoneInfo,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    label_format: Optional[str] = None
+) -> List[Dict]:
+    """Count applications per day/week/month in the agent's timezone.
+
+    One aggregation regardless of range length: $dateTrunc buckets the
+    matches, $densify adds the empty buckets, and a second $dateTrunc pass
+    snaps densified points back onto local bucket starts (densify steps in
+    UTC, so DST would otherwise shift them by an hour).
+    """
+    end = as_utc(end_date) if end_date else datetime.now(timezone.utc)
+    if start_date:
+        start = as_utc(start_date)
+    elif granularity == TimeGranularity.MONTH:
+        start = end - timedelta(days=31 * DEFAULT_PERIODS[granularity])
+    elif granularity == TimeGranularity.WEEK:
+        start = end - timedelta(weeks=DEFAULT_PERIODS[granularity])
+    else:
+        start = end - timedelta(days=DEFAULT_PERIODS[granularity])
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+    
+    first_bucket = truncate_to_period(start, granularity, zone)
+    truncate = {
+        "unit": granularity.value,
+        "timezone": zone.key,
+        "startOfWeek": "monday"
+    }
+    
+    pipeline = [
+        *match_with_archive({
+            "agent_id": agent_id,
+            "created_at": {"$gte": start, "$lt": end}
+        }),
+        {"$group": {
+            "_id": {"$dateTrunc": {"date": "$created_at", **truncate}},
+            "count": {"$sum": 1}
+        }},
+        {"$project": {"_id": 0, "bucket": "$_id", "count": 1}},
+        {"$densify": {
+            "field": "bucket",
+            "range": {"step": 1, "unit": granularity.value, "bounds": [first_bucket, end]}
+        }},
+        {"$group": {
+            "_id": {"$dateTrunc": {"date": "$bucket", **truncate}},
+            "count": {"$sum": {"$ifNull": ["$count", 0]}}
+        }},
+        {"$sort": {"_id": 1}},
+        {"$project": {
+            "_id": 0,
+            "start": "$_id",
+            "period": {"$dateToString": {
+                "date": "$_id",
+                "format": label_format or PERIOD_LABEL_FORMATS[granularity],
+                "timezone": zone.key
+            }},
+            "count": 1
+        }}
+    ]
+    return await db.applications.aggregate(pipeline).to_list(length=None)
+
+async def build_dashboard_analytics(
+    db,
+    current_agent: AgentInDB,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+) -> Dict:
+    # Build base query with date range if provided
+    base_query = {"agent_id": str(current_agent.id)}
+    if start_date and end_date:
+        base_query["created_at"] = {
+            "$gte": start_date,
+            "$lte": end_date
+        }
+    elif start_date:
+        base_query["created_at"] = {"$gte": start_date}
+    elif end_date:
+        base_query["created_at"] = {"$lte": end_date}
+    
+    # Count every status in one pass over the hot and archived applications
+    status_counts = {
+        bucket["_id"]: bucket["count"]
+        for bucket in await db.applications.aggregate([
+            *match_with_archive(base_query),
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]).to_list(length=None)
+    }
+    total_applications = sum(status_counts.values())
+    submitted_applications = status_counts.get(ApplicationStatus.SUBMITTED.value, 0)
+    in_review_applications = status_counts.get(ApplicationStatus.IN_REVIEW.value, 0)
+    approved_applications = status_counts.get(ApplicationStatus.APPROVED.value, 0)
+    rejected_applications = status_counts.get(ApplicationStatus.REJECTED.value, 0)
+    
+    # Calculate average completion time
+    completed_query = {
+        **base_query,
+        "status": ApplicationStatus.APPROVED,
+        "document_uploaded_at": {"$exists": True},
+        "bio_submitted_at": {"$exists": True}
+    }
+    completed_applications = await db.applications.aggregate([
+        *match_with_archive(completed_query),
+        {"$project": {"document_uploaded_at": 1, "bio_submitted_at": 1}}
+    ]).to_list(length=None)
+    
+    total_time = 0
+    count = 0
+    for app in completed_applications:
+        if app.get("document_uploaded_at") and app.get("bio_submitted_at"):
+            time_diff = app["document_uploaded_at"] - app["bio_submitted_at"]
+            total_time += time_diff.total_seconds() / 60  # Convert to minutes
+            count += 1
+    
+    average_completion_time = total_time / count if count > 0 else 0
+    
+    # Get weekly breakdown
+    weekly_breakdown = [
+        {"week": bucket["period"], "count": bucket["count"]}
+        for bucket in await count_by_period(
+            db,
+            str(current_agent.id),
+            TimeGranularity.WEEK,
+            resolve_timezone(current_agent, None),
+            start_date,
+            end_date,
+            label_format="%m/%d"
+        )
+    ]
+    
+    return {
+        "totalApplications": total_applications,
+        "submittedApplications": submitted_applications,
+        "inReviewApplications": in_review_applications,
+        "approvedApplications": approved_applications,
+        "rejectedApplications": rejected_applications,
+        "averageCompletionTime": average_completion_time,
+        "weeklyBreakdown": weekly_breakdown
+    }
+
 @router.get("/dashboard", response_model=Dict)
 async def get_dashboard_analytics(
+    request: Request,
+    response: Response,
     current_agent: AgentInDB = Depends(get_current_agent),
     start_date: Optional[datetime] = Query(None, description="Start date for analytics"),
     end_date: Optional[datetime] = Query(None, description="End date for analytics"),
 ) -> Dict:
     try:
-        db = mongodb.get_db()
-        
-        # Build base query with date range if provided
-        base_query = {"agent_id": str(current_agent.id)}
-        if start_date and end_date:
-            base_query["created_at"] = {
-                "$gte": start_date,
-                "$lte": end_date
-            }
-        elif start_date:
-            base_query["created_at"] = {"$gte": start_date}
-        elif end_date:
-            base_query["created_at"] = {"$lte": end_date}
-        
-        # Get total applications
-        total_applications = await db.applications.count_documents(base_query)
-        
-        # Get submitted applications
-        submitted_query = {**base_query, "status": ApplicationStatus.SUBMITTED}
-        submitted_applications = await db.applications.count_documents(submitted_query)
-        
-        # Get applications in review
-        in_review_query = {**base_query, "status": ApplicationStatus.IN_REVIEW}
-        in_review_applications = await db.applications.count_documents(in_review_query)
-        
-        # Get approved applications
-        approved_query = {**base_query, "status": ApplicationStatus.APPROVED}
-        approved_applications = await db.applications.count_documents(approved_query)
-        
-        # Get rejected applications
-        rejected_query = {**base_query, "status": ApplicationStatus.REJECTED}
-        rejected_applications = await db.applications.count_documents(rejected_query)
-        
-        # Calculate average completion time
-        completed_query = {
-            **base_query,
-            "status": ApplicationStatus.APPROVED,
-            "document_uploaded_at": {"$exists": True},
-            "bio_submitted_at": {"$exists": True}
-        }
-        completed_applications = await db.applications.find(completed_query).to_list(length=None)
-        
-        total_time = 0
-        count = 0
-        for app in completed_applications:
-            if app.get("document_uploaded_at") and app.get("bio_submitted_at"):
-                time_diff = app["document_uploaded_at"] - app["bio_submitted_at"]
-                total_time += time_diff.total_seconds() / 60  # Convert to minutes
-                count += 1
-        
-        average_completion_time = total_time / count if count > 0 else 0
-        
-        # Get weekly breakdown
-        weekly_breakdown = []
-        if start_date and end_date:
-            # Calculate weeks between start and end date
-            current_date = start_date
-            while current_date <= end_date:
-                next_week = current_date + timedelta(weeks=1)
-                if next_week > end_date:
-                    next_week = end_date
-                
-                count = await db.applications.count_documents({
-                    "agent_id": str(current_agent.id),
-                    "created_at": {
-                        "$gte": current_date,
-                        "$lt": next_week
-                    }
-                })
-                
-                weekly_breakdown.append({
-                    "week": current_date.strftime("%m/%d"),
-                    "count": count
-                })
-                
-                current_date = next_week
-        else:
-            # Default to last 4 weeks if no date range provided
-            for i in range(4):
-                week_start = datetime.utcnow() - timedelta(weeks=i+1)
-                week_end = datetime.utcnow() - timedelta(weeks=i)
-                
-                count = await db.applications.count_documents({
-                    "agent_id": str(current_agent.id),
-                    "created_at": {
-                        "$gte": week_start,
-                        "$lt": week_end
-                    }
-                })
-                
-                weekly_breakdown.append({
-                    "week": week_start.strftime("%m/%d"),
-                    "count": count
-                })
-        
-        return {
-            "totalApplications": total_applications,
-            "submittedApplications": submitted_applications,
-            "inReviewApplications": in_review_applications,
-            "approvedApplications": approved_applications,
-            "rejectedApplications": rejected_applications,
-            "averageCompletionTime": average_completion_time,
-            "weeklyBreakdown": weekly_breakdown[::-1]  # Reverse to show oldest week first
-        }
+        # Reporting reads go to a secondary, off the primary applicants write to
+        db = mongodb.get_db("analytics")
+        return await serve_with_etag(
+            request,
+            response,
+            str(current_agent.id),
+            lambda: build_dashboard_analytics(db, current_agent, start_date, end_date),
+            vary=current_agent.settings.timezone or "",
+            read_profile="analytics"
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching dashboard analytics: {str(e)}")
         raise HTTPException(
@@ -131,60 +238,72 @@ async def get_dashboard_analytics(
 
 @router.get("/weekly-submissions", response_model=List[Dict])
 async def get_weekly_submissions(
+    request: Request,
+    response: Response,
     current_agent: AgentInDB = Depends(get_current_agent),
     start_date: Optional[datetime] = Query(None, description="Start date for analytics"),
     end_date: Optional[datetime] = Query(None, description="End date for analytics"),
 ) -> List[Dict]:
     try:
-        db = mongodb.get_db()
+        # Reporting reads go to a secondary, off the primary applicants write to
+        db = mongodb.get_db("analytics")
         
-        if start_date and end_date:
-            # Calculate weeks between start and end date
-            weekly_data = []
-            current_date = start_date
-            while current_date <= end_date:
-                next_week = current_date + timedelta(weeks=1)
-                if next_week > end_date:
-                    next_week = end_date
-                
-                count = await db.applications.count_documents({
-                    "agent_id": current_agent.id,
-                    "created_at": {
-                        "$gte": current_date,
-                        "$lt": next_week
-                    }
-                })
-                
-                weekly_data.append({
-                    "week": current_date.strftime("%m/%d"),
-                    "count": count
-                })
-                
-                current_date = next_week
-        else:
-            # Default to last 4 weeks if no date range provided
-            weekly_data = []
-            for i in range(4):
-                week_start = datetime.utcnow() - timedelta(weeks=i+1)
-                week_end = datetime.utcnow() - timedelta(weeks=i)
-                
-                count = await db.applications.count_documents({
-                    "agent_id": current_agent.id,
-                    "created_at": {
-                        "$gte": week_start,
-                        "$lt": week_end
-                    }
-                })
-                
-                weekly_data.append({
-                    "week": week_start.strftime("%m/%d"),
-                    "count": count
-                })
+        async def weekly_submissions() -> List[Dict]:
+            buckets = await count_by_period(
+                db,
+                str(current_agent.id),
+                TimeGranularity.WEEK,
+                resolve_timezone(current_agent, None),
+                start_date,
+                end_date,
+                label_format="%m/%d"
+            )
+            return [{"week": bucket["period"], "count": bucket["count"]} for bucket in buckets]
         
-        return weekly_data[::-1]  # Reverse to show oldest week first
+        return await serve_with_etag(
+            request,
+            response,
+            str(current_agent.id),
+            weekly_submissions,
+            vary=current_agent.settings.timezone or "",
+            read_profile="analytics"
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching weekly submissions: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch weekly submissions: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+@router.get("/time-series", response_model=List[Dict])
+async def get_submissions_time_series(
+    request: Request,
+    response: Response,
+    current_agent: AgentInDB = Depends(get_current_agent),
+    granularity: TimeGranularity = Query(TimeGranularity.WEEK, description="Bucket size"),
+    tz: Optional[str] = Query(None, alias="timezone", description="IANA timezone; defaults to the agent's setting, then UTC"),
+    start_date: Optional[datetime] = Query(None, description="Start date for analytics"),
+    end_date: Optional[datetime] = Query(None, description="End date for analytics"),
+) -> List[Dict]:
+    zone = resolve_timezone(current_agent, tz)
+    try:
+        # Reporting reads go to a secondary, off the primary applicants write to
+        db = mongodb.get_db("analytics")
+        return await serve_with_etag(
+            request,
+            response,
+            str(current_agent.id),
+            lambda: count_by_period(db, str(current_agent.id), granularity, zone, start_date, end_date),
+            vary=zone.key,
+            read_profile="analytics"
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching submissions time series: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch submissions time series: {str(e)}"
+        )
@@ -1,36 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request, Response, Query
 from typing import List, Optional, Any, Dict
-from datetime import datetime, timedelta
+from datetime import datetime
 from bson import ObjectId
-import boto3
-from botocore.exceptions import ClientError
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+import asyncio
 import os
 import logging
+import re
 from pydantic import BaseModel, Field
 import tempfile
-import json
 import uuid
-import shutil
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from app.api.v1.endpoints.pdf_operations import fill_pdf_form, add_signature_to_pdf
 
 from app.models.agent import AgentInDB
-from app.models.application import ApplicationCreate, ApplicationInDB, ApplicationUpdate, ApplicationStatus, BioInfo
+from app.models.link import LinkOptions
+from app.models.application import ApplicationCreate, ApplicationInDB, ApplicationUpdate, ApplicationStatus, BioInfo, DocumentInDB, ApplicationSearchHit, ApplicationSearchResults
 from app.core.database import mongodb
 from app.core.auth import get_current_agent
 from app.core.config import settings
 from app.core.email_notifications import send_notification
+from app.core.storage import ObjectNotFound, StorageError, get_storage, object_key
+from app.core.write_coalescer import WriteCoalescer
+from app.core.response_cache import agent_writes, serve_with_etag
+from app.core.single_flight import WriteGenerations, single_flight
+from app.core.lifecycle import DUPLICATE_KEY, find_archived_application
+from app.core.health import pdf_jobs
+from app.api.v1.endpoints.links import build_link_doc, link_url, usable_link_query
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Initialize S3 client
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-    region_name=settings.AWS_REGION
-)
+# Bumped after every write to an application; part of the get_application
+# single-flight key
+application_writes = WriteGenerations()
 
 @router.post("/", response_model=ApplicationInDB)
 async def create_application(
@@ -67,19 +72,22 @@ async def create_application(
         "status": ApplicationStatus.DRAFT,
         "bio_info": default_bio_info.dict(),
         "orea_form": None,
-        "documents": [],
+        "version": 0,
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow()
     }
     
     # Insert the application
     result = await db.applications.insert_one(application_data)
+    agent_writes.bump(str(agent_id))
     application_data["id"] = str(result.inserted_id)
     
     return ApplicationInDB(**application_data)
 
 @router.get("/", response_model=List[ApplicationInDB])
 async def list_applications(
+    request: Request,
+    response: Response,
     status: Optional[ApplicationStatus] = None,
     current_agent: AgentInDB = Depends(get_current_agent)
 ) -> Any:
@@ -89,26 +97,104 @@ async def list_applications(
     if status:
         query["status"] = status
     
-    applications = await db.applications.find(query).to_list(length=None)
-    return [ApplicationInDB(**app) for app in applications]
+    # This agent's buffered autosaves must land before the watermark is read
+    await autosave_buffer.flush_group(str(current_agent.id))
+    
+    async def fetch_applications() -> List[ApplicationInDB]:
+        # Documents are loaded lazily on the detail view, never on the list
+        applications = await db.applications.find(query, {"documents": 0}).to_list(length=None)
+        for app in applications:
+            app["id"] = str(app["_id"])
+        return [ApplicationInDB(**app) for app in applications]
+    
+    return await serve_with_etag(request, response, str(current_agent.id), fetch_applications)
 
-@router.get("/{application_id}", response_model=ApplicationInDB)
-async def get_application(
-    application_id: str,
-    # current_agent: AgentInDB = Depends(get_current_agent)
+async def load_application_documents(db, application_id: str) -> List[DocumentInDB]:
+    documents = await db.application_documents.find(
+        {"application_id": application_id}
+    ).sort("uploaded_at", 1).to_list(length=None)
+    for document in documents:
+        document["id"] = str(document["_id"])
+    return [DocumentInDB(**document) for document in documents]
+
+# Fixed score given to name-prefix matches so they rank alongside text matches
+NAME_PREFIX_SCORE = 5.0
+MAX_SEARCH_TERMS = 3
+
+@router.get("/search", response_model=ApplicationSearchResults)
+async def search_applications(
+    q: str = Query(..., min_length=1, max_length=200, description="Applicant name, notes or prompt answers"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_agent: AgentInDB = Depends(get_current_agent)
 ) -> Any:
-    db = mongodb.get_db()
-    
-    application = await db.applications.find_one({
+    # Search tolerates slightly stale results, so it reads from a secondary
+    db = mongodb.get_db("search")
+    agent_id = str(current_agent.id)
+    
+    terms = q.lower().split()[:MAX_SEARCH_TERMS]
+    if not terms:
+        # A blank query matches nothing, and an empty $or is rejected by Mongo
+        return ApplicationSearchResults(items=[], total=0, page=page, page_size=page_size)
+    name_prefixes = [
+        {f"search.{name}": {"$regex": f"^{re.escape(term)}"}}
+        for term in terms
+        for name in ("first_name", "last_name")
+    ]
+    list_fields = {"documents": 0, "search": 0}
+    
+    # Weighted text matches and anchored name-prefix matches (both index-backed)
+    # are unioned, merged per application and ranked by combined score
+    pipeline = [
+        {"$match": {"agent_id": agent_id, "$text": {"$search": q}}},
+        {"$project": list_fields},
+        {"$addFields": {"score": {"$meta": "textScore"}}},
+        {"$unionWith": {
+            "coll": "applications",
+            "pipeline": [
+                {"$match": {"agent_id": agent_id, "$or": name_prefixes}},
+                {"$project": list_fields},
+                {"$addFields": {"score": NAME_PREFIX_SCORE}}
+            ]
+        }},
+        {"$group": {"_id": "$_id", "score": {"$sum": "$score"}, "application": {"$first": "$$ROOT"}}},
+        {"$sort": {"score": -1, "_id": -1}},
+        {"$facet": {
+            "items": [
+                {"$skip": (page - 1) * page_size},
+                {"$limit": page_size}
+            ],
+            "total": [{"$count": "count"}]
+        }}
+    ]
+    result = (await db.applications.aggregate(pipeline).to_list(length=1))[0]
+    
+    items = []
+    for match in result["items"]:
+        application = match["application"]
+        application["id"] = str(application["_id"])
+        application["score"] = match["score"]
+        items.append(ApplicationSearchHit(**application))
+    
+    return ApplicationSearchResults(
+        items=items,
+        total=result["total"][0]["count"] if result["total"] else 0,
+        page=page,
+        page_size=page_size
+    )
+
+async def fetch_application(db, application_id: str) -> Optional[ApplicationInDB]:
+    query = {
         "_id": ObjectId(application_id),
         #"agent_id": str(current_agent.id)
-    })
+    }
+    application = await db.applications.find_one(query, {"documents": 0})
+    if not application:
+        # Closed applications move to the archive after ARCHIVE_AFTER_DAYS
+        application = await find_archived_application(db, query, {"documents": 0})
     
     if not application:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Application not found"
-        )
+        return None
     
       # Ensure required fields for model validation
     if "_id" in application:
@@ -125,12 +211,150 @@ async def get_application(
             "prompts": {}
         }
     
-    # Make sure documents exist as an empty list
-    if "documents" not in application or not application["documents"]:
-        application["documents"] = []
+    # Documents come from their own collection
+    application["documents"] = await load_application_documents(db, application_id)
     
     return ApplicationInDB(**application)
 
+@router.get("/{application_id}", response_model=ApplicationInDB)
+async def get_application(
+    application_id: str,
+    # current_agent: AgentInDB = Depends(get_current_agent)
+) -> Any:
+    db = mongodb.get_db()
+    
+    await autosave_buffer.flush(application_id)
+    
+    # Every open applicant page refetches this; concurrent fetches share one
+    # set of reads. The write generation keeps a read that started before
+    # this caller's save, upload or confirm landed from being reused.
+    application = await single_flight.do(
+        "get_application",
+        (application_id, application_writes.get(application_id)),
+        lambda: fetch_application(db, application_id)
+    )
+    
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+    
+    return application
+
+
+@router.get("/{application_id}/documents", response_model=List[DocumentInDB])
+async def list_application_documents(
+    application_id: str
+) -> Any:
+    db = mongodb.get_db()
+    return await load_application_documents(db, application_id)
+
+
+# MongoDB error code raised when a dotted path runs through a non-document value
+PATH_NOT_VIABLE = 28
+
+def flatten_update(application_update: ApplicationUpdate) -> Dict[str, Any]:
+    """Turn an ApplicationUpdate into dotted-path $set fields.
+
+    Only fields the client actually sent are included, and nested models such
+    as bio_info are split into one path per field so a partial save doesn't
+    rewrite the whole subdocument. Free-form dicts (prompts, form_data) are
+    still set as a whole.
+    """
+    set_fields = {}
+    update_data = application_update.dict(exclude_unset=True, exclude={"version"})
+    for field, value in update_data.items():
+        if isinstance(getattr(application_update, field), BaseModel):
+            for key, subvalue in value.items():
+                set_fields[f"{field}.{key}"] = subvalue
+        else:
+            set_fields[field] = value
+    set_fields.update(search_fields(set_fields))
+    return set_fields
+
+def search_fields(set_fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Denormalized fields behind the search indexes.
+
+    Lowercased names back prefix matching (each one is set on its own, so
+    partial saves stay single-field), and prompt answers are flattened into
+    a string array because text indexes skip strings inside subdocuments.
+    """
+    derived = {}
+    for name in ("first_name", "last_name"):
+        if f"bio_info.{name}" in set_fields:
+            derived[f"search.{name}"] = (set_fields[f"bio_info.{name}"] or "").strip().lower()
+    if "bio_info.prompts" in set_fields:
+        prompts = set_fields["bio_info.prompts"] or {}
+        derived["search.prompts"] = [answer for answer in prompts.values() if isinstance(answer, str) and answer]
+    return derived
+
+async def find_and_update_application(db, query: Dict[str, Any], set_fields: Dict[str, Any]):
+    update = {"$set": set_fields, "$inc": {"version": 1}}
+    try:
+        application = await db.applications.find_one_and_update(
+            query,
+            update,
+            projection={"documents": 0},
+            return_document=ReturnDocument.AFTER
+        )
+        bump_writes(query, application)
+        return application
+    except OperationFailure as e:
+        if e.code != PATH_NOT_VIABLE:
+            raise
+    
+    # A parent subdocument is still null (e.g. orea_form on older drafts), so
+    # dotted paths can't be created under it. Redo the update as a pipeline
+    # that turns such parents into empty documents first; it runs under the
+    # same filter, so a version conflict leaves the document untouched
+    parents = {field.split(".")[0] for field in set_fields if "." in field}
+    pipeline = [
+        {"$set": {
+            parent: {"$cond": [{"$eq": [{"$type": f"${parent}"}, "object"]}, f"${parent}", {}]}
+            for parent in parents
+        }},
+        {"$set": {field: {"$literal": value} for field, value in set_fields.items()}},
+        {"$set": {"version": {"$add": [{"$ifNull": ["$version", 0]}, 1]}}}
+    ]
+    application = await db.applications.find_one_and_update(
+        query,
+        pipeline,
+        projection={"documents": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    bump_writes(query, application)
+    return application
+
+def bump_writes(query: Dict[str, Any], application: Optional[dict]) -> None:
+    application_writes.bump(str(query["_id"]))
+    if application and application.get("agent_id"):
+        agent_writes.bump(str(application["agent_id"]))
+
+async def apply_buffered_update(application_id: str, set_fields: Dict[str, Any]) -> None:
+    db = mongodb.get_db()
+    set_fields["updated_at"] = datetime.utcnow()
+    await find_and_update_application(db, {"_id": ObjectId(application_id)}, set_fields)
+
+# Autosave writes are merged per application and written once per window.
+# Reads flush it first, which only gives read-your-writes when they land on
+# the worker holding the buffer, and a crashed worker loses what it holds;
+# hence it is off unless AUTOSAVE_COALESCE_WINDOW_SECONDS is set
+autosave_buffer = WriteCoalescer(apply_buffered_update, window=settings.AUTOSAVE_COALESCE_WINDOW_SECONDS)
+
+# Applicant form saves; unversioned updates touching only these are buffered
+BUFFERED_UPDATE_FIELDS = {"bio_info", "orea_form"}
+
+def overlay_set_fields(document: Dict[str, Any], set_fields: Dict[str, Any]) -> None:
+    """Apply dotted-path $set fields to a fetched document in place."""
+    for path, value in set_fields.items():
+        *parents, name = path.split(".")
+        target = document
+        for parent in parents:
+            if not isinstance(target.get(parent), dict):
+                target[parent] = {}
+            target = target[parent]
+        target[name] = value
 
 @router.put("/{application_id}", response_model=ApplicationInDB)
 async def update_application(
@@ -139,24 +363,166 @@ async def update_application(
 ) -> Any:
     db = mongodb.get_db()
     
-    update_data = application_update.dict(exclude_unset=True)
-    update_data["updated_at"] = datetime.utcnow()
+    if (
+        settings.AUTOSAVE_COALESCE_WINDOW_SECONDS > 0
+        and application_update.version is None
+        and application_update.__fields_set__ <= BUFFERED_UPDATE_FIELDS
+    ):
+        return await buffer_application_update(db, application_id, application_update)
     
-    result = await db.applications.update_one(
-        {"_id": ObjectId(application_id)},
-        {"$set": update_data}
-    )
+    # Buffered autosaves land first so this write (and its version check) sees them
+    await autosave_buffer.flush(application_id)
+    
+    set_fields = flatten_update(application_update)
+    set_fields["updated_at"] = datetime.utcnow()
     
-    updated_application = await db.applications.find_one({
-        "_id": ObjectId(application_id)
-    })
+    query = {"_id": ObjectId(application_id)}
+    expected_version = application_update.version
+    if expected_version is not None:
+        # Applications written before versioning count as version 0
+        query["version"] = expected_version if expected_version else {"$in": [0, None]}
     
-    # Add id field for Pydantic
+    updated_application = await find_and_update_application(db, query, set_fields)
+    
+    if not updated_application:
+        if expected_version is not None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Application was modified by another request or does not exist"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+    
+    # Add id field for Pydantic; documents are left unloaded
     updated_application["id"] = str(updated_application["_id"])
     
     return ApplicationInDB(**updated_application)
 
 
+async def buffer_application_update(db, application_id: str, application_update: ApplicationUpdate) -> ApplicationInDB:
+    """Merge an applicant's form save into the write-behind buffer and answer
+    with the application as it will be once the buffer is written.
+
+    These saves are last-write-wins, so skipping the version check loses
+    nothing; the one indexed read is far cheaper than a write per save.
+    """
+    application = await db.applications.find_one({"_id": ObjectId(application_id)}, {"documents": 0})
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+    
+    autosave_buffer.add(application_id, flatten_update(application_update), group=application.get("agent_id"))
+    overlay_set_fields(application, autosave_buffer.pending(application_id))
+    application["id"] = str(application["_id"])
+    
+    return ApplicationInDB(**application)
+
+
+async def record_documents(db, application: dict, uploads: List[Dict[str, Any]]) -> List[dict]:
+    """Attach stored files to an application, move it to review and notify
+    the agent once for the whole batch.
+
+    Each upload is a dict with url, type and optionally key.
+    """
+    application_id = str(application["_id"])
+    uploaded_at = datetime.utcnow()
+    
+    # Record the documents in their own collection
+    documents = []
+    for upload in uploads:
+        document = {
+            "application_id": application_id,
+            "type": upload.get("type") or "Unknown",
+            "url": upload["url"],
+            "uploaded_at": uploaded_at
+        }
+        if upload.get("key"):
+            document["key"] = upload["key"]
+        documents.append(document)
+    if len(documents) == 1:
+        # insert_one surfaces a duplicate key as DuplicateKeyError, which
+        # callers retrying a confirm rely on; insert_many wraps it
+        await db.application_documents.insert_one(documents[0])
+    else:
+        try:
+            await db.application_documents.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            if any(error["code"] != DUPLICATE_KEY for error in e.details["writeErrors"]):
+                raise
+            # A concurrent confirm recorded some of these; the rest went in
+            duplicates = {error["index"] for error in e.details["writeErrors"]}
+            documents = [document for index, document in enumerate(documents) if index not in duplicates]
+            if not documents:
+                return documents
+    
+    # Update application with document info
+    update_data = {
+        "document_uploaded_at": uploaded_at,
+        "status": ApplicationStatus.IN_REVIEW,
+        "updated_at": uploaded_at
+    }
+    await db.applications.update_one(
+        {"_id": application["_id"]},
+        {"$set": update_data}
+    )
+    application_writes.bump(application_id)
+    agent_writes.bump(str(application["agent_id"]))
+    
+    # Send notification to agent
+    agent = await db.agents.find_one({"_id": ObjectId(application["agent_id"])})
+    if agent:
+        agent["id"] = str(agent["_id"])
+        application.update(update_data)
+        application["id"] = application_id
+        await send_notification(
+            AgentInDB(**agent),
+            ApplicationInDB(**application),
+            ", ".join(document["type"] for document in documents),
+            document_count=len(documents)
+        )
+    
+    return documents
+
+async def record_document(db, application: dict, document_url: str, document_type: Optional[str], key: Optional[str] = None) -> dict:
+    documents = await record_documents(db, application, [{"url": document_url, "type": document_type, "key": key}])
+    return documents[0]
+
+async def find_application_for_upload(db, application_id: str) -> dict:
+    await autosave_buffer.flush(application_id)
+    
+    application = await db.applications.find_one({
+        "_id": ObjectId(application_id),
+       #  "agent_id": str(current_agent.id)
+    }, {"documents": 0})
+    
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return application
+
+# Document types accepted on every upload route, and the extension each is stored under
+DOCUMENT_CONTENT_TYPES = {
+    "application/pdf": "pdf",
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/heic": "heic"
+}
+
+def check_document_file(file: UploadFile) -> None:
+    """Apply the presigned-upload limits to a file sent through the API."""
+    if file.content_type not in DOCUMENT_CONTENT_TYPES:
+        raise HTTPException(status_code=415, detail=f"Unsupported document type: {file.filename}")
+    size = file.size
+    if size is None:
+        file.file.seek(0, os.SEEK_END)
+        size = file.file.tell()
+        file.file.seek(0)
+    if size > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail=f"File too large: {file.filename}")
+
 @router.post("/{application_id}/documents")
 async def upload_document(
     application_id: str,
@@ -166,85 +532,260 @@ async def upload_document(
 ):
     db = mongodb.get_db()
     
-    # Get the application
-    application = await db.applications.find_one({
-        "_id": application_id,
-       #  "agent_id": str(current_agent.id)
-    })
-    
-    if not application:
-        raise HTTPException(status_code=404, detail="Application not found")
+    application = await find_application_for_upload(db, application_id)
     
     try:
+        check_document_file(file)
+        
         # Generate a unique filename
-        file_extension = file.filename.split('.')[-1]
+        file_extension = DOCUMENT_CONTENT_TYPES[file.content_type]
         filename = f"documents/{application_id}/{datetime.utcnow().timestamp()}.{file_extension}"
         
-        # Upload to S3
-        s3_client.upload_fileobj(
-            file.file,
-            settings.AWS_BUCKET_NAME,
-            filename,
-            ExtraArgs={'ACL': 'public-read'}
-        )
+        # Stream the upload into storage
+        storage = get_storage()
+        await storage.save(filename, file.file, content_type=file.content_type, public=True)
         
         # Generate the public URL
-        document_url = f"https://{settings.AWS_BUCKET_NAME}.s3.{settings.AWS_REGION}.amazonaws.com/{filename}"
+        document_url = storage.public_url(filename)
         
-        # Update application with document info
-        update_data = {
-            "document_url": document_url,
-            "document_uploaded_at": datetime.utcnow(),
-            "status": ApplicationStatus.IN_REVIEW
-        }
-        if document_type:
-            update_data["document_type"] = document_type
-            
-        await db.applications.update_one(
-            {"_id": application_id},
-            {"$set": update_data}
-        )
-        
-        # Send notification to agent
-        await send_notification(
-            current_agent,
-            Application(**application),
-            document_type or "Unknown"
-        )
+        await record_document(db, application, document_url, document_type, key=filename)
         
         return {"document_url": document_url}
-    except ClientError as e:
+    except StorageError as e:
         raise HTTPException(status_code=500, detail=f"Failed to upload document: {str(e)}")
     finally:
         file.file.close()
 
+@router.post("/{application_id}/documents/batch")
+async def upload_documents(
+    application_id: str,
+    files: List[UploadFile] = File(...),
+    document_types: Optional[List[str]] = Form(None),
+):
+    """Upload several documents in one request.
+
+    Files go to storage concurrently (at most UPLOAD_CONCURRENCY at a time)
+    and are recorded with one insert, one application update and one
+    notification. `document_types` lines up with `files` by position.
+    """
+    if len(files) > settings.MAX_DOCUMENTS_PER_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MAX_DOCUMENTS_PER_BATCH} files per upload")
+    document_types = document_types or []
+    if len(document_types) > len(files):
+        raise HTTPException(status_code=400, detail="More document types than files")
+    
+    db = mongodb.get_db()
+    
+    application = await find_application_for_upload(db, application_id)
+    
+    storage = get_storage()
+    semaphore = asyncio.Semaphore(settings.UPLOAD_CONCURRENCY)
+    batch_id = uuid.uuid4().hex
+    
+    async def store(index: int, file: UploadFile) -> Dict[str, Any]:
+        file_extension = DOCUMENT_CONTENT_TYPES[file.content_type]
+        filename = f"documents/{application_id}/{batch_id}-{index}.{file_extension}"
+        async with semaphore:
+            await storage.save(filename, file.file, content_type=file.content_type, public=True)
+        return {
+            "key": filename,
+            "url": storage.public_url(filename),
+            "type": document_types[index] if index < len(document_types) else None
+        }
+    
+    try:
+        # Reject the whole batch before anything is stored
+        for file in files:
+            check_document_file(file)
+        
+        results = await asyncio.gather(
+            *(store(index, file) for index, file in enumerate(files)),
+            return_exceptions=True
+        )
+        failures = [result for result in results if isinstance(result, BaseException)]
+        if failures:
+            # All or nothing: don't leave half a batch in storage
+            stored = [result for result in results if not isinstance(result, BaseException)]
+            await asyncio.gather(*(storage.delete(upload["key"]) for upload in stored), return_exceptions=True)
+            if not isinstance(failures[0], StorageError):
+                raise failures[0]
+            raise HTTPException(status_code=500, detail=f"Failed to upload documents: {str(failures[0])}")
+        
+        documents = await record_documents(db, application, results)
+        
+        return {"document_urls": [document["url"] for document in documents]}
+    finally:
+        for file in files:
+            file.file.close()
+
+# Presigned uploads are how applicants should send documents: the browser
+# uploads straight to storage and the API only records the result.
+PRESIGNED_UPLOAD_EXPIRES_SECONDS = 900
+
+class PresignDocumentRequest(BaseModel):
+    content_type: str
+    size: int = Field(..., gt=0)
+    document_type: Optional[str] = None
+
+class ConfirmDocumentRequest(BaseModel):
+    key: str
+    document_type: Optional[str] = None
+
+def document_key_prefix(application_id: str) -> str:
+    return f"documents/{application_id}/"
+
+class PresignDocumentsRequest(BaseModel):
+    documents: List[PresignDocumentRequest] = Field(..., min_length=1)
+
+class ConfirmDocumentsRequest(BaseModel):
+    documents: List[ConfirmDocumentRequest] = Field(..., min_length=1)
+
+def check_presign_request(request: PresignDocumentRequest) -> None:
+    if request.content_type not in DOCUMENT_CONTENT_TYPES:
+        raise HTTPException(status_code=415, detail="Unsupported document type")
+    if request.size > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail="File too large")
+
+async def presign_document(application_id: str, request: PresignDocumentRequest) -> dict:
+    key = f"{document_key_prefix(application_id)}{uuid.uuid4().hex}.{DOCUMENT_CONTENT_TYPES[request.content_type]}"
+    try:
+        upload = await get_storage().presigned_upload(
+            key,
+            content_type=request.content_type,
+            max_size=settings.MAX_UPLOAD_SIZE,
+            expires_in=PRESIGNED_UPLOAD_EXPIRES_SECONDS,
+            public=True
+        )
+    except StorageError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to prepare upload: {str(e)}")
+    
+    return {"upload": upload.dict(), "document_type": request.document_type}
+
+@router.post("/{application_id}/documents/presign", response_model=dict)
+async def presign_document_upload(
+    application_id: str,
+    request: PresignDocumentRequest
+) -> Any:
+    check_presign_request(request)
+    
+    db = mongodb.get_db()
+    await find_application_for_upload(db, application_id)
+    
+    return await presign_document(application_id, request)
+
+@router.post("/{application_id}/documents/presign/batch", response_model=dict)
+async def presign_document_uploads(
+    application_id: str,
+    request: PresignDocumentsRequest
+) -> Any:
+    """Presign up to MAX_DOCUMENTS_PER_BATCH uploads in one call; confirm
+    them together with /documents/confirm/batch."""
+    if len(request.documents) > settings.MAX_DOCUMENTS_PER_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MAX_DOCUMENTS_PER_BATCH} files per upload")
+    for document in request.documents:
+        check_presign_request(document)
+    
+    db = mongodb.get_db()
+    await find_application_for_upload(db, application_id)
+    
+    uploads = await asyncio.gather(*(presign_document(application_id, document) for document in request.documents))
+    return {"uploads": uploads}
+
+async def check_confirmed_upload(storage, application_id: str, key: str) -> None:
+    # Only keys issued for this application can be attached to it; a key
+    # that normalizes to something else could point at another application
+    try:
+        key_is_normal = object_key(key) == key
+    except StorageError:
+        key_is_normal = False
+    if not key_is_normal or not key.startswith(document_key_prefix(application_id)):
+        raise HTTPException(status_code=400, detail="Upload does not belong to this application")
+    
+    try:
+        stored = await storage.head(key)
+    except StorageError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to check upload: {str(e)}")
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if stored.content_type not in DOCUMENT_CONTENT_TYPES or stored.size > settings.MAX_UPLOAD_SIZE:
+        await storage.delete(key)
+        raise HTTPException(status_code=400, detail="Upload does not match the presigned conditions")
+
+@router.post("/{application_id}/documents/confirm", response_model=dict)
+async def confirm_document_upload(
+    application_id: str,
+    request: ConfirmDocumentRequest
+) -> Any:
+    db = mongodb.get_db()
+    application = await find_application_for_upload(db, application_id)
+    
+    storage = get_storage()
+    await check_confirmed_upload(storage, application_id, request.key)
+    
+    # Confirm is safe to retry; a second call returns the recorded document
+    existing = await db.application_documents.find_one({"application_id": application_id, "key": request.key})
+    if existing:
+        return {"document_url": existing["url"]}
+    
+    document_url = storage.public_url(request.key)
+    try:
+        await record_document(db, application, document_url, request.document_type, key=request.key)
+    except DuplicateKeyError:
+        # A concurrent confirm of the same upload recorded it first
+        existing = await db.application_documents.find_one({"application_id": application_id, "key": request.key})
+        if existing:
+            document_url = existing["url"]
+    
+    return {"document_url": document_url}
+
+@router.post("/{application_id}/documents/confirm/batch", response_model=dict)
+async def confirm_document_uploads(
+    application_id: str,
+    request: ConfirmDocumentsRequest
+) -> Any:
+    """Record several presigned uploads with one insert, one application
+    update and one notification. Safe to retry, like /documents/confirm."""
+    if len(request.documents) > settings.MAX_DOCUMENTS_PER_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MAX_DOCUMENTS_PER_BATCH} files per upload")
+    
+    db = mongodb.get_db()
+    application = await find_application_for_upload(db, application_id)
+    
+    storage = get_storage()
+    await asyncio.gather(*(check_confirmed_upload(storage, application_id, document.key) for document in request.documents))
+    
+    keys = [document.key for document in request.documents]
+    recorded = {
+        document["key"]: document["url"]
+        async for document in db.application_documents.find({"application_id": application_id, "key": {"$in": keys}}, {"key": 1, "url": 1})
+    }
+    uploads = [
+        {"key": document.key, "url": storage.public_url(document.key), "type": document.document_type}
+        for document in request.documents
+        if document.key not in recorded
+    ]
+    if uploads:
+        await record_documents(db, application, uploads)
+    
+    return {"document_urls": [recorded.get(key) or storage.public_url(key) for key in keys]}
+
 @router.post("/generate-link", response_model=dict)
 async def generate_application_link(
+    options: Optional[LinkOptions] = None,
     current_agent: AgentInDB = Depends(get_current_agent)
 ) -> Any:
     db = mongodb.get_db()
     
-    # Generate a unique link ID
-    link_id = str(ObjectId())
-    
     # Create the application link document
-    link_doc = {
-        "link_id": link_id,
-        "agent_id": str(current_agent.id),
-        "created_at": datetime.utcnow(),
-        "is_active": True
-    }
+    link_doc = build_link_doc(str(current_agent.id), options)
     
     # Insert the link document
     await db.application_links.insert_one(link_doc)
     
     # Generate the full URL - with the correct /apply/link/ format
-    frontend_url = settings.FRONTEND_URL or "http://localhost:8080"
-    application_url = f"{frontend_url}/apply/link/{link_id}"
-    
     return {
-        "link_id": link_id,
-        "url": application_url
+        "link_id": link_doc["link_id"],
+        "url": link_url(link_doc["link_id"])
     }
 
 
@@ -256,10 +797,7 @@ async def validate_application_link(
     db = mongodb.get_db()
     
     # Find the link document
-    link_doc = await db.application_links.find_one({
-        "link_id": link_id,
-        "is_active": True
-    })
+    link_doc = await db.application_links.find_one(usable_link_query(link_id), {"_id": 1})
     
     if not link_doc:
         return {"isValid": False}
@@ -268,6 +806,8 @@ async def validate_application_link(
 
 class StartApplicationRequest(BaseModel):
     link_id: str
+    # Per browser session; retries with the same key return the same draft
+    idempotency_key: Optional[str] = Field(None, min_length=8, max_length=128)
 
 @router.post("/start", response_model=ApplicationInDB)
 async def start_application(
@@ -276,11 +816,19 @@ async def start_application(
 ) -> Any:
     db = mongodb.get_db()
     
-    # Validate the link
-    link_doc = await db.application_links.find_one({
-        "link_id": request.link_id,
-        "is_active": True
-    })
+    # A retry of a start that already succeeded doesn't use up the link again
+    start_key = f"{request.link_id}:{request.idempotency_key}" if request.idempotency_key else None
+    if start_key:
+        existing = await db.applications.find_one({"start_key": start_key}, {"documents": 0})
+        if existing:
+            existing["id"] = str(existing["_id"])
+            return ApplicationInDB(**existing)
+    
+    # Validate the link and take one of its uses in the same atomic update
+    link_doc = await db.application_links.find_one_and_update(
+        usable_link_query(request.link_id),
+        {"$inc": {"uses": 1}}
+    )
     if not link_doc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -309,34 +857,70 @@ async def start_application(
         "agent_id": agent_id,
         "status": ApplicationStatus.DRAFT.value,
         "bio_info": bio_info,
-        "documents": [],
+        "version": 0,
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow()
     }
     
-    result = await db.applications.insert_one(application_data)
-    application_data["id"] = str(result.inserted_id)
-  
-    return ApplicationInDB(**application_data)
+    if not start_key:
+        result = await db.applications.insert_one(application_data)
+        agent_writes.bump(agent_id)
+        application_data["id"] = str(result.inserted_id)
+        return ApplicationInDB(**application_data)
+    
+    # One draft per (link, key): refreshes and double-clicks get the existing one
+    application_data["_id"] = ObjectId()
+    application_data["start_key"] = start_key
+    application = await upsert_started_application(db, application_data)
+    agent_writes.bump(agent_id)
+    if application["_id"] != application_data["_id"]:
+        # A concurrent retry created the draft; give back the use we took
+        await db.application_links.update_one({"_id": link_doc["_id"]}, {"$inc": {"uses": -1}})
+    application["id"] = str(application["_id"])
+    return ApplicationInDB(**application)
 
-UPLOAD_DIR = "uploads"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+async def upsert_started_application(db, application_data: dict) -> dict:
+    query = {"start_key": application_data["start_key"]}
+    new_fields = {key: value for key, value in application_data.items() if key != "start_key"}
+    try:
+        return await db.applications.find_one_and_update(
+            query,
+            {"$setOnInsert": new_fields},
+            upsert=True,
+            projection={"documents": 0},
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # Lost a concurrent upsert race; the winner's draft is there now
+        return await db.applications.find_one(query, {"documents": 0})
 
 class FormData(BaseModel):
     formData: Dict[str, Any]
 
+# Generated and uploaded PDFs are named by a server-issued UUID, plus a
+# suffix for the signed copy
+PDF_FILE_ID = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}(_signed)?$")
+
+def pdf_key(file_id: str) -> str:
+    if not PDF_FILE_ID.match(file_id):
+        raise HTTPException(status_code=404, detail="PDF not found")
+    return object_key("pdfs", f"{file_id}.pdf")
+
 @router.post("/api/generate-pdf")
 async def generate_pdf(form_data: FormData):
     # Generate unique ID for this request
     file_id = str(uuid.uuid4())
-    output_path = os.path.join(UPLOAD_DIR, f"{file_id}.pdf")
     
     # Template path (replace with actual path to your OREA 410 template)
     template_path = "templates/OREA_Form_410.pdf"
     
     try:
-        # Fill the PDF with form data
-        fill_pdf_form(template_path, output_path, form_data.formData)
+        with tempfile.TemporaryDirectory() as workdir:
+            output_path = os.path.join(workdir, f"{file_id}.pdf")
+            # Fill the PDF with form data; PyMuPDF blocks, so keep it off the event loop
+            with pdf_jobs.track():
+                await run_in_threadpool(fill_pdf_form, template_path, output_path, form_data.formData)
+            await get_storage().save_file(pdf_key(file_id), output_path, content_type="application/pdf")
         
         return {"file_id": file_id, "message": "PDF generated successfully"}
     except Exception as e:
@@ -350,52 +934,66 @@ async def sign_pdf(
     x: float = Form(...),
     y: float = Form(...)
 ):
-    pdf_path = os.path.join(UPLOAD_DIR, f"{file_id}.pdf")
-    if not os.path.exists(pdf_path):
-        raise HTTPException(status_code=404, detail="PDF not found")
-    
-    # Save signature image temporarily
-    sig_path = os.path.join(UPLOAD_DIR, f"{file_id}_sig.png")
-    with open(sig_path, "wb") as f:
-        f.write(await signature.read())
-    
-    signed_pdf_path = os.path.join(UPLOAD_DIR, f"{file_id}_signed.pdf")
-    
-    try:
-        # Add signature to PDF
-        add_signature_to_pdf(pdf_path, signed_pdf_path, sig_path, page, x, y)
+    storage = get_storage()
+    source_key = pdf_key(file_id)
+    # Signing a signed copy again replaces it rather than stacking suffixes
+    signed_id = f"{file_id.split('_')[0]}_signed"
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        pdf_path = os.path.join(workdir, "form.pdf")
+        try:
+            await storage.download_to(source_key, pdf_path)
+        except ObjectNotFound:
+            raise HTTPException(status_code=404, detail="PDF not found")
+        except StorageError as e:
+            raise HTTPException(status_code=500, detail=f"Failed to read PDF: {str(e)}")
         
-        # Clean up signature file
-        os.remove(sig_path)
+        # Save signature image next to the working copy
+        sig_path = os.path.join(workdir, "signature.png")
+        with open(sig_path, "wb") as f:
+            f.write(await signature.read())
         
-        return {"file_id": f"{file_id}_signed", "message": "PDF signed successfully"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        signed_pdf_path = os.path.join(workdir, "signed.pdf")
+        
+        try:
+            # Add signature to PDF
+            with pdf_jobs.track():
+                await run_in_threadpool(add_signature_to_pdf, pdf_path, signed_pdf_path, sig_path, page, x, y)
+            await storage.save_file(pdf_key(signed_id), signed_pdf_path, content_type="application/pdf")
+            
+            return {"file_id": signed_id, "message": "PDF signed successfully"}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/preview-pdf/{file_id}")
 async def preview_pdf(file_id: str):
-    pdf_path = os.path.join(UPLOAD_DIR, f"{file_id}.pdf")
-    
-    if not os.path.exists(pdf_path):
-        pdf_path = os.path.join(UPLOAD_DIR, f"{file_id}_signed.pdf")
-        if not os.path.exists(pdf_path):
-            raise HTTPException(status_code=404, detail="PDF not found")
+    storage = get_storage()
+    file_ids = [file_id] if file_id.endswith("_signed") else [file_id, f"{file_id}_signed"]
+    
+    for key in [pdf_key(candidate) for candidate in file_ids]:
+        try:
+            stored = await storage.head(key)
+        except StorageError as e:
+            raise HTTPException(status_code=500, detail=f"Failed to read PDF: {str(e)}")
+        if stored:
+            return StreamingResponse(
+                storage.iter_chunks(key),
+                media_type="application/pdf",
+                headers={"Content-Length": str(stored.size)}
+            )
     
-    return FileResponse(pdf_path, media_type="application/pdf")
+    raise HTTPException(status_code=404, detail="PDF not found")
 
 @router.post("/api/upload-completed-form")
 async def upload_completed_form(file: UploadFile = File(...)):
 
     # Generate unique ID for this upload
     file_id = str(uuid.uuid4())
-    output_path = os.path.join(UPLOAD_DIR, f"{file_id}.pdf")
     
     try:
-        # Save uploaded file
-        with open(output_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+        # Stream the upload straight into storage
+        await get_storage().save(pdf_key(file_id), file.file, content_type="application/pdf")
         
         return {"file_id": file_id, "message": "Form uploaded successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    
@@ -66,7 +66,7 @@ async def register(agent: AgentCreate) -> Any:
 async def login(login_data: LoginRequest) -> Any:
     try:
         db = mongodb.get_db()
-        logger.info(f"Attempting login for email: {login_data.email}")
+        logger.debug(f"Attempting login for email: {login_data.email}")
         
         agent = await db.agents.find_one({"email": login_data.email})
         if not agent:
@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timedelta
+from typing import Dict
+import asyncio
+import hashlib
+import json
+import logging
+import secrets
+
+from app.core.auth import get_current_agent
+from app.core.config import settings
+from app.core.database import mongodb
+from app.core.live_updates import application_changes
+from app.models.agent import AgentInDB
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+HEARTBEAT_SECONDS = 15
+
+def format_event(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+def ticket_id(ticket: str) -> str:
+    # Only the hash is stored, so the collection can't be used to connect
+    return hashlib.sha256(ticket.encode()).hexdigest()
+
+@router.post("/tickets", response_model=Dict)
+async def create_stream_ticket(current_agent: AgentInDB = Depends(get_current_agent)) -> Dict:
+    """Swap the agent's access token for a short-lived, single-use ticket.
+
+    EventSource can't send an Authorization header, so the stream is
+    authenticated by a query parameter; using a ticket there keeps access
+    tokens out of access and proxy logs.
+    """
+    ticket = secrets.token_urlsafe(32)
+    # Stored in Mongo so the stream may connect to any worker
+    await mongodb.get_db().stream_tickets.insert_one({
+        "_id": ticket_id(ticket),
+        "agent_id": str(current_agent.id),
+        "expires_at": datetime.utcnow() + timedelta(seconds=settings.STREAM_TICKET_TTL_SECONDS)
+    })
+    return {"ticket": ticket, "expires_in": settings.STREAM_TICKET_TTL_SECONDS}
+
+@router.get("/applications")
+async def stream_application_events(
+    request: Request,
+    ticket: str = Query(..., description="Stream ticket from POST /events/tickets")
+):
+    # Deleting on read makes the ticket single-use
+    redeemed = await mongodb.get_db().stream_tickets.find_one_and_delete(
+        {"_id": ticket_id(ticket), "expires_at": {"$gt": datetime.utcnow()}}
+    )
+    if not redeemed:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired stream ticket")
+    agent_id = redeemed["agent_id"]
+
+    async def event_stream():
+        queue = application_changes.subscribe(agent_id)
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_event(event)
+        finally:
+            application_changes.unsubscribe(agent_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,87 @@
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import tempfile
+
+from app.core.storage import CHUNK_SIZE, LocalStorage, StorageError, get_storage, verify_file_signature, verify_upload_signature
+
+router = APIRouter()
+
+@router.get("/{key:path}")
+async def get_file(
+    key: str,
+    expires: Optional[int] = Query(None),
+    signature: Optional[str] = Query(None)
+):
+    """Serve objects for the local storage backend.
+
+    Public objects (logos, backgrounds, documents) are served as-is;
+    everything else needs a URL from `presigned_url`. S3 serves its own
+    objects, so this route 404s there.
+    """
+    storage = get_storage()
+    if not isinstance(storage, LocalStorage):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    try:
+        stored = await storage.head(key)
+    except StorageError:
+        raise HTTPException(status_code=404, detail="File not found")
+    if stored is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    signed = expires is not None and signature and verify_file_signature(key, expires, signature)
+    if not stored.public and not signed:
+        raise HTTPException(status_code=403, detail="Invalid or expired file URL")
+
+    return StreamingResponse(
+        storage.iter_chunks(key),
+        media_type=stored.content_type,
+        headers={
+            "Content-Length": str(stored.size),
+            "ETag": f'"{stored.etag}"',
+            "Cache-Control": "public, max-age=86400" if stored.public else "private, no-store"
+        }
+    )
+
+@router.put("/{key:path}", status_code=204)
+async def put_file(
+    key: str,
+    request: Request,
+    expires: int = Query(...),
+    max_size: int = Query(...),
+    public: bool = Query(False),
+    signature: str = Query(...)
+):
+    """Receive a presigned upload for the local storage backend.
+
+    Mirrors what an S3 POST policy enforces: the URL must be signed for this
+    key, content type, size cap and visibility, and must not have expired.
+    """
+    storage = get_storage()
+    if not isinstance(storage, LocalStorage):
+        raise HTTPException(status_code=404, detail="File not found")
+
+    content_type = request.headers.get("content-type", "")
+    if not verify_upload_signature(key, expires, content_type, max_size, public, signature):
+        raise HTTPException(status_code=403, detail="Invalid or expired upload URL")
+
+    declared_size = request.headers.get("content-length")
+    if declared_size and int(declared_size) > max_size:
+        raise HTTPException(status_code=413, detail="File too large")
+
+    # Count bytes as they arrive; Content-Length is optional and can lie
+    with tempfile.SpooledTemporaryFile(max_size=CHUNK_SIZE) as body:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > max_size:
+                raise HTTPException(status_code=413, detail="File too large")
+            body.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty upload")
+        body.seek(0)
+        try:
+            await storage.save(key, body, content_type=content_type, public=public)
+        except StorageError as e:
+            raise HTTPException(status_code=500, detail=f"Failed to store file: {str(e)}")
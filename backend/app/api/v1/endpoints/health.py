@@ -0,0 +1,75 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+from typing import Any, Dict
+import asyncio
+import logging
+import time
+
+import pymongo
+from app.core.config import settings
+from app.core.database import mongodb
+from app.core.health import loop_lag, pdf_jobs, pool_monitor
+from app.core.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+STARTED_AT = time.monotonic()
+
+async def probe_mongo() -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        with pymongo.timeout(settings.HEALTH_PROBE_TIMEOUT_SECONDS):
+            await mongodb.client.admin.command("ping")
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {str(e)}"}
+    latency_ms = (time.perf_counter() - started) * 1000
+    return {"ok": latency_ms <= settings.READY_MAX_MONGO_PING_MS, "latency_ms": round(latency_ms, 2)}
+
+async def probe_storage() -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(get_storage().ping(), settings.HEALTH_PROBE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": "timed out"}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+    return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+@router.get("/healthz")
+async def healthz() -> Dict[str, Any]:
+    """Liveness: the process is up and its event loop is running. Doesn't
+    touch dependencies, so a database outage doesn't get workers restarted."""
+    return {"status": "ok", "uptime_seconds": round(time.monotonic() - STARTED_AT), "event_loop": loop_lag.snapshot()}
+
+@router.get("/readyz")
+async def readyz(request: Request):
+    """Readiness: whether this worker should get more traffic right now.
+
+    Returns 503 while starting or shutting down, when Mongo or storage is
+    unreachable or slow, or when the worker is saturated (connection pool,
+    event loop or PDF jobs past their READY_MAX_* threshold).
+    """
+    mongo, storage = await asyncio.gather(probe_mongo(), probe_storage())
+
+    pool = pool_monitor.snapshot()
+    pool["ok"] = pool["saturation"] < settings.READY_MAX_POOL_SATURATION
+    event_loop = loop_lag.snapshot()
+    event_loop["ok"] = event_loop["max_ms"] <= settings.READY_MAX_LOOP_LAG_MS
+    pdf = pdf_jobs.snapshot()
+    pdf["ok"] = pdf["active"] <= settings.READY_MAX_PDF_JOBS
+
+    checks = {"mongo": mongo, "mongo_pool": pool, "storage": storage, "event_loop": event_loop, "pdf_jobs": pdf}
+    failing = [name for name, check in checks.items() if not check["ok"]]
+    accepting = getattr(request.app.state, "accepting_traffic", False)
+    if not accepting:
+        failing.insert(0, "lifecycle")
+    if failing:
+        logger.warning(f"Not ready: {', '.join(failing)}")
+
+    return JSONResponse(
+        {"status": "not_ready" if failing else "ready", "failing": failing, "checks": checks},
+        status_code=503 if failing else 200,
+        headers={"Cache-Control": "no-store"}
+    )
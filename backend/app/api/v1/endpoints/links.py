@@ -1,38 +1,95 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from datetime import datetime
+from fastapi import APIRouter, Depends, Response
+from datetime import datetime, timedelta
 from bson import ObjectId
-from typing import Any
-from motor.motor_asyncio import AsyncIOMotorClient
+from bson.errors import InvalidId
+from typing import Any, Optional
 
+from app.core.auth import get_current_agent
 from app.core.database import mongodb
 from app.core.config import settings
+from app.core.response_cache import branding_cache, link_cache
+from app.models.agent import AgentInDB, PublicBranding
+from app.models.link import BulkLinkRequest, LinkOptions
 
 router = APIRouter()
 
+def build_link_doc(agent_id: Optional[str], options: Optional[LinkOptions] = None, label: Optional[str] = None) -> dict:
+    now = datetime.utcnow()
+    link_doc = {
+        "link_id": str(ObjectId()),
+        "created_at": now,
+        "is_active": True,
+        "uses": 0
+    }
+    if agent_id:
+        link_doc["agent_id"] = agent_id
+    if options and options.expires_in_days:
+        # The TTL index deletes the link shortly after this
+        link_doc["expires_at"] = now + timedelta(days=options.expires_in_days)
+    if options and options.max_uses:
+        link_doc["max_uses"] = options.max_uses
+    if label:
+        link_doc["label"] = label
+    return link_doc
+
+def link_url(link_id: str) -> str:
+    frontend_url = settings.FRONTEND_URL or "http://localhost:8080"
+    return f"{frontend_url}/apply/link/{link_id}"
+
+def active_link_query(link_id: str) -> dict:
+    """Matches a link that can still be opened. TTL deletion runs about once
+    a minute, so expiry is checked here too."""
+    return {
+        "link_id": link_id,
+        "is_active": True,
+        "$or": [
+            {"expires_at": {"$exists": False}},
+            {"expires_at": {"$gt": datetime.utcnow()}}
+        ]
+    }
+
+def usable_link_query(link_id: str) -> dict:
+    """An active link with uses left; `uses` is incremented in the same update."""
+    return {
+        "$and": [
+            active_link_query(link_id),
+            {"$or": [
+                {"max_uses": {"$exists": False}},
+                {"$expr": {"$lt": ["$uses", "$max_uses"]}}
+            ]}
+        ]
+    }
+
 @router.post("/generate", response_model=dict)
-async def generate_link() -> Any:
+async def generate_link(options: Optional[LinkOptions] = None) -> Any:
     db = mongodb.get_db()
     
-    # Generate a unique link ID
-    link_id = str(ObjectId())
-    
     # Create the link document
-    link_doc = {
-        "link_id": link_id,
-        "created_at": datetime.utcnow(),
-        "is_active": True
-    }
+    link_doc = build_link_doc(None, options)
     
     # Insert the link document
     await db.application_links.insert_one(link_doc)
     
-    # Generate the full URL
-    frontend_url = settings.FRONTEND_URL or "http://localhost:8080"
-    application_url = f"{frontend_url}/apply/link/{link_id}"
+    return {
+        "link_id": link_doc["link_id"],
+        "url": link_url(link_doc["link_id"])
+    }
+
+@router.post("/bulk", response_model=dict)
+async def generate_links_bulk(
+    request: BulkLinkRequest,
+    current_agent: AgentInDB = Depends(get_current_agent)
+) -> Any:
+    """Issue many links in one write, e.g. one per visitor at an open house."""
+    db = mongodb.get_db()
+    
+    link_docs = [build_link_doc(str(current_agent.id), request, request.label) for _ in range(request.count)]
+    await db.application_links.insert_many(link_docs, ordered=False)
     
     return {
-        "link_id": link_id,
-        "url": application_url
+        "links": [{"link_id": doc["link_id"], "url": link_url(doc["link_id"])} for doc in link_docs],
+        "expires_at": link_docs[0].get("expires_at"),
+        "max_uses": request.max_uses
     }
 
 @router.get("/validate/{link_id}", response_model=dict)
@@ -40,12 +97,54 @@ async def validate_link(link_id: str) -> Any:
     db = mongodb.get_db()
     
     # Find the link document
-    link_doc = await db.application_links.find_one({
-        "link_id": link_id,
-        "is_active": True
-    })
+    link_doc = await db.application_links.find_one(usable_link_query(link_id), {"_id": 1})
     
     if not link_doc:
         return {"isValid": False}
     
-    return {"isValid": True} 
\ No newline at end of file
+    return {"isValid": True}
+
+# Shared caches (CDN) may hold a bootstrap briefly; invalid links for less
+BOOTSTRAP_CACHE_CONTROL = "public, max-age=60, s-maxage=60, stale-while-revalidate=300"
+INVALID_LINK_CACHE_CONTROL = "public, max-age=10"
+
+async def get_public_branding(db, agent_id: str) -> Optional[dict]:
+    branding = branding_cache.get(agent_id)
+    if branding is not None:
+        return branding
+    
+    try:
+        agent = await db.agents.find_one({"_id": ObjectId(agent_id)}, {"settings": 1, "company_name": 1})
+    except InvalidId:
+        agent = None
+    if not agent:
+        return None
+    
+    agent_settings = agent.get("settings") or {}
+    branding = PublicBranding(**{
+        field: agent_settings.get(field) for field in PublicBranding.__fields__
+    })
+    branding.brand_name = branding.brand_name or agent.get("company_name")
+    branding = branding.dict()
+    branding_cache.put(agent_id, branding)
+    return branding
+
+@router.get("/bootstrap/{link_id}", response_model=dict)
+async def bootstrap_link(link_id: str, response: Response) -> Any:
+    """Everything the applicant landing page needs in one cacheable response:
+    whether the link is usable and the agent's public branding."""
+    db = mongodb.get_db()
+    
+    link = link_cache.get(link_id)
+    if link is None:
+        link_doc = await db.application_links.find_one(usable_link_query(link_id), {"agent_id": 1})
+        link = {"is_valid": link_doc is not None, "agent_id": (link_doc or {}).get("agent_id")}
+        link_cache.put(link_id, link)
+    
+    if not link["is_valid"]:
+        response.headers["Cache-Control"] = INVALID_LINK_CACHE_CONTROL
+        return {"isValid": False, "branding": None}
+    
+    branding = await get_public_branding(db, str(link["agent_id"])) if link["agent_id"] else None
+    response.headers["Cache-Control"] = BOOTSTRAP_CACHE_CONTROL
+    return {"isValid": True, "branding": branding}
@@ -1,15 +1,17 @@
 # pdf_operations.py
-import fitz  # PyMuPDF
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from pdfrw import PdfReader, PdfWriter, PdfDict
-import io
-import os
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def get_fitz():
+    # PyMuPDF is slow to import; only workers that handle PDFs load it
+    import fitz
+    return fitz
+
 def fill_pdf_form(template_path: str, output_path: str, form_data: dict):
+    fitz = get_fitz()
     try:
         # Open the template PDF
         doc = fitz.open(template_path)
@@ -34,6 +36,7 @@ def fill_pdf_form(template_path: str, output_path: str, form_data: dict):
         raise
 
 def add_signature_to_pdf(pdf_path: str, output_path: str, signature_path: str, page_num: int, x: float, y: float):
+    fitz = get_fitz()
     try:
         # Open the PDF
         doc = fitz.open(pdf_path)
@@ -62,7 +65,7 @@ def add_signature_to_pdf(pdf_path: str, output_path: str, signature_path: str, p
 
 def extract_form_field_names(pdf_path):
     """Extract all form field names from a PDF (useful for debugging)"""
-    pdf = fitz.open(pdf_path)
+    pdf = get_fitz().open(pdf_path)
     field_names = []
     
     for page_num in range(len(pdf)):
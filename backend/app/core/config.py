@@ -1,6 +1,6 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
-from typing import Optional
-import os
+from typing import Dict, Optional, Tuple
 from pathlib import Path
 
 class Settings(BaseSettings):
@@ -15,10 +15,90 @@ class Settings(BaseSettings):
     # MongoDB Settings
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB_NAME: str = "rentflow"
+    # Max replication lag for reads routed to secondaries (analytics, search)
+    READ_MAX_STALENESS_SECONDS: int = 90
     
     # File Upload Settings
     UPLOAD_DIR: Path = Path("uploads")
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10MB
+    MAX_DOCUMENTS_PER_BATCH: int = 10
+    UPLOAD_CONCURRENCY: int = 4  # concurrent storage writes per batch upload
+    
+    # Logo and background uploads are re-encoded as WebP variants
+    IMAGE_VARIANT_QUALITY: int = 80
+    IMAGE_MAX_PIXELS: int = 50_000_000
+    
+    # Logging; records are written from a background thread
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    # Logger name -> (sample rate, max records per second) below ERROR
+    LOG_SAMPLING: Dict[str, Tuple[float, float]] = {
+        "app.api.v1.endpoints.auth": (0.1, 20),
+        "uvicorn.access": (1.0, 200)
+    }
+    
+    # Per-request time budgets (seconds); PDF, upload and file routes get the slow one
+    REQUEST_DEADLINE_SECONDS: float = 10.0
+    REQUEST_DEADLINE_SLOW_SECONDS: float = 60.0
+    STORAGE_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    STORAGE_READ_TIMEOUT_SECONDS: float = 30.0
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+    
+    # Commands slower than this are logged; a sample of them is explained
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
+    SLOW_QUERY_LOG_SIZE: int = 200
+    
+    # Token for /admin endpoints (sent as X-Admin-Token); unset disables them
+    ADMIN_TOKEN: Optional[str] = None
+    
+    # Seconds an SSE stream ticket can be redeemed for
+    STREAM_TICKET_TTL_SECONDS: int = 30
+    
+    # Most links one bulk issuance request can create
+    MAX_BULK_LINKS: int = 500
+    
+    # Application lifecycle: drafts expire after inactivity, closed ones are archived
+    DRAFT_TTL_DAYS: int = 30
+    ARCHIVE_AFTER_DAYS: int = 365
+    ARCHIVE_BATCH_SIZE: int = 500
+    LIFECYCLE_INTERVAL_SECONDS: float = 3600.0  # 0 disables the in-process job (run archive_applications.py from cron)
+    
+    # How often queued upload notifications are checked for closed digest windows
+    NOTIFICATION_DIGEST_INTERVAL_SECONDS: float = 60.0  # 0 disables the in-process scheduler
+    NOTIFICATION_DIGEST_CLAIM_TIMEOUT_SECONDS: float = 900.0  # unsent claims older than this are retried
+    
+    # /readyz reports 503 past any of these, so load balancers drain the worker
+    READY_MAX_MONGO_PING_MS: float = 250.0
+    READY_MAX_POOL_SATURATION: float = 0.9
+    READY_MAX_LOOP_LAG_MS: float = 200.0
+    READY_MAX_PDF_JOBS: int = 8
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
+    LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+    
+    # Applicant autosaves are merged and written at most once per window. The
+    # buffer lives in one worker's memory, so only enable it (e.g. 2.0) when
+    # every request for an application reaches the same worker (sticky
+    # routing); 0 writes each save straight through
+    AUTOSAVE_COALESCE_WINDOW_SECONDS: float = 0.0
+    
+    # Rate limiting for public applicant endpoints
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) or "mongo" (shared)
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # Only behind a proxy that sets X-Forwarded-For
+    RATE_LIMIT_PUBLIC_PER_MINUTE: int = 60
+    RATE_LIMIT_LINK_PER_MINUTE: int = 30
+    RATE_LIMIT_EXPENSIVE_PER_MINUTE: int = 10
+    EXPENSIVE_ROUTE_CONCURRENCY: int = 4
+    
+    # Storage: "s3" (any S3-compatible endpoint) or "local" (UPLOAD_DIR, single node or shared volume);
+    # unset means s3 when AWS_BUCKET_NAME is configured, local otherwise
+    STORAGE_BACKEND: Optional[str] = None
+    S3_ENDPOINT_URL: Optional[str] = None  # e.g. http://localhost:9000 for MinIO
+    S3_PUBLIC_BASE_URL: Optional[str] = None  # CDN or bucket URL used for public objects
+    
+    # Public URL of this API, used for locally stored files
+    API_BASE_URL: str = "http://localhost:8001"
     
     # AWS Settings
     AWS_ACCESS_KEY_ID: Optional[str] = None
@@ -40,8 +120,11 @@ class Settings(BaseSettings):
     class Config:
         case_sensitive = True
         env_file = ".env"
+    
+    @model_validator(mode="after")
+    def infer_storage_backend(self):
+        if self.STORAGE_BACKEND is None:
+            self.STORAGE_BACKEND = "s3" if self.AWS_BUCKET_NAME else "local"
+        return self
 
-settings = Settings()
-
-# Create upload directory if it doesn't exist
-os.makedirs(settings.UPLOAD_DIR, exist_ok=True) 
\ No newline at end of file
+settings = Settings() 
\ No newline at end of file
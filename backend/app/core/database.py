@@ -1,19 +1,98 @@
+import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, TEXT
+from pymongo.read_preferences import Primary, SecondaryPreferred
 from app.core.config import settings
+from app.core.query_profiler import slow_query_log
+from app.core.health import pool_monitor
+
+# Named read profiles endpoints opt into with get_db(profile). Reporting
+# reads may lag the primary by up to READ_MAX_STALENESS_SECONDS (90 is the
+# server minimum) and fall back to the primary when no secondary qualifies.
+READ_PROFILES = {
+    "primary": Primary(),
+    "analytics": SecondaryPreferred(max_staleness=settings.READ_MAX_STALENESS_SECONDS),
+    "export": SecondaryPreferred(max_staleness=settings.READ_MAX_STALENESS_SECONDS),
+    "search": SecondaryPreferred(max_staleness=settings.READ_MAX_STALENESS_SECONDS),
+}
 
 class MongoDB:
     client: AsyncIOMotorClient = None
     db = None
 
     async def connect_to_database(self):
-        self.client = AsyncIOMotorClient(settings.MONGODB_URL)
+        self.client = AsyncIOMotorClient(settings.MONGODB_URL, event_listeners=[slow_query_log, pool_monitor])
         self.db = self.client[settings.MONGODB_DB_NAME]
+        slow_query_log.attach(self.client, asyncio.get_running_loop())
 
     async def close_database_connection(self):
         if self.client:
             self.client.close()
 
-    def get_db(self):
-        return self.db
+    async def create_indexes(self):
+        # Per-agent date-range scans for analytics
+        await self.db.applications.create_index(
+            [("agent_id", ASCENDING), ("created_at", ASCENDING)]
+        )
+        # Per-agent change watermark (max updated_at) without touching documents
+        await self.db.applications.create_index(
+            [("agent_id", ASCENDING), ("updated_at", ASCENDING)]
+        )
+        # Weighted full-text search, scoped by agent (queries must match agent_id)
+        await self.db.applications.create_index(
+            [
+                ("agent_id", ASCENDING),
+                ("bio_info.first_name", TEXT),
+                ("bio_info.last_name", TEXT),
+                ("notes", TEXT),
+                ("search.prompts", TEXT)
+            ],
+            weights={
+                "bio_info.first_name": 10,
+                "bio_info.last_name": 10,
+                "notes": 3,
+                "search.prompts": 1
+            },
+            name="application_search"
+        )
+        # Anchored prefix matching on lowercased names
+        await self.db.applications.create_index([("agent_id", ASCENDING), ("search.first_name", ASCENDING)])
+        await self.db.applications.create_index([("agent_id", ASCENDING), ("search.last_name", ASCENDING)])
+        # Shared rate limit buckets expire once idle
+        await self.db.rate_limits.create_index("updated_at", expireAfterSeconds=3600)
+        # Unredeemed stream tickets are deleted once they expire
+        await self.db.stream_tickets.create_index("expires_at", expireAfterSeconds=0)
+        # Idempotent application start: one draft per (link_id, client key)
+        await self.db.applications.create_index(
+            "start_key",
+            unique=True,
+            partialFilterExpression={"start_key": {"$exists": True}}
+        )
+        # Link validation and start look links up by link_id
+        await self.db.application_links.create_index("link_id", unique=True)
+        # Links with expires_at are deleted once it passes; others never expire
+        await self.db.application_links.create_index("expires_at", expireAfterSeconds=0)
+        # Documents are read per application, newest last
+        await self.db.application_documents.create_index(
+            [("application_id", ASCENDING), ("uploaded_at", ASCENDING)]
+        )
+        # A presigned upload is recorded once, however often it is confirmed
+        await self.db.application_documents.create_index(
+            "key",
+            unique=True,
+            partialFilterExpression={"key": {"$exists": True}}
+        )
+        # Digest scheduler finds unclaimed events per agent, oldest first
+        await self.db.notification_events.create_index(
+            [("digest_id", ASCENDING), ("agent_id", ASCENDING), ("created_at", ASCENDING)]
+        )
+        # Sent digest events are kept a week for support questions
+        await self.db.notification_events.create_index("sent_at", expireAfterSeconds=7 * 24 * 3600)
+        await self.db.notification_digests.create_index("created_at", expireAfterSeconds=7 * 24 * 3600)
+
+    def get_db(self, profile: str = "primary"):
+        if profile == "primary":
+            return self.db
+        return self.db.with_options(read_preference=READ_PROFILES[profile])
 
-mongodb = MongoDB() 
\ No newline at end of file
+mongodb = MongoDB()
@@ -0,0 +1,155 @@
+import asyncio
+import contextvars
+import logging
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Awaitable, List, Optional, Pattern, Tuple, TypeVar
+
+import pymongo
+from pymongo.errors import PyMongoError, ServerSelectionTimeoutError, WaitQueueTimeoutError
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Absolute time.monotonic() by which the current request must finish
+deadline_var: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("deadline", default=None)
+
+class DeadlineExceeded(Exception):
+    pass
+
+@dataclass(frozen=True)
+class DeadlineRule:
+    name: str
+    methods: Tuple[str, ...]
+    pattern: Pattern
+    seconds: Optional[float]  # None: no deadline (long-lived streams)
+
+def default_rules() -> List[DeadlineRule]:
+    prefix = re.escape(settings.API_V1_STR)
+    slow = settings.REQUEST_DEADLINE_SLOW_SECONDS
+    return [
+        DeadlineRule("events", ("GET",), re.compile(rf"^{prefix}/events/"), None),
+        DeadlineRule("pdf", ("GET", "POST"), re.compile(rf"^{prefix}/applications/api/"), slow),
+        DeadlineRule("upload", ("POST", "PUT"), re.compile(rf"^{prefix}/(applications/[^/]+/documents|agent/settings/(logo|background)|files/)"), slow),
+        DeadlineRule("files", ("GET",), re.compile(rf"^{prefix}/files/"), slow),
+    ]
+
+# Requests that ran out of time, by "METHOD /route/{template}"
+timeout_counts: Counter = Counter()
+
+def route_key(scope) -> str:
+    # The router records the matched route in the scope; requests that never
+    # matched one (404s, or a timeout before routing) fall back to the raw path
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path', None) or scope['path']}"
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current request's budget, or None if unbounded."""
+    deadline = deadline_var.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def timeout_for(default: float) -> float:
+    """A library timeout that never outlives the current request."""
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded()
+    return min(default, left)
+
+async def within_deadline(awaitable: Awaitable[T]) -> T:
+    """Await something that has no timeout of its own (threadpool calls),
+    giving up when the request's budget runs out."""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    if left <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded()
+    try:
+        return await asyncio.wait_for(awaitable, left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded()
+
+def create_background_task(coro) -> asyncio.Task:
+    """Start a task that outlives the request that triggered it.
+
+    Tasks copy the current context, so this starts from an empty one to
+    keep the request's deadline (and pymongo's timeout) from applying.
+    """
+    return contextvars.Context().run(asyncio.create_task, coro)
+
+def is_unavailable(error: Exception) -> bool:
+    # No server or no free connection: the database is overloaded, not slow
+    return isinstance(error, (ServerSelectionTimeoutError, WaitQueueTimeoutError))
+
+def is_timeout(error: Exception) -> bool:
+    return isinstance(error, DeadlineExceeded) or (isinstance(error, PyMongoError) and error.timeout)
+
+class DeadlineMiddleware:
+    """Give every request a time budget and enforce it downstream.
+
+    The budget lives in `deadline_var` and in pymongo's client-side
+    operation timeout, so every Motor call gets a matching maxTimeMS and
+    bounded server selection/connection checkout. Storage and email calls
+    read it through `within_deadline`/`timeout_for`. Timeouts become 504
+    (503 when the database can't even be reached); handlers that turn
+    errors into a generic 500 after the deadline passed are reported as
+    504 too.
+    """
+
+    def __init__(self, app, rules: Optional[List[DeadlineRule]] = None):
+        self.app = app
+        self.rules = rules if rules is not None else default_rules()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        seconds = self._budget(scope)
+        if seconds is None:
+            return await self.app(scope, receive, send)
+
+        deadline = time.monotonic() + seconds
+        token = deadline_var.set(deadline)
+        response_started = False
+
+        async def send_with_deadline(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                if message["status"] == 500 and time.monotonic() >= deadline:
+                    timeout_counts[route_key(scope)] += 1
+                    message = {**message, "status": 504}
+            await send(message)
+
+        try:
+            with pymongo.timeout(seconds):
+                await self.app(scope, receive, send_with_deadline)
+        except Exception as e:
+            if response_started or not (is_timeout(e) or is_unavailable(e)):
+                raise
+            timeout_counts[route_key(scope)] += 1
+            logger.warning(f"Request {scope['method']} {scope['path']} exceeded its {seconds}s deadline: {type(e).__name__}")
+            if is_unavailable(e):
+                response = JSONResponse({"detail": "Service temporarily unavailable"}, status_code=503, headers={"Retry-After": "1"})
+            else:
+                response = JSONResponse({"detail": "Request timed out"}, status_code=504)
+            await response(scope, receive, send)
+        finally:
+            deadline_var.reset(token)
+
+    def _budget(self, scope) -> Optional[float]:
+        for rule in self.rules:
+            if scope["method"] in rule.methods and rule.pattern.match(scope["path"]):
+                return rule.seconds
+        return settings.REQUEST_DEADLINE_SECONDS
@@ -1,19 +1,32 @@
-from typing import Optional
+from typing import List, Optional
+from datetime import datetime
+import logging
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
-from app.models.agent import AgentInDB
+from app.core.database import mongodb
+from app.core.deadlines import timeout_for, within_deadline
+from app.models.agent import AgentInDB, NotificationMode
 from app.models.application import ApplicationInDB
 
+logger = logging.getLogger(__name__)
+
 async def send_notification(
     agent: AgentInDB,
     application: ApplicationInDB,
-    document_type: str
+    document_type: str,
+    document_count: int = 1
 ) -> None:
     if not agent.settings.enable_notifications:
         return
 
+    if agent.settings.notification_mode != NotificationMode.IMMEDIATE:
+        # Digest agents get this in their next hourly/daily email instead
+        await queue_notification_event(agent, application, document_type, document_count)
+        return
+
     # Prepare email content
     subject = f"New Document Uploaded - {application.bio_info.first_name} {application.bio_info.last_name}"
     
@@ -34,21 +47,60 @@ async def send_notification(
     </html>
     """
 
-    # Create message
+    msg = build_message(agent.settings.notification_email or agent.email, subject, body)
+
+    try:
+        # smtplib blocks; send from the threadpool with a timeout that fits the request
+        timeout = timeout_for(settings.SMTP_TIMEOUT_SECONDS)
+        errors = await within_deadline(run_in_threadpool(send_messages, [msg], timeout))
+        if errors[0]:
+            raise errors[0]
+    except Exception as e:
+        # Log the error but don't raise it to prevent application failure
+        logger.error(f"Failed to send notification email: {str(e)}")
+
+async def queue_notification_event(agent: AgentInDB, application: ApplicationInDB, document_type: str, document_count: int = 1) -> None:
+    """Record an upload for the agent's next digest; everything the digest
+    shows is copied in so rendering it needs no other reads."""
+    try:
+        await mongodb.get_db().notification_events.insert_one({
+            "agent_id": str(agent.id),
+            "application_id": application.id,
+            "applicant_name": f"{application.bio_info.first_name} {application.bio_info.last_name}".strip(),
+            "document_type": document_type,
+            "document_count": document_count,
+            "uploaded_at": application.document_uploaded_at,
+            "created_at": datetime.utcnow(),
+            "digest_id": None
+        })
+    except Exception as e:
+        logger.error(f"Failed to queue notification event: {str(e)}")
+
+def build_message(to: str, subject: str, body: str) -> MIMEMultipart:
     msg = MIMEMultipart()
     msg['From'] = settings.SMTP_FROM_EMAIL
-    msg['To'] = agent.settings.notification_email or agent.email
+    msg['To'] = to
     msg['Subject'] = subject
     msg.attach(MIMEText(body, 'html'))
+    return msg
 
-    try:
-        # Send email
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            if settings.SMTP_TLS:
-                server.starttls()
-            if settings.SMTP_USER and settings.SMTP_PASSWORD:
-                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
-    except Exception as e:
-        # Log the error but don't raise it to prevent application failure
-        print(f"Failed to send notification email: {str(e)}") 
\ No newline at end of file
+def send_messages(messages: List[MIMEMultipart], timeout: float) -> List[Optional[Exception]]:
+    """Send over a single SMTP connection.
+
+    Returns one entry per message: None if it was accepted, otherwise the
+    error, so one refused recipient doesn't fail the rest. Failing to
+    connect or log in raises.
+    """
+    errors: List[Optional[Exception]] = []
+    with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=timeout) as server:
+        if settings.SMTP_TLS:
+            server.starttls()
+        if settings.SMTP_USER and settings.SMTP_PASSWORD:
+            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        for msg in messages:
+            try:
+                server.send_message(msg)
+                errors.append(None)
+            except (smtplib.SMTPException, OSError) as e:
+                errors.append(e)
+    return errors
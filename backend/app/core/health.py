@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from pymongo import monitoring
+from pymongo.common import MAX_POOL_SIZE
+
+from app.core.config import settings
+from app.core.deadlines import create_background_task
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Tracks checked-out and waiting connections per server.
+
+    pymongo doesn't expose pool usage, so this counts checkout/checkin
+    events; they arrive on driver threads, hence the lock.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.max_pool_size = MAX_POOL_SIZE
+        self.checked_out: Dict[str, int] = {}
+        self.waiting: Dict[str, int] = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            in_use = max(self.checked_out.values(), default=0)
+            waiting = sum(self.waiting.values())
+        # maxPoolSize=0 means unbounded
+        saturation = in_use / self.max_pool_size if self.max_pool_size else 0.0
+        return {"in_use": in_use, "waiting": waiting, "max_pool_size": self.max_pool_size, "saturation": round(saturation, 3)}
+
+    def _add(self, counts: Dict[str, int], address, delta: int) -> None:
+        key = f"{address[0]}:{address[1]}"
+        with self.lock:
+            counts[key] = max(0, counts.get(key, 0) + delta)
+
+    def pool_created(self, event):
+        # Only non-default options are reported
+        self.max_pool_size = event.options.get("maxPoolSize", MAX_POOL_SIZE)
+
+    def connection_check_out_started(self, event):
+        self._add(self.waiting, event.address, 1)
+
+    def connection_check_out_failed(self, event):
+        self._add(self.waiting, event.address, -1)
+
+    def connection_checked_out(self, event):
+        self._add(self.waiting, event.address, -1)
+        self._add(self.checked_out, event.address, 1)
+
+    def connection_checked_in(self, event):
+        self._add(self.checked_out, event.address, -1)
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        with self.lock:
+            self.checked_out.pop(f"{event.address[0]}:{event.address[1]}", None)
+            self.waiting.pop(f"{event.address[0]}:{event.address[1]}", None)
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes a sleeping task; a busy or
+    blocked loop delays every request on this worker by about that much."""
+
+    def __init__(self, interval: float, window: int = 20):
+        self.interval = interval
+        self.samples = deque(maxlen=window)
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self) -> asyncio.Task:
+        self.task = create_background_task(self._run())
+        return self.task
+
+    async def _run(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.monotonic() - started - self.interval) * 1000)
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "last_ms": round(self.samples[-1], 2) if self.samples else 0.0,
+            "max_ms": round(max(self.samples), 2) if self.samples else 0.0
+        }
+
+class WorkGauge:
+    """Counts jobs currently running (or queued for) a bounded resource."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    @contextmanager
+    def track(self):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            yield
+        finally:
+            self.active -= 1
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"active": self.active, "peak": self.peak}
+
+pool_monitor = PoolMonitor()
+loop_lag = LoopLagMonitor(settings.LOOP_LAG_INTERVAL_SECONDS)
+# PDF fill/sign jobs waiting for or running in the threadpool
+pdf_jobs = WorkGauge()
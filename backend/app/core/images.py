@@ -0,0 +1,65 @@
+import asyncio
+import io
+from functools import lru_cache
+from typing import IO, List, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.storage import StorageBackend, object_key
+from app.models.agent import ImageVariant
+
+# Widths served to applicant pages; smaller sources are never upscaled
+IMAGE_VARIANT_WIDTHS = {
+    "logo": (128, 256, 512),
+    "background": (640, 1280, 1920)
+}
+
+class InvalidImage(ValueError):
+    pass
+
+@lru_cache(maxsize=None)
+def get_pil():
+    # Pillow is only needed by workers that handle branding uploads
+    from PIL import Image, ImageOps
+    Image.MAX_IMAGE_PIXELS = settings.IMAGE_MAX_PIXELS
+    return Image, ImageOps
+
+def render_variants(fileobj: IO[bytes], widths: Tuple[int, ...], keep_alpha: bool) -> List[Tuple[int, int, bytes]]:
+    """Decode an upload and re-encode it as WebP at each width.
+
+    Orientation from EXIF is applied to the pixels and then all metadata
+    (EXIF, GPS, ICC, XMP) is dropped, since nothing is passed to `save`.
+    CPU-bound; call it in the threadpool.
+    """
+    Image, ImageOps = get_pil()
+    try:
+        with Image.open(fileobj) as source:
+            source.load()
+            image = ImageOps.exif_transpose(source)
+    except (Image.DecompressionBombError, OSError, SyntaxError) as e:
+        raise InvalidImage(str(e))
+
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if keep_alpha and has_alpha else "RGB")
+
+    targets = sorted({min(width, image.width) for width in widths})
+    variants = []
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        out = io.BytesIO()
+        resized.save(out, format="WEBP", quality=settings.IMAGE_VARIANT_QUALITY, method=4)
+        variants.append((width, height, out.getvalue()))
+    return variants
+
+async def store_image_variants(storage: StorageBackend, prefix: str, fileobj: IO[bytes], kind: str) -> List[ImageVariant]:
+    """Render the `kind` variants of an upload and store them under `prefix`, smallest first."""
+    rendered = await run_in_threadpool(render_variants, fileobj, IMAGE_VARIANT_WIDTHS[kind], kind == "logo")
+
+    async def save(width: int, height: int, data: bytes) -> ImageVariant:
+        key = object_key(prefix, f"{width}w.webp")
+        await storage.save(key, io.BytesIO(data), content_type="image/webp", public=True)
+        return ImageVariant(width=width, height=height, url=storage.public_url(key))
+
+    return list(await asyncio.gather(*(save(*variant) for variant in rendered)))
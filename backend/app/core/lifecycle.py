@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo import ASCENDING, ReplaceOne
+from pymongo.errors import BulkWriteError, CollectionInvalid, OperationFailure
+
+from app.core.config import settings
+from app.core.database import mongodb
+from app.core.deadlines import create_background_task
+from app.core.storage import get_storage
+from app.models.application import ApplicationStatus
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLLECTION = "applications_archive"
+CLOSED_STATUSES = [ApplicationStatus.APPROVED.value, ApplicationStatus.REJECTED.value]
+
+INDEX_NOT_FOUND = 27
+INDEX_OPTIONS_CONFLICT = 85
+DUPLICATE_KEY = 11000
+
+async def ensure_lifecycle_indexes(db) -> None:
+    """Index for finding stale drafts, and the zstd-compressed archive."""
+    # Drafts used to expire through a TTL index, which left their documents,
+    # files and queued notifications behind; expire_drafts deletes those too
+    try:
+        await db.applications.drop_index("draft_ttl")
+    except OperationFailure as e:
+        if e.code != INDEX_NOT_FOUND:
+            raise
+    await db.applications.create_index(
+        "updated_at",
+        name="draft_updated_at",
+        partialFilterExpression={"status": ApplicationStatus.DRAFT.value}
+    )
+
+    try:
+        await db.create_collection(
+            ARCHIVE_COLLECTION,
+            storageEngine={"wiredTiger": {"configString": "block_compressor=zstd"}}
+        )
+    except CollectionInvalid:
+        pass  # already exists
+    await db[ARCHIVE_COLLECTION].create_index(
+        [("agent_id", ASCENDING), ("updated_at", ASCENDING)]
+    )
+
+async def expire_drafts(db, older_than: timedelta, batch_size: int) -> int:
+    """Delete drafts untouched for `older_than` together with their recorded
+    documents, the stored files behind them and any queued notifications.
+
+    Every write path sets updated_at, so an applicant still typing keeps
+    their draft alive. A draft's dependents are deleted before the draft,
+    so a crash or a storage error leaves the draft to be expired again on
+    the next run rather than leaving orphans behind.
+    """
+    cutoff = datetime.utcnow() - older_than
+    query = {"status": ApplicationStatus.DRAFT.value, "updated_at": {"$lt": cutoff}}
+    storage = get_storage()
+    expired = 0
+
+    while True:
+        batch = await db.applications.find(query, {"_id": 1}).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            return expired
+        ids = [application["_id"] for application in batch]
+        application_ids = [str(application_id) for application_id in ids]
+
+        documents = await db.application_documents.find(
+            {"application_id": {"$in": application_ids}, "key": {"$exists": True}},
+            {"key": 1}
+        ).to_list(length=None)
+        await asyncio.gather(*(storage.delete(document["key"]) for document in documents))
+        await db.application_documents.delete_many({"application_id": {"$in": application_ids}})
+        # Unindexed, but sent events expire after a week so the scan stays small
+        await db.notification_events.delete_many({"application_id": {"$in": application_ids}})
+        # Only delete drafts nobody saved since they were read
+        result = await db.applications.delete_many({"_id": {"$in": ids}, **query})
+        expired += result.deleted_count
+
+async def archive_closed_applications(db, older_than: timedelta, batch_size: int) -> int:
+    """Move approved/rejected applications untouched for `older_than` into
+    the archive, one batch at a time.
+
+    Each batch is copied before it is deleted, so a crash can leave an
+    application in both collections but never in neither. A rerun, or an
+    application that was reopened and closed again after it was archived,
+    overwrites the existing copy with the hot one before the delete.
+    """
+    cutoff = datetime.utcnow() - older_than
+    query = {"status": {"$in": CLOSED_STATUSES}, "updated_at": {"$lt": cutoff}}
+    archived = 0
+
+    while True:
+        batch = await db.applications.find(query).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            return archived
+        ids = [application["_id"] for application in batch]
+        archived_at = datetime.utcnow()
+        for application in batch:
+            application["archived_at"] = archived_at
+
+        try:
+            await db[ARCHIVE_COLLECTION].insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            if any(error["code"] != DUPLICATE_KEY for error in e.details["writeErrors"]):
+                raise
+            # The archived copy may be older than the hot one; replace it
+            await db[ARCHIVE_COLLECTION].bulk_write([
+                ReplaceOne({"_id": batch[error["index"]]["_id"]}, batch[error["index"]])
+                for error in e.details["writeErrors"]
+            ], ordered=False)
+        # Only delete what hasn't changed since it was read, e.g. reopened
+        result = await db.applications.delete_many({"_id": {"$in": ids}, **query})
+        archived += result.deleted_count
+
+async def find_archived_application(db, query: dict, projection: Optional[dict] = None) -> Optional[dict]:
+    application = await db[ARCHIVE_COLLECTION].find_one(query, projection)
+    if application:
+        application["archived"] = True
+    return application
+
+async def run_lifecycle(interval: float) -> None:
+    while True:
+        try:
+            expired = await expire_drafts(
+                mongodb.get_db(),
+                timedelta(days=settings.DRAFT_TTL_DAYS),
+                settings.ARCHIVE_BATCH_SIZE
+            )
+            if expired:
+                logger.info(f"Expired {expired} inactive drafts")
+        except Exception as e:
+            logger.error(f"Draft expiry failed: {str(e)}")
+        try:
+            archived = await archive_closed_applications(
+                mongodb.get_db(),
+                timedelta(days=settings.ARCHIVE_AFTER_DAYS),
+                settings.ARCHIVE_BATCH_SIZE
+            )
+            if archived:
+                logger.info(f"Archived {archived} closed applications")
+        except Exception as e:
+            logger.error(f"Application archival failed: {str(e)}")
+        await asyncio.sleep(interval)
+
+def start_lifecycle_task() -> Optional[asyncio.Task]:
+    if settings.LIFECYCLE_INTERVAL_SECONDS <= 0:
+        return None
+    return create_background_task(run_lifecycle(settings.LIFECYCLE_INTERVAL_SECONDS))
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core.database import mongodb
+from app.core.deadlines import create_background_task
+
+logger = logging.getLogger(__name__)
+
+# Raised when the resume token has fallen off the oplog
+CHANGE_STREAM_HISTORY_LOST = 286
+
+# Only the fields agents' dashboards need; keeps change events small.
+# Inserts and replaces carry the document; updates are looked up ourselves,
+# and only for agents with a subscriber on this worker.
+EVENT_FIELDS = {"agent_id": 1, "status": 1, "updated_at": 1, "bio_info.first_name": 1, "bio_info.last_name": 1}
+CHANGE_PIPELINE = [
+    {"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}},
+    {"$project": {
+        "operationType": 1,
+        "documentKey": 1,
+        "fullDocument.agent_id": 1,
+        "fullDocument.status": 1,
+        "fullDocument.updated_at": 1,
+        "fullDocument.bio_info.first_name": 1,
+        "fullDocument.bio_info.last_name": 1,
+    }},
+]
+
+class ApplicationChangeHub:
+    """One MongoDB change stream on `applications` per worker, fanned out to
+    every connected agent through per-connection queues.
+
+    Change streams need a replica set; for local work a single-node set is
+    enough (`mongod --replSet rs0` then `rs.initiate()` in mongosh).
+    """
+
+    def __init__(self, queue_size: int = 100, retry_delay: float = 5.0, max_owners: int = 50_000):
+        self._queue_size = queue_size
+        self._retry_delay = retry_delay
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        # application id -> agent id; an application never changes agent
+        self._owners: "OrderedDict[str, str]" = OrderedDict()
+        self._max_owners = max_owners
+        self.stats = {"events": 0, "lookups": 0, "published": 0}
+        self._task: Optional[asyncio.Task] = None
+        self._resume_token = None
+
+    def subscribe(self, agent_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.setdefault(agent_id, set()).add(queue)
+        if self._task is None or self._task.done():
+            self._task = create_background_task(self._watch())
+        return queue
+
+    def unsubscribe(self, agent_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(agent_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[agent_id]
+
+    def connection_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _watch(self) -> None:
+        while self._subscribers:
+            try:
+                db = mongodb.get_db()
+                async with db.applications.watch(
+                    CHANGE_PIPELINE,
+                    resume_after=self._resume_token
+                ) as stream:
+                    async for change in stream:
+                        self._resume_token = stream.resume_token
+                        await self._handle(db, change)
+                        if not self._subscribers:
+                            return
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                if isinstance(e, OperationFailure) and e.code == CHANGE_STREAM_HISTORY_LOST:
+                    self._resume_token = None
+                    self._publish_all({"type": "resync"})
+                logger.error(f"Application change stream failed, retrying: {str(e)}")
+                await asyncio.sleep(self._retry_delay)
+
+    async def _handle(self, db, change: Dict[str, Any]) -> None:
+        self.stats["events"] += 1
+        application_id = change["documentKey"]["_id"]
+        document = change.get("fullDocument")
+        if document is None:
+            # Updates carry no document; skip the lookup when the owner is
+            # known and nobody on this worker is watching that agent
+            owner = self._owners.get(str(application_id))
+            if owner is not None and owner not in self._subscribers:
+                return
+            self.stats["lookups"] += 1
+            document = await db.applications.find_one({"_id": application_id}, EVENT_FIELDS)
+            if document is None:
+                return
+        if document.get("agent_id"):
+            self._remember_owner(str(application_id), str(document["agent_id"]))
+        self._publish(change, document)
+
+    def _remember_owner(self, application_id: str, agent_id: str) -> None:
+        self._owners[application_id] = agent_id
+        self._owners.move_to_end(application_id)
+        while len(self._owners) > self._max_owners:
+            self._owners.popitem(last=False)
+
+    def _publish(self, change: Dict[str, Any], document: Dict[str, Any]) -> None:
+        agent_id = document.get("agent_id")
+        queues = self._subscribers.get(str(agent_id)) if agent_id else None
+        if not queues:
+            return
+        self.stats["published"] += 1
+
+        bio_info = document.get("bio_info") or {}
+        event = {
+            "type": change["operationType"],
+            "application_id": str(change["documentKey"]["_id"]),
+            "status": document.get("status"),
+            "first_name": bio_info.get("first_name"),
+            "last_name": bio_info.get("last_name"),
+            "updated_at": document.get("updated_at"),
+        }
+        for queue in queues:
+            self._offer(queue, event)
+
+    def _publish_all(self, event: Dict[str, Any]) -> None:
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._offer(queue, event)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer; tell it to refetch instead of blocking everyone
+            queue.get_nowait()
+            queue.put_nowait({"type": "resync"})
+
+application_changes = ApplicationChangeHub()
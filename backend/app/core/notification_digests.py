@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from html import escape
+from typing import Callable, Dict, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo.errors import DuplicateKeyError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import mongodb
+from app.core.deadlines import create_background_task
+from app.core.email_notifications import build_message, send_messages
+from app.models.agent import NotificationMode
+
+logger = logging.getLogger(__name__)
+
+def window_start(now: datetime, mode: NotificationMode) -> datetime:
+    """Start of the digest window containing `now` (UTC)."""
+    if mode == NotificationMode.HOURLY:
+        return now.replace(minute=0, second=0, microsecond=0)
+    if mode == NotificationMode.DAILY:
+        return now.replace(hour=0, minute=0, second=0, microsecond=0)
+    # Agents who switched back to immediate get whatever is still queued
+    return now
+
+def render_digest(events: List[Dict], mode: NotificationMode) -> tuple:
+    by_application = defaultdict(list)
+    for event in events:
+        by_application[(event["application_id"], event["applicant_name"])].append(event)
+
+    # One event per upload request, which may have carried several files
+    document_count = sum(event.get("document_count", 1) for event in events)
+    period = "hour" if mode == NotificationMode.HOURLY else "day"
+    subject = f"{document_count} new document(s) across {len(by_application)} application(s) this {period}"
+    rows = "".join(
+        f"""<li><strong>{escape(applicant_name or "Applicant")}</strong>: """
+        f"""{escape(", ".join(event["document_type"] for event in application_events))} """
+        f"""(<a href="{settings.FRONTEND_URL}/applications/{application_id}">view</a>)</li>"""
+        for (application_id, applicant_name), application_events in by_application.items()
+    )
+    body = f"""
+    <html>
+        <body>
+            <h2>Document Uploads Digest</h2>
+            <p>Applicants uploaded {document_count} document(s) since your last digest:</p>
+            <ul>{rows}</ul>
+        </body>
+    </html>
+    """
+    return subject, body
+
+class NotificationDigestScheduler:
+    """Sends each digest-mode agent one email per window for the uploads
+    queued in `notification_events`.
+
+    A digest is claimed by inserting its (agent, window) id into
+    `notification_digests` before any events are touched, so several
+    workers can run the scheduler and only one sends each digest. Each
+    digest is marked sent or released on its own, so one refused address
+    only retries that agent's digest; a claim left unsent by a crashed
+    worker is released once it is older than the claim timeout. `clock` is
+    injectable so windows can be tested without waiting for them.
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = datetime.utcnow):
+        self.clock = clock
+        self.stats = {"digests": 0, "events": 0, "failed": 0}
+
+    async def run_due(self) -> int:
+        """Send every digest whose window has closed; returns how many were sent."""
+        db = mongodb.get_db()
+        now = self.clock()
+        await self._release_stale_claims(db, now)
+        agent_ids = await db.notification_events.distinct("agent_id", {"digest_id": None})
+
+        claims = []
+        for agent_id in agent_ids:
+            claim = await self._claim(db, agent_id, now)
+            if claim:
+                claims.append(claim)
+        if not claims:
+            return 0
+
+        try:
+            # One SMTP connection for the whole run
+            errors = await run_in_threadpool(send_messages, [message for _, message, _ in claims], settings.SMTP_TIMEOUT_SECONDS)
+        except Exception as e:
+            errors = [e] * len(claims)
+
+        sent = 0
+        for (digest_id, _, count), error in zip(claims, errors):
+            if error:
+                logger.error(f"Failed to send notification digest {digest_id}: {str(error)}")
+                self.stats["failed"] += 1
+                await self._release(db, [digest_id])
+                continue
+            await db.notification_events.update_many({"digest_id": digest_id}, {"$set": {"sent_at": now}})
+            await db.notification_digests.update_one({"_id": digest_id}, {"$set": {"sent_at": now}})
+            self.stats["digests"] += 1
+            self.stats["events"] += count
+            sent += 1
+        return sent
+
+    async def _release(self, db, digest_ids: List[str]) -> None:
+        # Events first: a claim without events is harmless, events pointing
+        # at a deleted claim would never be picked up again
+        await db.notification_events.update_many(
+            {"digest_id": {"$in": digest_ids}, "sent_at": None},
+            {"$set": {"digest_id": None}}
+        )
+        await db.notification_digests.delete_many({"_id": {"$in": digest_ids}, "sent_at": None})
+
+    async def _release_stale_claims(self, db, now: datetime) -> None:
+        stale_before = now - timedelta(seconds=settings.NOTIFICATION_DIGEST_CLAIM_TIMEOUT_SECONDS)
+        digest_ids = await db.notification_digests.distinct("_id", {"sent_at": None, "created_at": {"$lt": stale_before}})
+        if digest_ids:
+            logger.warning(f"Releasing {len(digest_ids)} notification digests claimed but never sent")
+            await self._release(db, digest_ids)
+
+    async def _claim(self, db, agent_id: str, now: datetime) -> Optional[tuple]:
+        try:
+            agent = await db.agents.find_one({"_id": ObjectId(agent_id)}, {"email": 1, "settings": 1})
+        except InvalidId:
+            agent = None
+        agent_settings = (agent or {}).get("settings") or {}
+        if not agent or not agent_settings.get("enable_notifications", True):
+            # Nobody to tell; drop the backlog rather than let it grow
+            await db.notification_events.delete_many({"agent_id": agent_id, "digest_id": None})
+            return None
+
+        mode = NotificationMode(agent_settings.get("notification_mode") or NotificationMode.IMMEDIATE)
+        cutoff = window_start(now, mode)
+        if not await db.notification_events.count_documents(
+            {"agent_id": agent_id, "digest_id": None, "created_at": {"$lt": cutoff}}, limit=1
+        ):
+            return None
+
+        digest_id = f"{agent_id}:{cutoff.isoformat()}"
+        try:
+            await db.notification_digests.insert_one({
+                "_id": digest_id,
+                "agent_id": agent_id,
+                "mode": mode.value,
+                "window_end": cutoff,
+                "created_at": now
+            })
+        except DuplicateKeyError:
+            return None  # another worker has this window
+
+        await db.notification_events.update_many(
+            {"agent_id": agent_id, "digest_id": None, "created_at": {"$lt": cutoff}},
+            {"$set": {"digest_id": digest_id}}
+        )
+        events = await db.notification_events.find({"digest_id": digest_id}).sort("created_at", 1).to_list(length=None)
+        subject, body = render_digest(events, mode)
+        message = build_message(agent_settings.get("notification_email") or agent["email"], subject, body)
+        return digest_id, message, len(events)
+
+async def run_digest_scheduler(scheduler: NotificationDigestScheduler, interval: float) -> None:
+    while True:
+        try:
+            sent = await scheduler.run_due()
+            if sent:
+                logger.info(f"Sent {sent} notification digests")
+        except Exception as e:
+            logger.error(f"Notification digest run failed: {str(e)}")
+        await asyncio.sleep(interval)
+
+notification_digests = NotificationDigestScheduler()
+
+def start_digest_task() -> Optional[asyncio.Task]:
+    if settings.NOTIFICATION_DIGEST_INTERVAL_SECONDS <= 0:
+        return None
+    return create_background_task(run_digest_scheduler(notification_digests, settings.NOTIFICATION_DIGEST_INTERVAL_SECONDS))
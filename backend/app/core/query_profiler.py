@@ -0,0 +1,148 @@
+import asyncio
+import json
+import logging
+import random
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import monitoring
+
+from app.core.config import settings
+from app.core.deadlines import create_background_task
+
+logger = logging.getLogger("app.slow_queries")
+
+# Commands whose plans `explain` can report on
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+
+# Driver/session bookkeeping that explain rejects or doesn't need
+UNEXPLAINABLE_FIELDS = {"$db", "lsid", "$clusterTime", "txnNumber", "$readPreference", "autocommit", "startTransaction", "readConcern", "writeConcern"}
+
+IGNORED_COMMANDS = {"explain", "hello", "isMaster", "ismaster", "ping", "saslStart", "saslContinue", "endSessions", "killCursors"}
+
+def redact(value: Any) -> Any:
+    """Keep a command's shape (keys, operators, nesting) and drop its values."""
+    if isinstance(value, dict):
+        return {key: redact(subvalue) for key, subvalue in value.items()}
+    if isinstance(value, (list, tuple)):
+        # Pipelines keep every stage; value lists collapse to one placeholder
+        if value and all(isinstance(item, dict) for item in value):
+            return [redact(item) for item in value]
+        return ["?"] if value else []
+    return "?"
+
+def summarize_explain(explain: Dict[str, Any]) -> Dict[str, Any]:
+    stats = explain.get("executionStats") or {}
+    if not stats and explain.get("stages"):
+        # Aggregations nest the query stage's stats in the first $cursor stage
+        cursor_stage = explain["stages"][0].get("$cursor", {})
+        stats = cursor_stage.get("executionStats", {})
+        explain = cursor_stage
+    winning_plan = (explain.get("queryPlanner") or {}).get("winningPlan", {})
+    stages = []
+    stage = winning_plan.get("queryPlan", winning_plan)
+    while stage:
+        stages.append(stage.get("stage"))
+        stage = stage.get("inputStage")
+    return {
+        "plan": " <- ".join(name for name in stages if name),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "docs_examined": stats.get("totalDocsExamined"),
+        "returned": stats.get("nReturned"),
+        "execution_ms": stats.get("executionTimeMillis"),
+    }
+
+class SlowQueryLog(monitoring.CommandListener):
+    """Command listener that records commands slower than a threshold.
+
+    pymongo calls listeners synchronously on the driver's threads, so this
+    only does cheap bookkeeping there; explains of a sampled subset are
+    scheduled back onto the event loop. Entries land in a bounded ring
+    buffer and the `app.slow_queries` log as JSON.
+    """
+
+    def __init__(self, threshold_ms: float, sample_rate: float, size: int):
+        self.threshold_ms = threshold_ms
+        self.sample_rate = sample_rate
+        self.entries = deque(maxlen=size)
+        self._in_flight: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client = None
+
+    def attach(self, client, loop: asyncio.AbstractEventLoop) -> None:
+        self._client = client
+        self._loop = loop
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        with self._lock:
+            self._in_flight[event.request_id] = {
+                "command": event.command,
+                "database": event.database_name,
+            }
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event, failed=True)
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        entries = list(self.entries)[::-1]
+        return entries[:limit] if limit else entries
+
+    def _finish(self, event, failed: bool) -> None:
+        with self._lock:
+            started = self._in_flight.pop(event.request_id, None)
+        if started is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        command = started["command"]
+        collection = command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = command.get("collection")
+        entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "command": event.command_name,
+            "database": started["database"],
+            "collection": collection if isinstance(collection, str) else None,
+            "duration_ms": round(duration_ms, 2),
+            "failed": failed,
+            "shape": redact({key: value for key, value in command.items() if key not in UNEXPLAINABLE_FIELDS and key != event.command_name}),
+            "explain": None,
+        }
+        self.entries.append(entry)
+        logger.warning(json.dumps(entry, default=str))
+
+        if (
+            not failed
+            and event.command_name in EXPLAINABLE_COMMANDS
+            and self._loop is not None
+            and random.random() < self.sample_rate
+        ):
+            # Detached from the request (and its deadline) that ran the command
+            self._loop.call_soon_threadsafe(create_background_task, self._explain(entry, command, started["database"]))
+
+    async def _explain(self, entry: Dict[str, Any], command: Dict[str, Any], database: str) -> None:
+        explainable = {key: value for key, value in command.items() if key not in UNEXPLAINABLE_FIELDS}
+        try:
+            explain = await self._client[database].command(
+                {"explain": explainable, "verbosity": "executionStats"}
+            )
+            entry["explain"] = summarize_explain(explain)
+            logger.warning(json.dumps({"explain_for": entry["timestamp"], "command": entry["command"], "collection": entry["collection"], **entry["explain"]}, default=str))
+        except Exception as e:
+            entry["explain"] = {"error": str(e)}
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE,
+    size=settings.SLOW_QUERY_LOG_SIZE
+)
@@ -0,0 +1,270 @@
+import asyncio
+import json
+import logging
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+from starlette.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.database import mongodb
+
+logger = logging.getLogger(__name__)
+
+# The start request body is a tiny JSON object; anything bigger is rejected
+# before it is read into memory
+MAX_INSPECTED_BODY = 4096
+
+@dataclass(frozen=True)
+class Limit:
+    per_minute: float
+    burst: int
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60.0
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    name: str
+    methods: Tuple[str, ...]
+    pattern: Pattern
+    per_ip: Optional[Limit] = None
+    per_link: Optional[Limit] = None
+    link_from_body: bool = False
+    concurrency_group: Optional[str] = None
+
+class InMemoryRateLimitBackend:
+    """Per-worker token buckets in a bounded LRU."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self._max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def take(self, key: str, limit: Limit) -> float:
+        """Take one token; returns 0 if allowed, else seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (float(limit.burst), now))
+        tokens = min(float(limit.burst), tokens + (now - updated) * limit.rate)
+        if tokens >= 1:
+            tokens -= 1
+            retry_after = 0.0
+        else:
+            retry_after = (1 - tokens) / limit.rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self._max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+class MongoRateLimitBackend:
+    """Token buckets shared by every worker, one document per key.
+
+    Refill and take happen in a single atomic pipeline update using the
+    server clock ($$NOW), so workers never race or disagree on time. Any
+    MongoDB (a local mongod works as the stand-in) can back it.
+    """
+
+    collection_name = "rate_limits"
+
+    async def take(self, key: str, limit: Limit) -> float:
+        db = mongodb.get_db()
+        elapsed_seconds = {"$divide": [{"$subtract": ["$$NOW", {"$ifNull": ["$updated_at", "$$NOW"]}]}, 1000]}
+        bucket = await db[self.collection_name].find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {
+                    "tokens": {"$min": [
+                        limit.burst,
+                        {"$add": [{"$ifNull": ["$tokens", limit.burst]}, {"$multiply": [elapsed_seconds, limit.rate]}]}
+                    ]},
+                    "updated_at": "$$NOW"
+                }},
+                {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+                {"$set": {"tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]}}}
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        if bucket["allowed"]:
+            return 0.0
+        return (1 - bucket["tokens"]) / limit.rate
+
+def create_rate_limit_backend():
+    if settings.RATE_LIMIT_BACKEND == "mongo":
+        return MongoRateLimitBackend()
+    return InMemoryRateLimitBackend()
+
+def default_rules() -> List[RateLimitRule]:
+    prefix = re.escape(settings.API_V1_STR)
+    public = Limit(settings.RATE_LIMIT_PUBLIC_PER_MINUTE, max(1, settings.RATE_LIMIT_PUBLIC_PER_MINUTE // 4))
+    per_link = Limit(settings.RATE_LIMIT_LINK_PER_MINUTE, max(1, settings.RATE_LIMIT_LINK_PER_MINUTE // 4))
+    expensive = Limit(settings.RATE_LIMIT_EXPENSIVE_PER_MINUTE, max(1, settings.RATE_LIMIT_EXPENSIVE_PER_MINUTE // 2))
+    return [
+        RateLimitRule(
+            name="start",
+            methods=("POST",),
+            pattern=re.compile(rf"^{prefix}/applications/start/?$"),
+            per_ip=public,
+            per_link=per_link,
+            link_from_body=True
+        ),
+        RateLimitRule(
+            name="validate",
+            methods=("GET",),
+            pattern=re.compile(rf"^{prefix}/(applications/validate-link|links/validate|links/bootstrap)/(?P<link_id>[^/]+)/?$"),
+            per_ip=public,
+            per_link=per_link
+        ),
+        RateLimitRule(
+            name="upload",
+            methods=("POST",),
+            pattern=re.compile(rf"^{prefix}/applications/[^/]+/documents(/presign|/confirm)?(/batch)?/?$"),
+            per_ip=public
+        ),
+        RateLimitRule(
+            name="generate",
+            methods=("POST",),
+            pattern=re.compile(rf"^{prefix}/(links/(generate|bulk)|applications/generate-link)/?$"),
+            per_ip=expensive
+        ),
+        RateLimitRule(
+            name="pdf",
+            methods=("GET", "POST"),
+            pattern=re.compile(rf"^{prefix}/applications/api/(generate-pdf|sign-pdf|upload-completed-form|preview-pdf/[^/]+)/?$"),
+            per_ip=expensive,
+            concurrency_group="pdf"
+        ),
+    ]
+
+def client_ip(scope) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+async def buffer_body(receive, limit: int):
+    """Read the request body, stopping once it exceeds `limit` bytes.
+
+    Returns the body (None if it was too big) and a receive that replays
+    what was read, then hands over to the original for the rest.
+    """
+    chunks = []
+    size = 0
+    more_body = True
+    while more_body and size <= limit:
+        message = await receive()
+        if message["type"] != "http.request":
+            return b"", receive
+        chunks.append(message.get("body", b""))
+        size += len(chunks[-1])
+        more_body = message.get("more_body", False)
+    body = b"".join(chunks)
+    replayed = False
+
+    async def replay():
+        nonlocal replayed
+        if not replayed:
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": more_body}
+        return await receive()
+
+    return (body if size <= limit else None), replay
+
+def link_id_from_body(body: bytes) -> Optional[str]:
+    if not body:
+        return None
+    try:
+        link_id = json.loads(body).get("link_id")
+    except (ValueError, AttributeError):
+        return None
+    return link_id if isinstance(link_id, str) else None
+
+class RateLimitMiddleware:
+    """ASGI admission control for the public applicant endpoints.
+
+    Requests are checked against per-IP and per-link token buckets and shed
+    with 429 + Retry-After before any handler or database work runs.
+    Expensive routes also share a per-worker concurrency cap and get 503
+    when it is full instead of queueing behind other clients.
+    """
+
+    def __init__(self, app, backend=None, rules: Optional[List[RateLimitRule]] = None):
+        self.app = app
+        self.backend = backend or create_rate_limit_backend()
+        self.rules = rules if rules is not None else default_rules()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {
+            rule.concurrency_group: asyncio.Semaphore(settings.EXPENSIVE_ROUTE_CONCURRENCY)
+            for rule in self.rules if rule.concurrency_group
+        }
+        self.stats = {"limited": 0, "shed": 0}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            return await self.app(scope, receive, send)
+
+        rule, match = self._match(scope)
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        # The per-IP token is taken before any of the body is read
+        if rule.per_ip:
+            retry_after = await self._take(f"{rule.name}:ip:{client_ip(scope)}", rule.per_ip)
+            if retry_after:
+                self.stats["limited"] += 1
+                return await self._reject(scope, receive, send, 429, retry_after, "Too many requests")
+
+        link_id = match.groupdict().get("link_id")
+        if rule.link_from_body:
+            body, receive = await buffer_body(receive, MAX_INSPECTED_BODY)
+            if body is None:
+                # Padding the body must not be a way around the per-link limit
+                return await self._reject(scope, receive, send, 413, 0, "Request body too large")
+            link_id = link_id_from_body(body)
+        if link_id and rule.per_link:
+            retry_after = await self._take(f"{rule.name}:link:{link_id}", rule.per_link)
+            if retry_after:
+                self.stats["limited"] += 1
+                return await self._reject(scope, receive, send, 429, retry_after, "Too many requests")
+
+        if rule.concurrency_group:
+            semaphore = self._semaphores[rule.concurrency_group]
+            if semaphore.locked():
+                self.stats["shed"] += 1
+                return await self._reject(scope, receive, send, 503, 1, "Server busy, please retry")
+            async with semaphore:
+                return await self.app(scope, receive, send)
+
+        await self.app(scope, receive, send)
+
+    def _match(self, scope):
+        method = scope["method"]
+        path = scope["path"]
+        for rule in self.rules:
+            if method in rule.methods:
+                match = rule.pattern.match(path)
+                if match:
+                    return rule, match
+        return None, None
+
+    async def _take(self, key: str, limit: Limit) -> float:
+        try:
+            return await self.backend.take(key, limit)
+        except PyMongoError as e:
+            # Fail open: a broken limiter store must not take the site down
+            logger.error(f"Rate limit backend error: {str(e)}")
+            return 0.0
+
+    @staticmethod
+    async def _reject(scope, receive, send, status_code: int, retry_after: float, detail: str):
+        headers = {"Retry-After": str(max(1, math.ceil(retry_after)))} if retry_after else {}
+        response = JSONResponse({"detail": detail}, status_code=status_code, headers=headers)
+        await response(scope, receive, send)
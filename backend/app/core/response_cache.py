@@ -0,0 +1,148 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+
+from app.core.database import mongodb
+from app.core.single_flight import WriteGenerations, single_flight
+
+# Responses computed relative to "now" (default date ranges) roll over at
+# least this often even when no data changes
+TIME_SLOT_SECONDS = 15 * 60
+
+class ResponseCache:
+    """Small in-process LRU of response bodies keyed by (agent, query, watermark).
+
+    A new watermark changes the key, so entries never need invalidating;
+    old ones simply age out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if key not in self._entries:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+response_cache = ResponseCache()
+
+class ExpiringCache(ResponseCache):
+    """ResponseCache whose entries also expire after `ttl` seconds and can
+    be dropped explicitly, for data keyed by something without a watermark.
+
+    Invalidation only reaches this worker; the TTL bounds staleness on the
+    others.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        super().__init__(max_entries)
+        self.ttl = ttl
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = super().get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self.invalidate(key)
+            self.stats["hits"] -= 1
+            self.stats["misses"] += 1
+            return None
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        super().put(key, (time.monotonic() + self.ttl, value))
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+# Public applicant landing page data: link -> agent, and agent -> branding
+link_cache = ExpiringCache(ttl=30, max_entries=10_000)
+branding_cache = ExpiringCache(ttl=300)
+
+# Bumped by agent id after every write to one of the agent's applications.
+# Part of serve_with_etag's single-flight keys, so a read that started
+# before an agent's write is never shared with the writer's next request
+agent_writes = WriteGenerations()
+
+async def agent_watermark(db, agent_id: str) -> str:
+    """Latest updated_at plus document count for an agent's applications.
+
+    Covered by the (agent_id, updated_at) index, so this never touches the
+    documents themselves. Every write path sets updated_at, and deletes
+    change the count.
+    """
+    result = await db.applications.aggregate([
+        {"$match": {"agent_id": agent_id}},
+        {"$group": {"_id": None, "updated_at": {"$max": "$updated_at"}, "count": {"$sum": 1}}}
+    ]).to_list(length=1)
+    if not result:
+        return "empty"
+    updated_at = result[0]["updated_at"]
+    return f"{updated_at.timestamp() if updated_at else 0}:{result[0]['count']}"
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+async def serve_with_etag(
+    request: Request,
+    response: Response,
+    agent_id: str,
+    compute: Callable[[], Awaitable[Any]],
+    vary: str = "",
+    read_profile: str = "primary"
+) -> Any:
+    """Answer an agent-scoped read from its watermark.
+
+    If-None-Match hits get a 304 without running `compute`; repeat requests
+    with the same watermark are served from `response_cache`, and identical
+    concurrent requests share one watermark read and one `compute` through
+    `single_flight`, keyed on the agent's write generation too. `vary` covers
+    inputs that aren't in the query string, such as the agent's timezone.
+    Pass the `read_profile` `compute` reads with, so the watermark is no
+    fresher than the data cached under it.
+    """
+    db = mongodb.get_db(read_profile)
+    generation = agent_writes.get(agent_id)
+    # An agent's tabs and dashboard widgets loading together share this read
+    watermark = await single_flight.do(
+        "watermark",
+        (agent_id, read_profile, generation),
+        lambda: agent_watermark(db, agent_id)
+    )
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    time_slot = int(time.time() // TIME_SLOT_SECONDS)
+    key = (agent_id, request.url.path, query, vary, watermark, time_slot)
+    etag = '"' + hashlib.sha1(repr(key).encode()).hexdigest()[:20] + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        response_cache.stats["not_modified"] += 1
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get(key)
+    if body is None:
+        body = await single_flight.do(request.url.path, (*key, generation), compute)
+        response_cache.put(key, body)
+
+    response.headers.update(headers)
+    return body
@@ -0,0 +1,65 @@
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+class SingleFlight:
+    """Runs one call per key at a time and hands its result to every caller
+    that asks for the same key while it is in flight.
+
+    The shared call runs as its own task, so a caller that disconnects
+    doesn't cancel it for the others; it inherits the first caller's
+    context, deadline included. Nothing is kept once the call finishes,
+    so callers that need to see their own writes must put something in the
+    key that changes when they write.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Tuple[str, Hashable], asyncio.Task] = {}
+        self.stats = {"calls": 0, "coalesced": 0, "errors": 0}
+        self.coalesced_by_route: Counter = Counter()
+
+    async def do(self, route: str, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight_key = (route, key)
+        task = self._calls.get(flight_key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[flight_key] = task
+            task.add_done_callback(lambda done: self._finish(flight_key, done))
+            self.stats["calls"] += 1
+        else:
+            self.stats["coalesced"] += 1
+            self.coalesced_by_route[route] += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def _finish(self, flight_key: Tuple[str, Hashable], task: asyncio.Task) -> None:
+        if self._calls.get(flight_key) is task:
+            del self._calls[flight_key]
+        # Retrieve the error so it isn't reported as unhandled when every caller left
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["errors"] += 1
+
+class WriteGenerations:
+    """Per-key counters bumped after every write, for single-flight keys.
+
+    A read keyed on the current generation can't be shared with a caller
+    whose write finished after that read started. Counters are kept per
+    hash slot rather than per key, so they stay bounded; a collision only
+    makes a key's generation change more often. Only this worker's writes
+    are seen.
+    """
+
+    SLOTS = 4096
+
+    def __init__(self):
+        self._counts = [0] * self.SLOTS
+
+    def get(self, key: Hashable) -> int:
+        return self._counts[hash(key) % self.SLOTS]
+
+    def bump(self, key: Hashable) -> None:
+        self._counts[hash(key) % self.SLOTS] += 1
+
+single_flight = SingleFlight()
@@ -0,0 +1,433 @@
+import hashlib
+import hmac
+import json
+import mimetypes
+import os
+import posixpath
+import shutil
+import tempfile
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import IO, AsyncIterator, Dict, Optional
+from urllib.parse import quote, urlencode
+
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.deadlines import within_deadline
+
+CHUNK_SIZE = 256 * 1024
+
+class StorageError(Exception):
+    pass
+
+class ObjectNotFound(StorageError):
+    pass
+
+class StoredObject(BaseModel):
+    key: str
+    size: int
+    content_type: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[datetime] = None
+    public: bool = False
+    metadata: Dict[str, str] = {}
+
+class PresignedUpload(BaseModel):
+    """Everything a browser needs to send a file straight to storage.
+
+    For POST uploads `fields` go in the multipart form ahead of the file;
+    for PUT uploads `headers` must be sent with the raw body.
+    """
+    key: str
+    method: str
+    url: str
+    fields: Dict[str, str] = {}
+    headers: Dict[str, str] = {}
+    expires_at: datetime
+
+class StorageBackend:
+    """Where uploaded documents, branding images and generated PDFs live.
+
+    Every upload and PDF path goes through this interface, so any API node
+    can read what another node wrote. All methods are async; blocking SDK
+    and file calls run in the threadpool.
+    """
+
+    async def save(
+        self,
+        key: str,
+        fileobj: IO[bytes],
+        content_type: Optional[str] = None,
+        public: bool = False,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> StoredObject:
+        raise NotImplementedError
+
+    async def head(self, key: str) -> Optional[StoredObject]:
+        raise NotImplementedError
+
+    def iter_chunks(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+    async def download_to(self, key: str, path: str) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def public_url(self, key: str) -> str:
+        raise NotImplementedError
+
+    async def presigned_url(self, key: str, expires_in: int = 3600) -> str:
+        raise NotImplementedError
+
+    async def presigned_upload(
+        self,
+        key: str,
+        content_type: str,
+        max_size: int,
+        expires_in: int = 900,
+        public: bool = False
+    ) -> PresignedUpload:
+        """Issue a short-lived upload that storage itself enforces: the
+        object must have exactly `content_type` and at most `max_size` bytes."""
+        raise NotImplementedError
+
+    async def ping(self) -> None:
+        """Raise StorageError unless storage can currently be written to."""
+        raise NotImplementedError
+
+    async def save_file(self, key: str, path: str, **kwargs) -> StoredObject:
+        with open(path, "rb") as fileobj:
+            return await self.save(key, fileobj, **kwargs)
+
+def boto_errors():
+    from botocore.exceptions import BotoCoreError, ClientError
+    return (BotoCoreError, ClientError)
+
+async def run_blocking(func, *args, **kwargs):
+    # Threadpool call bounded by the request deadline; the thread itself
+    # finishes in the background, bounded by the client's own timeouts
+    return await within_deadline(run_in_threadpool(func, *args, **kwargs))
+
+def guess_content_type(key: str) -> str:
+    return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+def object_key(*parts: str) -> str:
+    """Join key parts and reject anything that could escape the storage root
+    or the prefix named by the first part (its first segment if it's the only one)."""
+    joined = "/".join(part.strip("/") for part in parts)
+    key = posixpath.normpath(joined)
+    if key.startswith("..") or key.startswith("/") or key in ("", "."):
+        raise StorageError(f"Invalid object key: {joined}")
+    prefix = posixpath.normpath(parts[0].strip("/")) if len(parts) > 1 else joined.split("/")[0]
+    if key != prefix and not key.startswith(prefix + "/"):
+        raise StorageError(f"Invalid object key: {joined}")
+    return key
+
+def sign_file_url(key: str, expires: int) -> str:
+    message = f"{key}:{expires}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+def verify_file_signature(key: str, expires: int, signature: str) -> bool:
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(sign_file_url(key, expires), signature)
+
+def sign_upload(key: str, expires: int, content_type: str, max_size: int, public: bool) -> str:
+    message = f"PUT:{key}:{expires}:{content_type}:{max_size}:{int(public)}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
+
+def verify_upload_signature(key: str, expires: int, content_type: str, max_size: int, public: bool, signature: str) -> bool:
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(sign_upload(key, expires, content_type, max_size, public), signature)
+
+class LocalStorage(StorageBackend):
+    """Filesystem storage; fine for a single node or a shared volume.
+
+    Content type, visibility and metadata are kept in a `.meta.json`
+    sidecar next to each object. URLs point at the /files endpoint, which
+    serves public objects directly and private ones with a signed URL.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *object_key(key).split("/"))
+
+    def _write(self, key, fileobj, content_type, public, metadata) -> StoredObject:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so readers never see half a file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                shutil.copyfileobj(fileobj, out, CHUNK_SIZE)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        with open(f"{path}.meta.json", "w") as meta:
+            json.dump({
+                "content_type": content_type or guess_content_type(key),
+                "public": public,
+                "metadata": metadata or {}
+            }, meta)
+        return self._head(key)
+
+    def _head(self, key: str) -> Optional[StoredObject]:
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+        stat = os.stat(path)
+        sidecar = {}
+        if os.path.exists(f"{path}.meta.json"):
+            with open(f"{path}.meta.json") as meta:
+                sidecar = json.load(meta)
+        return StoredObject(
+            key=key,
+            size=stat.st_size,
+            content_type=sidecar.get("content_type") or guess_content_type(key),
+            etag=f"{stat.st_mtime_ns:x}-{stat.st_size:x}",
+            last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+            public=sidecar.get("public", False),
+            metadata=sidecar.get("metadata", {})
+        )
+
+    async def save(self, key, fileobj, content_type=None, public=False, metadata=None) -> StoredObject:
+        try:
+            return await run_blocking(self._write, key, fileobj, content_type, public, metadata)
+        except OSError as e:
+            raise StorageError(f"Failed to write {key}: {str(e)}")
+
+    async def head(self, key: str) -> Optional[StoredObject]:
+        return await run_blocking(self._head, key)
+
+    async def iter_chunks(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        try:
+            fileobj = await run_blocking(open, self._path(key), "rb")
+        except FileNotFoundError:
+            raise ObjectNotFound(key)
+        try:
+            while True:
+                chunk = await run_in_threadpool(fileobj.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            fileobj.close()
+
+    async def download_to(self, key: str, path: str) -> None:
+        try:
+            await run_blocking(shutil.copyfile, self._path(key), path)
+        except FileNotFoundError:
+            raise ObjectNotFound(key)
+
+    async def delete(self, key: str) -> None:
+        def remove():
+            for path in (self._path(key), f"{self._path(key)}.meta.json"):
+                if os.path.exists(path):
+                    os.remove(path)
+        await run_blocking(remove)
+
+    async def ping(self) -> None:
+        def writable():
+            # The root is only created by the first write on a fresh node
+            os.makedirs(self.root, exist_ok=True)
+            return os.access(self.root, os.W_OK)
+        if not await run_blocking(writable):
+            raise StorageError(f"Storage root {self.root} is not writable")
+
+    def public_url(self, key: str) -> str:
+        return f"{settings.API_BASE_URL}{settings.API_V1_STR}/files/{quote(object_key(key))}"
+
+    async def presigned_url(self, key: str, expires_in: int = 3600) -> str:
+        expires = int(time.time()) + expires_in
+        query = urlencode({"expires": expires, "signature": sign_file_url(object_key(key), expires)})
+        return f"{self.public_url(key)}?{query}"
+
+    async def presigned_upload(self, key, content_type, max_size, expires_in=900, public=False) -> PresignedUpload:
+        # The /files PUT route checks the signature, content type and size
+        key = object_key(key)
+        expires = int(time.time()) + expires_in
+        query = urlencode({
+            "expires": expires,
+            "max_size": max_size,
+            "public": int(public),
+            "signature": sign_upload(key, expires, content_type, max_size, public)
+        })
+        return PresignedUpload(
+            key=key,
+            method="PUT",
+            url=f"{self.public_url(key)}?{query}",
+            headers={"Content-Type": content_type},
+            expires_at=datetime.fromtimestamp(expires, tz=timezone.utc)
+        )
+
+class S3Storage(StorageBackend):
+    """S3 or any S3-compatible service (MinIO, LocalStack) via S3_ENDPOINT_URL."""
+
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+
+    @property
+    def client(self):
+        return get_s3_client()
+
+    async def save(self, key, fileobj, content_type=None, public=False, metadata=None) -> StoredObject:
+        extra_args = {
+            "ContentType": content_type or guess_content_type(key),
+            "Metadata": metadata or {}
+        }
+        if public:
+            extra_args["ACL"] = "public-read"
+        try:
+            # upload_fileobj streams in parts, so large files never sit in memory
+            await run_blocking(self.client.upload_fileobj, fileobj, self.bucket, object_key(key), ExtraArgs=extra_args)
+        except boto_errors() as e:
+            raise StorageError(f"Failed to upload {key}: {str(e)}")
+        stored = await self.head(key)
+        if stored is None:
+            raise StorageError(f"Upload of {key} did not persist")
+        stored.public = public
+        return stored
+
+    async def head(self, key: str) -> Optional[StoredObject]:
+        from botocore.exceptions import ClientError
+        try:
+            response = await run_blocking(self.client.head_object, Bucket=self.bucket, Key=object_key(key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise StorageError(f"Failed to read metadata for {key}: {str(e)}")
+        return StoredObject(
+            key=key,
+            size=response["ContentLength"],
+            content_type=response.get("ContentType"),
+            etag=response.get("ETag", "").strip('"') or None,
+            last_modified=response.get("LastModified"),
+            metadata=response.get("Metadata", {})
+        )
+
+    async def ping(self) -> None:
+        try:
+            await run_blocking(self.client.head_bucket, Bucket=self.bucket)
+        except boto_errors() as e:
+            raise StorageError(f"Bucket {self.bucket} is unreachable: {str(e)}")
+
+    async def iter_chunks(self, key: str, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        from botocore.exceptions import ClientError
+        try:
+            response = await run_blocking(self.client.get_object, Bucket=self.bucket, Key=object_key(key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                raise ObjectNotFound(key)
+            raise StorageError(f"Failed to read {key}: {str(e)}")
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await run_in_threadpool(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def download_to(self, key: str, path: str) -> None:
+        from botocore.exceptions import ClientError
+        try:
+            await run_blocking(self.client.download_file, self.bucket, object_key(key), path)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                raise ObjectNotFound(key)
+            raise StorageError(f"Failed to download {key}: {str(e)}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await run_blocking(self.client.delete_object, Bucket=self.bucket, Key=object_key(key))
+        except boto_errors() as e:
+            raise StorageError(f"Failed to delete {key}: {str(e)}")
+
+    def public_url(self, key: str) -> str:
+        key = quote(object_key(key))
+        if settings.S3_PUBLIC_BASE_URL:
+            return f"{settings.S3_PUBLIC_BASE_URL.rstrip('/')}/{key}"
+        if settings.S3_ENDPOINT_URL:
+            return f"{settings.S3_ENDPOINT_URL.rstrip('/')}/{self.bucket}/{key}"
+        return f"https://{self.bucket}.s3.{settings.AWS_REGION}.amazonaws.com/{key}"
+
+    async def presigned_url(self, key: str, expires_in: int = 3600) -> str:
+        return await run_blocking(
+            self.client.generate_presigned_url,
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": object_key(key)},
+            ExpiresIn=expires_in
+        )
+
+    async def presigned_upload(self, key, content_type, max_size, expires_in=900, public=False) -> PresignedUpload:
+        # A presigned POST policy is the only S3 upload form that can cap size
+        key = object_key(key)
+        fields = {"Content-Type": content_type}
+        conditions = [
+            {"Content-Type": content_type},
+            ["content-length-range", 1, max_size]
+        ]
+        if public:
+            fields["acl"] = "public-read"
+            conditions.append({"acl": "public-read"})
+        try:
+            post = await run_blocking(
+                self.client.generate_presigned_post,
+                self.bucket,
+                key,
+                Fields=fields,
+                Conditions=conditions,
+                ExpiresIn=expires_in
+            )
+        except boto_errors() as e:
+            raise StorageError(f"Failed to presign upload for {key}: {str(e)}")
+        return PresignedUpload(
+            key=key,
+            method="POST",
+            url=post["url"],
+            fields=post["fields"],
+            expires_at=datetime.fromtimestamp(time.time() + expires_in, tz=timezone.utc)
+        )
+
+@lru_cache(maxsize=None)
+def get_s3_client():
+    """Process-wide S3 client, created on first use.
+
+    boto3 is imported here rather than at module level so workers that never
+    touch storage don't pay for it at startup. boto3 clients are thread-safe,
+    so one per process is enough.
+    """
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        's3',
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        region_name=settings.AWS_REGION,
+        endpoint_url=settings.S3_ENDPOINT_URL,
+        config=Config(
+            connect_timeout=settings.STORAGE_CONNECT_TIMEOUT_SECONDS,
+            read_timeout=settings.STORAGE_READ_TIMEOUT_SECONDS,
+            retries={"max_attempts": 3, "mode": "standard"}
+        )
+    )
+
+@lru_cache(maxsize=None)
+def get_storage() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage(str(settings.UPLOAD_DIR))
+    if not settings.AWS_BUCKET_NAME:
+        raise StorageError("AWS_BUCKET_NAME must be set for the s3 storage backend")
+    return S3Storage(settings.AWS_BUCKET_NAME)
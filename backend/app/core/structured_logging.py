@@ -0,0 +1,149 @@
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed via `extra=`
+STANDARD_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in STANDARD_RECORD_ATTRS and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """Per-logger sampling and rate caps for chatty, low-value records.
+
+    `rules` maps a logger name (prefix match) to (sample_rate, max_per_second).
+    ERROR and above always pass; failed-login warnings under a credential
+    stuffing run are exactly the flood this is for. Dropped records are counted so the next
+    one that gets through reports how many were suppressed.
+    """
+
+    def __init__(self, rules: Dict[str, Sequence[float]]):
+        super().__init__()
+        # Longest prefix wins
+        self._rules = sorted(rules.items(), key=lambda rule: -len(rule[0]))
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _rule_for(self, name: str):
+        for prefix, rule in self._rules:
+            if name == prefix or name.startswith(prefix + "."):
+                return prefix, rule
+        return None, None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        prefix, rule = self._rule_for(record.name)
+        if rule is None:
+            return True
+        sample_rate, max_per_second = rule
+
+        with self._lock:
+            allowed = random.random() < sample_rate
+            if allowed and max_per_second:
+                now = time.monotonic()
+                tokens, updated = self._buckets.get(prefix, (max_per_second, now))
+                tokens = min(max_per_second, tokens + (now - updated) * max_per_second)
+                allowed = tokens >= 1
+                self._buckets[prefix] = (tokens - 1 if allowed else tokens, now)
+            if not allowed:
+                self._suppressed[prefix] = self._suppressed.get(prefix, 0) + 1
+                return False
+            suppressed = self._suppressed.pop(prefix, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+class RequestIdMiddleware:
+    """Tags each request with an id (the caller's X-Request-ID or a new one)
+    that every log record written while handling it carries."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", []).append((b"x-request-id", request_id.encode("latin-1")))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+def setup_logging() -> QueueListener:
+    """Route all logging through a queue drained by a background thread.
+
+    The event loop only formats the message and enqueues it; stream writes
+    happen on the listener thread. Filters run before enqueueing, so sampled
+    out records cost almost nothing. Call `.stop()` on the returned listener
+    at shutdown to flush.
+    """
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_JSON:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLING))
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(settings.LOG_LEVEL)
+
+    # uvicorn installs its own synchronous handlers; send its records through the queue too
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.deadlines import create_background_task
+
+logger = logging.getLogger(__name__)
+
+def merge_set_fields(pending: Dict[str, Any], set_fields: Dict[str, Any]) -> None:
+    """Merge dotted-path $set fields into `pending`, `set_fields` winning."""
+    for path, value in set_fields.items():
+        # MongoDB rejects overlapping paths in one $set, so a new path
+        # replaces any pending parent or child of it
+        for existing in [p for p in pending if p.startswith(path + ".") or path.startswith(p + ".")]:
+            del pending[existing]
+        pending[path] = value
+
+class WriteCoalescer:
+    """Write-behind buffer that merges $set fields per key.
+
+    Successive writes for the same key within `window` seconds are merged
+    (later paths win) and handed to `apply` as a single update. Callers that
+    need read-your-writes call `flush(key)` first, or `flush_group(group)`
+    for every key added under a group; `flush_all()` drains the buffer on
+    shutdown. A failed write is merged back under any newer fields and
+    retried up to `max_attempts` times before it is dropped.
+
+    Pending writes live in this process only: reads served by another
+    worker don't see them, and they are lost if the process dies.
+    """
+
+    def __init__(self, apply: Callable[[str, Dict[str, Any]], Awaitable[Any]], window: float, max_attempts: int = 5):
+        self._apply = apply
+        self._window = window
+        self._max_attempts = max_attempts
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._groups: Dict[str, str] = {}
+        self._attempts: Dict[str, int] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._locks = weakref.WeakValueDictionary()
+        self.stats = {"buffered": 0, "flushed": 0, "failed": 0, "dropped": 0}
+
+    def add(self, key: str, set_fields: Dict[str, Any], group: Optional[str] = None) -> None:
+        merge_set_fields(self._pending.setdefault(key, {}), set_fields)
+        if group is not None:
+            self._groups[key] = group
+        self.stats["buffered"] += 1
+        self._schedule(key)
+
+    def pending(self, key: str) -> Dict[str, Any]:
+        """Fields buffered for `key` that haven't been written yet."""
+        return dict(self._pending.get(key, {}))
+
+    async def flush(self, key: str) -> None:
+        timer = self._timers.pop(key, None)
+        if timer:
+            timer.cancel()
+        await self._flush(key)
+
+    async def flush_group(self, group: str) -> None:
+        keys = [key for key, key_group in self._groups.items() if key_group == group]
+        await asyncio.gather(*(self.flush(key) for key in keys))
+
+    async def flush_all(self) -> None:
+        keys = set(self._pending) | set(self._timers)
+        await asyncio.gather(*(self.flush(key) for key in keys))
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _schedule(self, key: str) -> None:
+        if key not in self._timers:
+            # Detached so the flush isn't bound by the triggering request's deadline
+            self._timers[key] = create_background_task(self._flush_later(key))
+
+    async def _flush_later(self, key: str) -> None:
+        await asyncio.sleep(self._window)
+        # Unregister before flushing so flush() never cancels a write in progress
+        self._timers.pop(key, None)
+        await self._flush(key)
+
+    def _lock(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[key] = lock
+        return lock
+
+    async def _flush(self, key: str) -> None:
+        # The per-key lock keeps flushes for one key in order and makes a
+        # flush() before a read wait for a write that is already running
+        async with self._lock(key):
+            set_fields = self._pending.pop(key, None)
+            if not set_fields:
+                return
+            self.stats["flushed"] += 1
+            try:
+                await self._apply(key, set_fields)
+            except Exception as e:
+                self.stats["failed"] += 1
+                attempts = self._attempts.get(key, 0) + 1
+                if attempts >= self._max_attempts:
+                    self.stats["dropped"] += 1
+                    logger.error(f"Dropping buffered write for {key} after {attempts} attempts: {str(e)}")
+                else:
+                    logger.error(f"Failed to flush buffered write for {key}, retrying: {str(e)}")
+                    # Fields buffered while this write was running are newer and win
+                    merge_set_fields(set_fields, self._pending.get(key, {}))
+                    self._pending[key] = set_fields
+                    self._attempts[key] = attempts
+                    self._schedule(key)
+                    return
+            self._attempts.pop(key, None)
+            if key not in self._pending:
+                self._groups.pop(key, None)
@@ -1,5 +1,6 @@
 from .agent import AgentInDB, AgentCreate, AgentUpdate
 from .application import ApplicationCreate, ApplicationInDB, ApplicationUpdate, ApplicationStatus, BioInfo
+from .link import LinkOptions, BulkLinkRequest
 
 __all__ = [
     'AgentInDB',
@@ -9,5 +10,7 @@ __all__ = [
     'ApplicationInDB',
     'ApplicationUpdate',
     'ApplicationStatus',
-    'BioInfo'
+    'BioInfo',
+    'LinkOptions',
+    'BulkLinkRequest'
 ] 
\ No newline at end of file
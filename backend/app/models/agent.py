@@ -1,6 +1,7 @@
 from typing import Optional, List
 from pydantic import BaseModel, EmailStr, Field, HttpUrl
 from datetime import datetime
+from enum import Enum
 
 class AgentBase(BaseModel):
     email: EmailStr
@@ -16,17 +17,40 @@ class AgentBase(BaseModel):
 class AgentCreate(AgentBase):
     password: str
 
+class NotificationMode(str, Enum):
+    IMMEDIATE = "immediate"
+    HOURLY = "hourly"
+    DAILY = "daily"
+
+class ImageVariant(BaseModel):
+    width: int
+    height: int
+    url: str
+
 class AgentSettings(BaseModel):
     brand_name: Optional[str] = Field(None, description="Custom brand name for the agent")
     logo_url: Optional[HttpUrl] = Field(None, description="URL of the agent's logo")
     brand_color: Optional[str] = Field(None, description="Primary brand color in hex format")
     background_image_url: Optional[HttpUrl] = Field(None, description="URL of the background image")
+    logo_variants: Optional[List[ImageVariant]] = Field(None, description="Resized WebP copies of the logo, smallest first")
+    background_image_variants: Optional[List[ImageVariant]] = Field(None, description="Resized WebP copies of the background image, smallest first")
     address: Optional[str] = Field(None, description="Agent's business address")
     phone: Optional[str] = Field(None, description="Agent's contact phone number")
     email: Optional[str] = Field(None, description="Agent's contact email")
     website: Optional[HttpUrl] = Field(None, description="Agent's website URL")
     enable_notifications: bool = Field(True, description="Whether to enable notifications")
     notification_email: Optional[str] = Field(None, description="Email for receiving notifications")
+    notification_mode: NotificationMode = Field(NotificationMode.IMMEDIATE, description="Email per upload, or one hourly/daily digest")
+    timezone: Optional[str] = Field(None, description="IANA timezone used for analytics buckets, e.g. America/Toronto")
+
+# The subset of AgentSettings shown to applicants on the public landing page
+class PublicBranding(BaseModel):
+    brand_name: Optional[str] = None
+    brand_color: Optional[str] = None
+    logo_url: Optional[str] = None
+    logo_variants: Optional[List[ImageVariant]] = None
+    background_image_url: Optional[str] = None
+    background_image_variants: Optional[List[ImageVariant]] = None
 
 class AgentInDB(BaseModel):
     id: str
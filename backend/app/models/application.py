@@ -28,13 +28,18 @@ class Document(BaseModel):
     url: str
     uploaded_at: datetime
 
+# Documents live in their own `application_documents` collection, keyed by application_id
+class DocumentInDB(Document):
+    id: str
+    application_id: str
+
 # This is a base class for shared fields
 class ApplicationBase(BaseModel):
     agent_id: Optional[str] = None
     status: ApplicationStatus = ApplicationStatus.DRAFT
     bio_info: Optional[BioInfo] = None
     orea_form: Optional[OREAForm] = None
-    documents: List[Document] = []
+    documents: Optional[List[Document]] = None  # None when not loaded
     notes: Optional[str] = None
     
     class Config:
@@ -50,6 +55,9 @@ class ApplicationInDB(ApplicationBase):
     id: str
     created_at: datetime
     updated_at: datetime
+    document_uploaded_at: Optional[datetime] = None
+    version: int = 0
+    archived: bool = False  # served read-only from the archive collection
     
     class Config:
         populate_by_name = True
@@ -60,5 +68,15 @@ class ApplicationUpdate(BaseModel):
     status: Optional[ApplicationStatus] = None
     bio_info: Optional[BioInfo] = None
     orea_form: Optional[OREAForm] = None
-    documents: Optional[List[Document]] = None
-    notes: Optional[str] = None
\ No newline at end of file
+    notes: Optional[str] = None
+    version: Optional[int] = Field(None, description="Expected current version; stale writes are rejected")
+
+# Search results, most relevant first
+class ApplicationSearchHit(ApplicationInDB):
+    score: float
+
+class ApplicationSearchResults(BaseModel):
+    items: List[ApplicationSearchHit]
+    total: int
+    page: int
+    page_size: int
\ No newline at end of file
@@ -0,0 +1,12 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+class LinkOptions(BaseModel):
+    expires_in_days: Optional[int] = Field(None, ge=1, le=365, description="Link stops working (and is deleted) after this many days")
+    max_uses: Optional[int] = Field(None, ge=1, description="Number of applications the link can start")
+
+class BulkLinkRequest(LinkOptions):
+    count: int = Field(..., ge=1, le=settings.MAX_BULK_LINKS)
+    label: Optional[str] = Field(None, max_length=200, description="e.g. the open house the links are for")
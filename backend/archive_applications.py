@@ -0,0 +1,31 @@
+from datetime import timedelta
+from app.core.config import settings
+from app.core.database import mongodb
+from app.core.lifecycle import archive_closed_applications, ensure_lifecycle_indexes, expire_drafts
+
+async def archive_applications():
+    """Expire stale drafts and archive closed applications once, for running
+    from cron with LIFECYCLE_INTERVAL_SECONDS=0 on the API workers."""
+    await mongodb.connect_to_database()
+    db = mongodb.get_db()
+    await ensure_lifecycle_indexes(db)
+
+    expired = await expire_drafts(
+        db,
+        timedelta(days=settings.DRAFT_TTL_DAYS),
+        settings.ARCHIVE_BATCH_SIZE
+    )
+    print(f"Expired {expired} drafts untouched for {settings.DRAFT_TTL_DAYS} days")
+
+    archived = await archive_closed_applications(
+        db,
+        timedelta(days=settings.ARCHIVE_AFTER_DAYS),
+        settings.ARCHIVE_BATCH_SIZE
+    )
+    print(f"Archived {archived} applications closed more than {settings.ARCHIVE_AFTER_DAYS} days ago")
+
+    await mongodb.close_database_connection()
+
+if __name__ == "__main__":
+    import asyncio
+    asyncio.run(archive_applications())
@@ -0,0 +1,36 @@
+from app.core.database import mongodb
+
+def lowered(field: str) -> dict:
+    return {"$toLower": {"$trim": {"input": {"$ifNull": [field, ""]}}}}
+
+async def backfill_search_fields():
+    """Populate the denormalized `search` fields for applications saved before
+    search existed. Runs as one server-side pipeline update."""
+    await mongodb.connect_to_database()
+    await mongodb.create_indexes()
+    db = mongodb.get_db()
+
+    result = await db.applications.update_many(
+        {"search": {"$exists": False}},
+        [{"$set": {
+            "search.first_name": lowered("$bio_info.first_name"),
+            "search.last_name": lowered("$bio_info.last_name"),
+            "search.prompts": {"$map": {
+                "input": {"$filter": {
+                    "input": {"$objectToArray": {"$ifNull": ["$bio_info.prompts", {}]}},
+                    "cond": {"$and": [
+                        {"$eq": [{"$type": "$$this.v"}, "string"]},
+                        {"$ne": ["$$this.v", ""]}
+                    ]}
+                }},
+                "in": "$$this.v"
+            }}
+        }}]
+    )
+    print(f"Backfilled search fields on {result.modified_count} applications")
+
+    await mongodb.close_database_connection()
+
+if __name__ == "__main__":
+    import asyncio
+    asyncio.run(backfill_search_fields())
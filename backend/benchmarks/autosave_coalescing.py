@@ -0,0 +1,87 @@
+"""Compare Mongo write ops for simulated applicant autosave traffic with and
+without the write-behind coalescing buffer.
+
+Run from the backend directory against a local MongoDB:
+
+    python -m benchmarks.autosave_coalescing --applicants 200 --duration 20
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.database import mongodb
+from app.core.write_coalescer import WriteCoalescer
+from app.api.v1.endpoints.applications import apply_buffered_update, flatten_update
+from app.models.application import ApplicationUpdate, BioInfo
+
+async def update_ops(db) -> int:
+    status = await db.client.admin.command("serverStatus")
+    return status["opcounters"]["update"]
+
+async def simulate(applicant_ids, duration: float, interval: float, save) -> int:
+    saves = 0
+
+    async def applicant(application_id: str):
+        nonlocal saves
+        rng = random.Random(application_id)
+        deadline = time.monotonic() + duration
+        typed = ""
+        while time.monotonic() < deadline:
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * interval)
+            typed += rng.choice("abcdefghijklmnopqrstuvwxyz ")
+            update = ApplicationUpdate(bio_info=BioInfo(first_name="Test", last_name="Applicant", bio=typed))
+            await save(application_id, flatten_update(update))
+            saves += 1
+
+    await asyncio.gather(*(applicant(application_id) for application_id in applicant_ids))
+    return saves
+
+async def run(applicants: int, duration: float, interval: float, window: float):
+    await mongodb.connect_to_database()
+    # Keep benchmark traffic out of the real database
+    mongodb.db = mongodb.client[f"{settings.MONGODB_DB_NAME}_benchmark"]
+    db = mongodb.get_db()
+    await db.applications.drop()
+
+    now = datetime.utcnow()
+    result = await db.applications.insert_many([
+        {"status": "draft", "bio_info": {}, "version": 0, "created_at": now, "updated_at": now}
+        for _ in range(applicants)
+    ])
+    applicant_ids = [str(inserted_id) for inserted_id in result.inserted_ids]
+
+    async def direct_save(application_id, set_fields):
+        await apply_buffered_update(application_id, set_fields)
+
+    before = await update_ops(db)
+    saves = await simulate(applicant_ids, duration, interval, direct_save)
+    direct_ops = await update_ops(db) - before
+    print(f"direct:    {saves} saves -> {direct_ops} update ops")
+
+    buffer = WriteCoalescer(apply_buffered_update, window=window)
+
+    async def buffered_save(application_id, set_fields):
+        buffer.add(application_id, set_fields)
+
+    before = await update_ops(db)
+    saves = await simulate(applicant_ids, duration, interval, buffered_save)
+    await buffer.flush_all()
+    coalesced_ops = await update_ops(db) - before
+    print(f"coalesced: {saves} saves -> {coalesced_ops} update ops (window {window}s)")
+    if coalesced_ops:
+        print(f"write reduction: {direct_ops / coalesced_ops:.1f}x")
+
+    await db.applications.drop()
+    await mongodb.close_database_connection()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applicants", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of simulated typing")
+    parser.add_argument("--interval", type=float, default=0.3, help="mean seconds between saves per applicant")
+    parser.add_argument("--window", type=float, default=settings.AUTOSAVE_COALESCE_WINDOW_SECONDS or 2.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.applicants, args.duration, args.interval, args.window))
@@ -0,0 +1,76 @@
+"""Check the cold-start import cost of the API against a budget.
+
+Runs `python -X importtime -c "import fastapi; import main"` in a fresh
+interpreter several times and budgets the median cost of `main` itself.
+fastapi (with starlette and pydantic) is loaded first and reported apart:
+it is most of the total, the app can't make it cheaper, and its run-to-run
+noise (500-750 ms here) would otherwise swamp the app's own cost. Prints the
+slowest imports of the median run and exits non-zero over budget or when a
+lazy library loads at startup. Run from the backend directory:
+
+    python -m benchmarks.import_time --budget-ms 450 --runs 7
+
+Medians measured with this script: 485-555 ms before PDF and S3 libraries
+were made lazy (never under 500 ms), 300-390 ms after.
+"""
+import argparse
+import subprocess
+import sys
+
+# Modules that should only load on first use, never at startup
+LAZY_MODULES = ("boto3", "fitz", "reportlab", "pdfrw")
+
+def measure(module: str, preload: str):
+    statement = f"import {preload}; import {module}" if preload else f"import {module}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings.append((name.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+def cumulative_ms(timings, module: str) -> float:
+    return next(cumulative for name, _, cumulative in timings if name == module) / 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--preload", default="fastapi", help="imported first and left out of the budget; '' to budget everything")
+    parser.add_argument("--budget-ms", type=float, default=450.0)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = []
+    for _ in range(max(1, args.runs)):
+        timings = measure(args.module, args.preload)
+        runs.append((cumulative_ms(timings, args.module), timings))
+    runs.sort(key=lambda run: run[0])
+    total_ms, timings = runs[len(runs) // 2]
+
+    print(f"{'cumulative ms':>14}  module")
+    top_level = [timing for timing in timings if "." not in timing[0]]
+    for name, _, cumulative in sorted(top_level, key=lambda timing: -timing[2])[:args.top]:
+        print(f"{cumulative / 1000:>14.1f}  {name}")
+
+    eager = sorted({name.split(".")[0] for name, _, _ in timings} & set(LAZY_MODULES))
+    print()
+    if args.preload:
+        preload_ms = sorted(cumulative_ms(run_timings, args.preload) for _, run_timings in runs)[len(runs) // 2]
+        print(f"{args.preload} (not budgeted): {preload_ms:.1f} ms median")
+    print(f"{args.module}: {total_ms:.1f} ms median of {len(runs)} runs, {runs[0][0]:.1f}-{runs[-1][0]:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    if eager:
+        print(f"imported at startup but should be lazy: {', '.join(eager)}")
+
+    if total_ms > args.budget_ms or eager:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Measure how much request latency logging adds when the log sink is slow,
+comparing synchronous handlers with the queue-backed, sampled setup.
+
+The sink sleeps on every write to stand in for a full stdout pipe or a
+backed-up log shipper. Run from the backend directory:
+
+    python -m benchmarks.logging_overhead --requests 2000 --concurrency 50 --sink-delay-ms 0.2
+"""
+import argparse
+import asyncio
+import io
+import logging
+import queue
+import statistics
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.structured_logging import JsonFormatter, RequestIdFilter, SamplingFilter, request_id_var
+
+class SlowSink(io.TextIOBase):
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        self.writes += 1
+        return len(text)
+
+def configure(mode: str, sink: SlowSink):
+    stream_handler = logging.StreamHandler(sink)
+    stream_handler.setFormatter(JsonFormatter())
+    listener = None
+    if mode == "sync":
+        handler = stream_handler
+    else:
+        log_queue = queue.SimpleQueue()
+        handler = QueueHandler(log_queue)
+        listener = QueueListener(log_queue, stream_handler)
+        listener.start()
+    if mode == "queue+sampling":
+        handler.addFilter(SamplingFilter({"app.api.v1.endpoints.auth": (0.1, 20)}))
+    handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(logging.INFO)
+    return listener
+
+async def simulate(requests: int, concurrency: int, lines: int):
+    auth_logger = logging.getLogger("app.api.v1.endpoints.auth")
+    app_logger = logging.getLogger("app.api.v1.endpoints.applications")
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def handle(number: int):
+        async with semaphore:
+            request_id_var.set(f"bench-{number}")
+            started = time.perf_counter()
+            for _ in range(lines):
+                auth_logger.warning(f"Login failed: Incorrect password for email user{number}@example.com")
+                await asyncio.sleep(0)
+            app_logger.info(f"Handled request {number}")
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(handle(number) for number in range(requests)))
+    return latencies, time.perf_counter() - started
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def run(requests: int, concurrency: int, lines: int, sink_delay_ms: float):
+    for mode in ("sync", "queue", "queue+sampling"):
+        sink = SlowSink(sink_delay_ms / 1000)
+        listener = configure(mode, sink)
+        latencies, elapsed = asyncio.run(simulate(requests, concurrency, lines))
+        if listener:
+            listener.stop()
+        print(
+            f"{mode:15} p50 {statistics.median(latencies):7.2f}ms  p99 {percentile(latencies, 0.99):7.2f}ms  "
+            f"throughput {requests / elapsed:8.0f} req/s  lines written {sink.writes}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--lines", type=int, default=3, help="auth log lines per request")
+    parser.add_argument("--sink-delay-ms", type=float, default=0.2)
+    args = parser.parse_args()
+    run(args.requests, args.concurrency, args.lines, args.sink_delay_ms)
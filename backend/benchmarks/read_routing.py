@@ -0,0 +1,131 @@
+"""Measure primary write latency while dashboard analytics run, with the
+analytics reads on the primary versus routed to secondaries.
+
+Needs a replica set; a local three-member one is enough:
+
+    for port in 27017 27018 27019; do
+        mkdir -p /tmp/rs/$port
+        mongod --replSet rs0 --port $port --dbpath /tmp/rs/$port --fork --logpath /tmp/rs/$port.log
+    done
+    mongosh --port 27017 --eval 'rs.initiate({_id: "rs0", members: [
+        {_id: 0, host: "localhost:27017"}, {_id: 1, host: "localhost:27018"}, {_id: 2, host: "localhost:27019"}]})'
+
+Then, from the backend directory:
+
+    MONGODB_URL="mongodb://localhost:27017,localhost:27018,localhost:27019/?replicaSet=rs0" \\
+        python -m benchmarks.read_routing --applications 50000 --readers 16 --duration 20
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.database import mongodb
+from app.api.v1.endpoints.analytics import build_dashboard_analytics
+from app.models.agent import AgentInDB
+
+AGENTS = 20
+
+async def seed(db, applications: int) -> list:
+    await db.applications.drop()
+    await mongodb.create_indexes()
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    agent_ids = [f"benchmark-agent-{number}" for number in range(AGENTS)]
+    batch = []
+    for _ in range(applications):
+        created_at = now - timedelta(days=rng.uniform(0, 180))
+        batch.append({
+            "agent_id": rng.choice(agent_ids),
+            "status": rng.choice(["draft", "submitted", "in_review", "approved", "rejected"]),
+            "bio_info": {"first_name": "Test", "last_name": "Applicant"},
+            "version": 0,
+            "created_at": created_at,
+            "updated_at": created_at + timedelta(hours=rng.uniform(0, 72))
+        })
+        if len(batch) == 5000:
+            await db.applications.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await db.applications.insert_many(batch, ordered=False)
+    return agent_ids
+
+async def measure(agent_ids: list, profile: str, readers: int, duration: float) -> tuple:
+    primary = mongodb.get_db()
+    reporting = mongodb.get_db(profile)
+    deadline = time.monotonic() + duration
+    write_latencies = []
+    reads = 0
+
+    async def writer():
+        rng = random.Random(1)
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            await primary.applications.update_one(
+                {"agent_id": rng.choice(agent_ids), "status": "draft"},
+                {"$set": {"updated_at": datetime.utcnow()}, "$inc": {"version": 1}}
+            )
+            write_latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.005)
+
+    async def reader(number: int):
+        nonlocal reads
+        rng = random.Random(number)
+        while time.monotonic() < deadline:
+            agent = AgentInDB(
+                id=rng.choice(agent_ids),
+                email="agent@example.com",
+                hashed_password="",
+                created_at=datetime.utcnow(),
+                updated_at=datetime.utcnow()
+            )
+            await build_dashboard_analytics(reporting, agent, None, None)
+            reads += 1
+
+    await asyncio.gather(writer(), *(reader(number) for number in range(readers)))
+    return write_latencies, reads
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def run(applications: int, readers: int, duration: float):
+    await mongodb.connect_to_database()
+    # Keep benchmark traffic out of the real database
+    mongodb.db = mongodb.client[f"{settings.MONGODB_DB_NAME}_benchmark"]
+    db = mongodb.get_db()
+
+    hello = await mongodb.client.admin.command("hello")
+    if "setName" not in hello:
+        print("warning: not a replica set, so both runs read from the same server")
+    else:
+        print(f"replica set {hello['setName']}: {len(hello.get('hosts', []))} members")
+
+    agent_ids = await seed(db, applications)
+    # Let the secondaries catch up on the seed before measuring
+    await asyncio.sleep(2)
+
+    for label, profile, reader_count in (
+        ("writes alone", "primary", 0),
+        ("analytics on primary", "primary", readers),
+        ("analytics on secondaries", "analytics", readers),
+    ):
+        latencies, reads = await measure(agent_ids, profile, reader_count, duration)
+        print(
+            f"{label:26} write p50 {statistics.median(latencies):6.2f}ms  p99 {percentile(latencies, 0.99):7.2f}ms  "
+            f"({len(latencies)} writes, {reads} dashboards)"
+        )
+
+    await db.applications.drop()
+    await mongodb.close_database_connection()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applications", type=int, default=50000)
+    parser.add_argument("--readers", type=int, default=16, help="concurrent dashboard loops")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per run")
+    args = parser.parse_args()
+    asyncio.run(run(args.applications, args.readers, args.duration))
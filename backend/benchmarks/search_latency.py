@@ -0,0 +1,110 @@
+"""Measure /applications/search latency on a large synthetic collection.
+
+Seeds a scratch database (default 1M applications across 100 agents, kept
+between runs unless --reseed is given) and times the search endpoint's
+pipeline for name-prefix, full-name and free-text queries. Run from the
+backend directory against a local MongoDB:
+
+    python -m benchmarks.search_latency --documents 1000000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.database import mongodb
+from app.api.v1.endpoints.applications import search_applications
+from app.models.agent import AgentInDB
+
+FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+               "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Priya", "Wei",
+               "Mohammed", "Fatima", "Carlos", "Sofia", "Olivia", "Liam", "Noah", "Emma", "Aarav", "Chloe"]
+LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+              "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+              "Lee", "Patel", "Nguyen", "Chen", "Singh", "Kim", "Tremblay", "Roy", "Gagnon", "Cote"]
+WORDS = ["quiet", "tenant", "pet", "dog", "cat", "parking", "garden", "student", "nurse", "engineer", "remote",
+         "work", "family", "downtown", "transit", "nonsmoker", "references", "landlord", "lease", "furnished"]
+BATCH_SIZE = 5000
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+def make_application(rng: random.Random, agent_id: str, now: datetime) -> dict:
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    prompts = {"about": sentence(rng, 12), "pets": sentence(rng, 4)}
+    created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+    return {
+        "agent_id": agent_id,
+        "status": rng.choice(["draft", "submitted", "in_review", "approved", "rejected"]),
+        "bio_info": {"first_name": first_name, "last_name": last_name, "prompts": prompts},
+        "notes": sentence(rng, 8),
+        "search": {
+            "first_name": first_name.lower(),
+            "last_name": last_name.lower(),
+            "prompts": list(prompts.values())
+        },
+        "version": 0,
+        "created_at": created_at,
+        "updated_at": created_at
+    }
+
+async def seed(db, documents: int, agent_ids, seed_value: int):
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    inserted = 0
+    started = time.perf_counter()
+    while inserted < documents:
+        batch = [make_application(rng, rng.choice(agent_ids), now) for _ in range(min(BATCH_SIZE, documents - inserted))]
+        await db.applications.insert_many(batch, ordered=False)
+        inserted += len(batch)
+    print(f"seeded {inserted} applications in {time.perf_counter() - started:.1f}s")
+
+async def run(documents: int, agents: int, iterations: int, reseed: bool, seed_value: int):
+    await mongodb.connect_to_database()
+    # Keep benchmark data out of the real database
+    mongodb.db = mongodb.client[f"{settings.MONGODB_DB_NAME}_benchmark"]
+    db = mongodb.get_db()
+
+    # Stable, valid ObjectId strings so repeated runs reuse the same agents
+    agent_ids = [f"{index:024x}" for index in range(1, agents + 1)]
+    if reseed or await db.applications.estimated_document_count() < documents:
+        await db.applications.drop()
+        await seed(db, documents, agent_ids, seed_value)
+    await mongodb.create_indexes()
+
+    now = datetime.utcnow()
+    rng = random.Random(seed_value)
+    queries = {
+        "name prefix": lambda: rng.choice(FIRST_NAMES)[:3],
+        "full name": lambda: f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "free text": lambda: " ".join(rng.sample(WORDS, 2)),
+    }
+    for label, make_query in queries.items():
+        timings = []
+        for _ in range(iterations):
+            agent = AgentInDB(id=rng.choice(agent_ids), email="bench@example.com", hashed_password="", created_at=now, updated_at=now)
+            started = time.perf_counter()
+            await search_applications(q=make_query(), page=1, page_size=20, current_agent=agent)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        print(
+            f"{label:>12}: p50 {statistics.median(timings):.1f} ms, "
+            f"p95 {timings[int(len(timings) * 0.95) - 1]:.1f} ms, "
+            f"p99 {timings[int(len(timings) * 0.99) - 1]:.1f} ms"
+        )
+
+    await mongodb.close_database_connection()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--agents", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reseed", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.documents, args.agents, args.iterations, args.reseed, args.seed))
@@ -0,0 +1,76 @@
+"""Simulate applicants refreshing and double-clicking "Start Application"
+and compare how many drafts land in `applications` with and without
+idempotency keys.
+
+Run from the backend directory against a local MongoDB:
+
+    python -m benchmarks.start_refresh_storm --applicants 200 --refreshes 5 --double-click-rate 0.3
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.database import mongodb
+from app.api.v1.endpoints.applications import StartApplicationRequest, start_application
+
+async def storm(link_id: str, applicants: int, refreshes: int, double_click_rate: float, use_keys: bool) -> int:
+    calls = 0
+
+    async def applicant(number: int):
+        nonlocal calls
+        rng = random.Random(number)
+        # A browser session keeps its key across refreshes
+        key = uuid.uuid4().hex if use_keys else None
+        for _ in range(refreshes):
+            clicks = 2 if rng.random() < double_click_rate else 1
+            request = StartApplicationRequest(link_id=link_id, idempotency_key=key)
+            await asyncio.gather(*(start_application(request) for _ in range(clicks)))
+            calls += clicks
+            await asyncio.sleep(rng.uniform(0, 0.05))
+
+    await asyncio.gather(*(applicant(number) for number in range(applicants)))
+    return calls
+
+async def run(applicants: int, refreshes: int, double_click_rate: float):
+    await mongodb.connect_to_database()
+    # Keep benchmark traffic out of the real database
+    mongodb.db = mongodb.client[f"{settings.MONGODB_DB_NAME}_benchmark"]
+    db = mongodb.get_db()
+    await db.applications.drop()
+    await db.application_links.drop()
+    await mongodb.create_indexes()
+
+    link_id = uuid.uuid4().hex
+    await db.application_links.insert_one({
+        "link_id": link_id,
+        "agent_id": str(uuid.uuid4()),
+        "created_at": datetime.utcnow(),
+        "is_active": True
+    })
+
+    for label, use_keys in (("no key", False), ("idempotent", True)):
+        before = await db.applications.count_documents({})
+        started = time.perf_counter()
+        calls = await storm(link_id, applicants, refreshes, double_click_rate, use_keys)
+        elapsed = time.perf_counter() - started
+        created = await db.applications.count_documents({}) - before
+        print(
+            f"{label:10}  {calls} start calls -> {created} drafts "
+            f"({created / applicants:.2f} per applicant, {calls / elapsed:.0f} calls/s)"
+        )
+
+    await db.applications.drop()
+    await db.application_links.drop()
+    await mongodb.close_database_connection()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--applicants", type=int, default=100)
+    parser.add_argument("--refreshes", type=int, default=5, help="start calls per applicant session")
+    parser.add_argument("--double-click-rate", type=float, default=0.3, help="fraction of calls sent twice concurrently")
+    args = parser.parse_args()
+    asyncio.run(run(args.applicants, args.refreshes, args.double_click_rate))
@@ -0,0 +1,99 @@
+"""Check live application updates against a real change stream.
+
+Change streams need a replica set; a single node is enough:
+
+    docker run -d -p 27017:27017 mongo:7 --replSet rs0
+    docker exec <container> mongosh --eval "rs.initiate()"
+    MONGODB_URL="mongodb://localhost:27017/?directConnection=true" python check_live_updates.py
+
+Subscribes two agents, writes applications for both and checks each agent
+only sees its own changes, with updates looked up for the owner's fields.
+"""
+import asyncio
+from datetime import datetime
+
+from bson import ObjectId
+from app.core.config import settings
+from app.core.database import mongodb
+from app.core.live_updates import application_changes
+
+def check(condition: bool, message: str):
+    print(f"{'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        raise SystemExit(1)
+
+async def next_event(queue: asyncio.Queue, timeout: float = 5.0):
+    try:
+        return await asyncio.wait_for(queue.get(), timeout)
+    except asyncio.TimeoutError:
+        return None
+
+async def check_live_updates():
+    await mongodb.connect_to_database()
+    # Keep test records out of the real database
+    mongodb.db = mongodb.client[f"{settings.MONGODB_DB_NAME}_benchmark"]
+    db = mongodb.get_db()
+
+    hello = await mongodb.client.admin.command("hello")
+    check("setName" in hello, "MongoDB is a replica set member")
+
+    agent_id = str(ObjectId())
+    other_agent_id = str(ObjectId())
+    queue = application_changes.subscribe(agent_id)
+    other_queue = application_changes.subscribe(other_agent_id)
+    inserted = []
+
+    try:
+        # The stream opens in the background; writes before that are not seen
+        await asyncio.sleep(1.0)
+
+        now = datetime.utcnow()
+        result = await db.applications.insert_one({
+            "agent_id": agent_id,
+            "status": "draft",
+            "bio_info": {"first_name": "Ada", "last_name": "Lovelace"},
+            "version": 0,
+            "created_at": now,
+            "updated_at": now
+        })
+        inserted.append(result.inserted_id)
+        event = await next_event(queue)
+        check(event is not None and event["type"] == "insert", "insert is delivered to the owning agent")
+        check(event["application_id"] == str(result.inserted_id), "event names the application")
+        check(event["first_name"] == "Ada" and event["status"] == "draft", "event carries the dashboard fields")
+
+        await db.applications.update_one(
+            {"_id": result.inserted_id},
+            {"$set": {"status": "in_review", "updated_at": datetime.utcnow()}}
+        )
+        event = await next_event(queue)
+        check(event is not None and event["type"] == "update", "update is delivered to the owning agent")
+        check(event["status"] == "in_review", "update carries the current status")
+
+        result = await db.applications.insert_one({
+            "agent_id": other_agent_id,
+            "status": "draft",
+            "version": 0,
+            "created_at": now,
+            "updated_at": now
+        })
+        inserted.append(result.inserted_id)
+        event = await next_event(other_queue)
+        check(event is not None and event["application_id"] == str(result.inserted_id), "other agent sees its own insert")
+        check(queue.empty(), "agents never see each other's applications")
+
+        application_changes.unsubscribe(other_agent_id, other_queue)
+        await db.applications.update_one({"_id": result.inserted_id}, {"$set": {"status": "in_review"}})
+        await db.applications.update_one({"_id": inserted[0]}, {"$set": {"status": "approved"}})
+        event = await next_event(queue)
+        check(event is not None and event["status"] == "approved", "stream keeps running after an unsubscribe")
+        print(f"hub stats: {application_changes.stats}")
+    finally:
+        application_changes.unsubscribe(agent_id, queue)
+        application_changes.unsubscribe(other_agent_id, other_queue)
+        await application_changes.close()
+        await db.applications.delete_many({"_id": {"$in": inserted}})
+        await mongodb.close_database_connection()
+
+if __name__ == "__main__":
+    asyncio.run(check_live_updates())
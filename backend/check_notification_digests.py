@@ -0,0 +1,136 @@
+"""Check hourly and daily notification digests against a local SMTP sink
+with a fake clock, so windows close without waiting for them.
+
+Run from the backend directory against a local MongoDB:
+
+    python check_notification_digests.py
+
+The sink listens on a random local port and the script points the SMTP
+settings at it, so no real mail is sent.
+"""
+import asyncio
+import socketserver
+import threading
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from app.core.config import settings
+from app.core.database import mongodb
+from app.core.notification_digests import NotificationDigestScheduler
+from app.models.agent import NotificationMode
+
+class SMTPSink(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept messages; each DATA is one delivery."""
+    messages = []
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 sink")
+        while True:
+            line = self.rfile.readline().decode().strip()
+            command = line.split(" ", 1)[0].upper()
+            if not line or command == "QUIT":
+                self.reply("221 bye")
+                return
+            if command == "EHLO":
+                self.reply("250 sink")
+            elif command == "DATA":
+                self.reply("354 go ahead")
+                lines = []
+                while (data := self.rfile.readline().decode()) not in (".\r\n", ""):
+                    lines.append(data)
+                SMTPSink.messages.append("".join(lines))
+                self.reply("250 queued")
+            else:
+                self.reply("250 ok")
+
+class FakeClock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+    def advance(self, **kwargs):
+        self.now += timedelta(**kwargs)
+
+def check(condition: bool, message: str):
+    print(f"{'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        raise SystemExit(1)
+
+async def queue_uploads(db, agent_id: str, clock: FakeClock, count: int):
+    await db.notification_events.insert_many([
+        {
+            "agent_id": agent_id,
+            "application_id": str(ObjectId()),
+            "applicant_name": f"Applicant {number}",
+            "document_type": "pay_stub",
+            "uploaded_at": clock.now + timedelta(minutes=number),
+            "created_at": clock.now + timedelta(minutes=number),
+            "digest_id": None
+        }
+        for number in range(count)
+    ])
+
+async def check_notification_digests():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPSink)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.SMTP_HOST, settings.SMTP_PORT = server.server_address
+    settings.SMTP_TLS = False
+    settings.SMTP_USER = settings.SMTP_PASSWORD = None
+    settings.SMTP_FROM_EMAIL = settings.SMTP_FROM_EMAIL or "noreply@example.com"
+
+    await mongodb.connect_to_database()
+    # Keep test records out of the real database
+    mongodb.db = mongodb.client[f"{settings.MONGODB_DB_NAME}_benchmark"]
+    db = mongodb.get_db()
+    await db.agents.drop()
+    await db.notification_events.drop()
+    await db.notification_digests.drop()
+    await mongodb.create_indexes()
+
+    agents = {}
+    for mode in (NotificationMode.HOURLY, NotificationMode.DAILY):
+        result = await db.agents.insert_one({
+            "email": f"{mode.value}@example.com",
+            "settings": {"enable_notifications": True, "notification_mode": mode.value}
+        })
+        agents[mode] = str(result.inserted_id)
+
+    clock = FakeClock(datetime(2024, 1, 1, 10, 5))
+    # Two schedulers stand in for two API workers
+    schedulers = [NotificationDigestScheduler(clock=clock), NotificationDigestScheduler(clock=clock)]
+
+    async def run_all() -> int:
+        return sum(await asyncio.gather(*(scheduler.run_due() for scheduler in schedulers)))
+
+    for agent_id in agents.values():
+        await queue_uploads(db, agent_id, clock, 20)
+    clock.advance(minutes=50)
+    check(await run_all() == 0, "nothing is sent before the hour closes")
+
+    clock.advance(minutes=10)
+    check(await run_all() == 1, "one hourly digest once the hour closes")
+    check(await run_all() == 0, "a second run sends nothing more")
+
+    await queue_uploads(db, agents[NotificationMode.HOURLY], clock, 10)
+    clock.advance(hours=14)
+    check(await run_all() == 2, "next day: one hourly and one daily digest")
+
+    events = await db.notification_events.count_documents({})
+    sent = await db.notification_events.count_documents({"sent_at": {"$exists": True}})
+    check(sent == events, "every queued event was delivered")
+    check(len(SMTPSink.messages) == 3, f"{events} uploads -> {len(SMTPSink.messages)} emails")
+    check(all("Document Uploads Digest" in message for message in SMTPSink.messages), "every email is a digest")
+
+    server.shutdown()
+    await db.agents.drop()
+    await db.notification_events.drop()
+    await db.notification_digests.drop()
+    await mongodb.close_database_connection()
+
+if __name__ == "__main__":
+    asyncio.run(check_notification_digests())
@@ -0,0 +1,121 @@
+"""End-to-end check of presigned document uploads against real storage.
+
+Point it at a local S3 stand-in and MongoDB, e.g. MinIO:
+
+    docker run -p 9000:9000 -e MINIO_ROOT_USER=minio -e MINIO_ROOT_PASSWORD=minio123 minio/minio server /data
+    STORAGE_BACKEND=s3 S3_ENDPOINT_URL=http://localhost:9000 AWS_BUCKET_NAME=rentflow \\
+        AWS_ACCESS_KEY_ID=minio AWS_SECRET_ACCESS_KEY=minio123 python check_presigned_uploads.py
+
+With STORAGE_BACKEND=local the uploads go to the API's /files route instead,
+so the API must be running at API_BASE_URL.
+"""
+import uuid
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+from bson import ObjectId
+from app.core.config import settings
+from app.core.database import mongodb
+from app.core.storage import PresignedUpload, get_s3_client, get_storage
+from app.api.v1.endpoints.applications import (
+    ConfirmDocumentRequest, PresignDocumentRequest, confirm_document_upload, presign_document_upload
+)
+
+def send(upload: PresignedUpload, body: bytes, content_type: str) -> int:
+    """Upload the way a browser would; returns the HTTP status."""
+    if upload.method == "POST":
+        boundary = uuid.uuid4().hex
+        parts = []
+        # The policy pins Content-Type, so send whatever the caller claims
+        fields = {**upload.fields, "Content-Type": content_type}
+        for name, value in fields.items():
+            parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="upload"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode() + body + b"\r\n"
+        )
+        parts.append(f"--{boundary}--\r\n".encode())
+        request = urllib.request.Request(
+            upload.url,
+            data=b"".join(parts),
+            method="POST",
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+        )
+    else:
+        request = urllib.request.Request(upload.url, data=body, method="PUT", headers={"Content-Type": content_type})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+def check(condition: bool, message: str):
+    print(f"{'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        raise SystemExit(1)
+
+async def check_presigned_uploads():
+    await mongodb.connect_to_database()
+    # Keep test records out of the real database
+    mongodb.db = mongodb.client[f"{settings.MONGODB_DB_NAME}_benchmark"]
+    await mongodb.create_indexes()
+    db = mongodb.get_db()
+
+    storage = get_storage()
+    if settings.STORAGE_BACKEND == "s3":
+        try:
+            get_s3_client().create_bucket(Bucket=settings.AWS_BUCKET_NAME)
+        except Exception:
+            pass  # already exists
+
+    now = datetime.utcnow()
+    result = await db.applications.insert_one({
+        "agent_id": str(ObjectId()),  # no such agent, so no email goes out
+        "status": "draft",
+        "version": 0,
+        "created_at": now,
+        "updated_at": now
+    })
+    application_id = str(result.inserted_id)
+    body = b"%PDF-1.4\n" + b"0" * 1024
+    upload = None
+
+    try:
+        presigned = await presign_document_upload(
+            application_id,
+            PresignDocumentRequest(content_type="application/pdf", size=len(body), document_type="paystub")
+        )
+        upload = PresignedUpload(**presigned["upload"])
+
+        status = send(upload, body, "image/png")
+        check(status >= 400, f"wrong content type rejected ({status})")
+
+        oversized = b"0" * (settings.MAX_UPLOAD_SIZE + 1)
+        status = send(upload, oversized, "application/pdf")
+        check(status >= 400, f"oversized upload rejected ({status})")
+
+        status = send(upload, body, "application/pdf")
+        check(status < 300, f"upload accepted ({status})")
+
+        stored = await storage.head(upload.key)
+        check(stored is not None and stored.size == len(body), "object stored with the uploaded size")
+
+        first = await confirm_document_upload(application_id, ConfirmDocumentRequest(key=upload.key, document_type="paystub"))
+        second = await confirm_document_upload(application_id, ConfirmDocumentRequest(key=upload.key, document_type="paystub"))
+        check(first == second, "confirm is idempotent")
+
+        recorded = await db.application_documents.count_documents({"application_id": application_id})
+        application = await db.applications.find_one({"_id": result.inserted_id})
+        check(recorded == 1, "document recorded once")
+        check(application["status"] == "in_review", "application moved to review")
+    finally:
+        await db.application_documents.delete_many({"application_id": application_id})
+        await db.applications.delete_one({"_id": result.inserted_id})
+        if upload:
+            await storage.delete(upload.key)
+        await mongodb.close_database_connection()
+
+if __name__ == "__main__":
+    import asyncio
+    asyncio.run(check_presigned_uploads())
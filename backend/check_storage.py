@@ -0,0 +1,97 @@
+"""Check the storage backend against a local S3 stand-in (or local disk).
+
+Exercises every StorageBackend method the API uses, so a backend change can
+be verified without running the whole upload flow. Against MinIO:
+
+    docker run -p 9000:9000 -e MINIO_ROOT_USER=minio -e MINIO_ROOT_PASSWORD=minio123 minio/minio server /data
+    S3_ENDPOINT_URL=http://localhost:9000 AWS_BUCKET_NAME=rentflow \\
+        AWS_ACCESS_KEY_ID=minio AWS_SECRET_ACCESS_KEY=minio123 python check_storage.py
+
+`moto_server -p 9000` (pip install "moto[server]") works as a lighter stand-in.
+
+With STORAGE_BACKEND=local the objects go under UPLOAD_DIR and the signed
+URL checks need the API running at API_BASE_URL.
+"""
+import asyncio
+import io
+import os
+import tempfile
+import urllib.error
+import urllib.request
+import uuid
+
+from app.core.config import settings
+from app.core.storage import ObjectNotFound, StorageError, get_s3_client, get_storage, object_key
+
+def check(condition: bool, message: str):
+    print(f"{'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        raise SystemExit(1)
+
+def fetch(url: str) -> tuple:
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, b""
+
+async def check_storage():
+    print(f"backend: {settings.STORAGE_BACKEND}")
+    storage = get_storage()
+    if settings.STORAGE_BACKEND == "s3":
+        try:
+            get_s3_client().create_bucket(Bucket=settings.AWS_BUCKET_NAME)
+        except Exception:
+            pass  # already exists
+
+    prefix = f"check/{uuid.uuid4()}"
+    key = object_key(prefix, "document.pdf")
+    body = b"%PDF-1.4\n" + os.urandom(600 * 1024)  # spans several read chunks
+
+    for parts in [("pdfs", "../documents/x.pdf"), ("pdfs/../documents/x.pdf",), ("../x",), ("/",)]:
+        try:
+            object_key(*parts)
+            escaped = True
+        except StorageError:
+            escaped = False
+        check(not escaped, f"object_key rejects {'/'.join(parts)}")
+
+    try:
+        await storage.ping()
+        check(True, "storage is writable")
+
+        stored = await storage.save(key, io.BytesIO(body), content_type="application/pdf", metadata={"source": "check"})
+        check(stored.size == len(body), "save reports the stored size")
+
+        head = await storage.head(key)
+        check(head is not None and head.size == len(body), "head finds the object")
+        check(head.content_type == "application/pdf", "content type is kept")
+        check(head.metadata.get("source") == "check", "metadata is kept")
+        check(await storage.head(object_key(prefix, "missing.pdf")) is None, "head of a missing object is None")
+
+        chunks = [chunk async for chunk in storage.iter_chunks(key)]
+        check(b"".join(chunks) == body and len(chunks) > 1, f"iter_chunks streams the object ({len(chunks)} chunks)")
+
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "copy.pdf")
+            await storage.download_to(key, path)
+            with open(path, "rb") as copy:
+                check(copy.read() == body, "download_to copies the object")
+            try:
+                await storage.download_to(object_key(prefix, "missing.pdf"), path)
+                check(False, "download_to of a missing object raises ObjectNotFound")
+            except ObjectNotFound:
+                check(True, "download_to of a missing object raises ObjectNotFound")
+
+        status, content = fetch(await storage.presigned_url(key, expires_in=60))
+        check(status == 200 and content == body, f"presigned URL serves the object ({status})")
+
+        await storage.delete(key)
+        check(await storage.head(key) is None, "delete removes the object")
+        status, _ = fetch(await storage.presigned_url(key, expires_in=60))
+        check(status in (403, 404), f"deleted object is no longer served ({status})")
+    finally:
+        await storage.delete(key)
+
+if __name__ == "__main__":
+    asyncio.run(check_storage())
@@ -1,61 +1,290 @@
-from datetime import datetime, timedelta
+"""Seed MongoDB with synthetic agents, links, applications and documents.
+
+The same seed (and anchor date) always produces the same records, ids
+included, so a slow query or a regression can be reproduced from the
+command line that found it. From the backend directory:
+
+    python init_db.py --agents 10 --applications 1000                  # local development
+    python init_db.py --agents 2000 --applications 2000000 --drop \\
+        --db-name rentflow_perf --concurrency 8                       # production scale
+
+Applications are spread over agents with a Zipf-like skew (a few agents
+own most of them, like production) and over statuses by --status-mix.
+Every agent can log in with --password.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import AsyncIterator, Dict, Iterable, List
+
 from bson import ObjectId
+from app.core.config import settings
 from app.core.database import mongodb
+from app.core.lifecycle import ensure_lifecycle_indexes
+from app.core.security import get_password_hash
+from app.models.agent import NotificationMode
 from app.models.application import ApplicationStatus
-from app.core.config import settings
 
-async def init_db():
-    # Initialize MongoDB connection
-    await mongodb.connect_to_mongo()
+FIRST_NAMES = ["Olivia", "Liam", "Emma", "Noah", "Amelia", "Oliver", "Ava", "Elijah", "Sophia", "Lucas",
+               "Mia", "Mateo", "Chloe", "Ethan", "Priya", "Wei", "Fatima", "Omar", "Hana", "Diego"]
+LAST_NAMES = ["Smith", "Brown", "Tremblay", "Martin", "Roy", "Wilson", "Macdonald", "Gagnon", "Johnson", "Lee",
+              "Taylor", "Campbell", "Anderson", "Patel", "Nguyen", "Singh", "Chen", "Garcia", "Kim", "Khan"]
+COMPANIES = ["Maple Realty", "Harbourfront Homes", "Northern Key Properties", "Lakeshore Leasing", "Urban Nest"]
+DOCUMENT_TYPES = ["Government ID", "Pay Stub", "Employment Letter", "Credit Report", "Bank Statement", "Reference Letter"]
+PROMPT_ANSWERS = [
+    "Quiet professional, no pets, non-smoker.",
+    "Relocating for work and looking for a long-term lease.",
+    "Student with a guarantor; happy to provide references.",
+    "Family of four with a small dog.",
+    "Working from home, so I value a bright second bedroom.",
+]
+
+DEFAULT_STATUS_MIX = "draft=0.25,submitted=0.15,in_review=0.2,approved=0.25,rejected=0.15"
+
+def parse_status_mix(value: str) -> Dict[ApplicationStatus, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[ApplicationStatus(name.strip())] = float(weight)
+    return mix
+
+def seeded_id(created_at: datetime, number: int) -> ObjectId:
+    """A deterministic ObjectId that still sorts by creation time."""
+    seconds = int(created_at.replace(tzinfo=timezone.utc).timestamp())
+    return ObjectId(seconds.to_bytes(4, "big") + number.to_bytes(8, "big"))
+
+def batch_rng(seed: int, collection: str, batch: int) -> random.Random:
+    # Independent per batch, so batches can be built in any order
+    return random.Random(f"{seed}:{collection}:{batch}")
+
+class Seeder:
+    def __init__(self, args):
+        self.args = args
+        self.anchor = datetime.combine(args.anchor, datetime.min.time())
+        self.status_mix = parse_status_mix(args.status_mix)
+        self.password_hash = get_password_hash(args.password)
+        # Zipf-like weights: agent n gets 1 / n^skew of the applications
+        self.agent_weights = list(accumulate(1 / (rank + 1) ** args.agent_skew for rank in range(args.agents)))
+
+    def agent_id(self, number: int) -> ObjectId:
+        return seeded_id(self.anchor - timedelta(days=self.args.days), number)
+
+    def agents(self, batch: int, numbers: range) -> List[dict]:
+        rng = batch_rng(self.args.seed, "agents", batch)
+        modes = list(NotificationMode)
+        agents = []
+        for number in numbers:
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            created_at = self.anchor - timedelta(days=self.args.days) + timedelta(hours=rng.uniform(0, 24))
+            agents.append({
+                "_id": self.agent_id(number),
+                "email": f"agent{number}@seed.example.com",
+                "first_name": first_name,
+                "last_name": last_name,
+                "company_name": rng.choice(COMPANIES),
+                "phone": f"416-555-{number % 10000:04d}",
+                "hashed_password": self.password_hash,
+                "settings": {
+                    "brand_name": f"{first_name} {last_name} Realty",
+                    "brand_color": f"#{rng.randrange(0x1000000):06x}",
+                    "enable_notifications": rng.random() < 0.9,
+                    "notification_mode": rng.choices(modes, weights=[0.6, 0.25, 0.15])[0].value
+                },
+                "is_active": True,
+                "is_verified": True,
+                "created_at": created_at,
+                "updated_at": created_at
+            })
+        return agents
+
+    def links(self, batch: int, numbers: range) -> List[dict]:
+        rng = batch_rng(self.args.seed, "links", batch)
+        links = []
+        for number in numbers:
+            created_at = self.anchor - timedelta(days=rng.uniform(0, self.args.days))
+            link_id = seeded_id(created_at, number)
+            link = {
+                "_id": link_id,
+                "link_id": str(link_id),
+                "agent_id": str(self.agent_id(number % self.args.agents)),
+                "created_at": created_at,
+                "is_active": rng.random() < 0.95,
+                "uses": rng.randrange(0, 20)
+            }
+            if rng.random() < 0.3:
+                # Expiry is in the future so the TTL index keeps them
+                link["expires_at"] = self.anchor + timedelta(days=rng.randint(1, 30))
+            if rng.random() < 0.2:
+                link["max_uses"] = link["uses"] + rng.randint(1, 10)
+            links.append(link)
+        return links
+
+    def applications(self, batch: int, numbers: range) -> tuple:
+        """Applications and their documents, generated together so the
+        documents can reference the application ids."""
+        rng = batch_rng(self.args.seed, "applications", batch)
+        statuses, weights = list(self.status_mix), list(self.status_mix.values())
+        applications, documents = [], []
+        for number in numbers:
+            agent_number = rng.choices(range(self.args.agents), cum_weights=self.agent_weights)[0]
+            status = rng.choices(statuses, weights=weights)[0]
+            if status == ApplicationStatus.DRAFT:
+                # Older drafts would be removed by the draft TTL index straight away
+                created_at = self.anchor - timedelta(days=rng.uniform(0, min(self.args.days, settings.DRAFT_TTL_DAYS - 1)))
+            else:
+                created_at = self.anchor - timedelta(days=rng.uniform(0, self.args.days))
+            updated_at = min(self.anchor, created_at + timedelta(hours=rng.uniform(0, 72)))
+            application_id = seeded_id(created_at, number)
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            answers = rng.sample(PROMPT_ANSWERS, 2)
+            application = {
+                "_id": application_id,
+                "agent_id": str(self.agent_id(agent_number)),
+                "status": status.value,
+                "bio_info": {
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "bio": f"{first_name} {last_name}, applying through the seeded link.",
+                    "move_in_date": created_at + timedelta(days=rng.randint(14, 90)),
+                    "profile_image": None,
+                    "prompts": {"about": answers[0], "why_here": answers[1]}
+                },
+                "orea_form": None,
+                "search": {
+                    "first_name": first_name.lower(),
+                    "last_name": last_name.lower(),
+                    "prompts": answers
+                },
+                "version": rng.randint(1, 12),
+                "created_at": created_at,
+                "updated_at": updated_at
+            }
+            if status not in (ApplicationStatus.DRAFT, ApplicationStatus.SUBMITTED):
+                application["document_uploaded_at"] = updated_at
+                count = max(1, round(rng.expovariate(1 / self.args.documents_per_application)))
+                for index in range(count):
+                    document_type = DOCUMENT_TYPES[index % len(DOCUMENT_TYPES)]
+                    key = f"documents/{application_id}/{index}.pdf"
+                    documents.append({
+                        "application_id": str(application_id),
+                        "type": document_type,
+                        "url": f"{settings.API_BASE_URL}{settings.API_V1_STR}/files/{key}",
+                        "key": key,
+                        "uploaded_at": updated_at
+                    })
+            if status in (ApplicationStatus.APPROVED, ApplicationStatus.REJECTED) and rng.random() < 0.5:
+                application["notes"] = rng.choice(["Strong references.", "Income verified.", "Incomplete history."])
+            applications.append(application)
+        return applications, documents
+
+def batches(total: int, size: int) -> Iterable[tuple]:
+    for batch, start in enumerate(range(0, total, size)):
+        yield batch, range(start, min(start + size, total))
+
+class Throughput:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.inserted: Dict[str, int] = {}
+        self.last_report = self.started
+
+    def add(self, collection: str, count: int):
+        self.inserted[collection] = self.inserted.get(collection, 0) + count
+        now = time.perf_counter()
+        if now - self.last_report >= 5:
+            self.last_report = now
+            total = sum(self.inserted.values())
+            print(f"  {total:,} documents in {now - self.started:.0f}s ({total / (now - self.started):,.0f}/s)")
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started
+        for collection, count in self.inserted.items():
+            print(f"{collection:22} {count:>12,}")
+        total = sum(self.inserted.values())
+        print(f"{'total':22} {total:>12,} in {elapsed:.1f}s ({total / elapsed:,.0f} documents/s)")
+
+async def insert_all(db, jobs: AsyncIterator[Dict[str, List[dict]]], concurrency: int, throughput: Throughput):
+    """Run up to `concurrency` unordered insert_many calls at once while the
+    next batches are generated."""
+    semaphore = asyncio.Semaphore(concurrency)
+    pending = set()
+
+    async def insert(collection: str, documents: List[dict]):
+        try:
+            await db[collection].insert_many(documents, ordered=False)
+            throughput.add(collection, len(documents))
+        finally:
+            semaphore.release()
+
+    async for job in jobs:
+        for collection, documents in job.items():
+            if not documents:
+                continue
+            await semaphore.acquire()
+            task = asyncio.create_task(insert(collection, documents))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+    await asyncio.gather(*pending)
+
+async def init_db(args):
+    await mongodb.connect_to_database()
+    if args.db_name:
+        mongodb.db = mongodb.client[args.db_name]
     db = mongodb.get_db()
-    
-    # Create applications collection if it doesn't exist
-    if "applications" not in await db.list_collection_names():
-        await db.create_collection("applications")
-    
-    # Get an agent ID to associate with the applications
-    agent = await db.agents.find_one()
-    if not agent:
-        print("No agents found in the database. Please create an agent first.")
+
+    if args.drop:
+        for collection in ("agents", "application_links", "applications", "application_documents"):
+            await db[collection].drop()
+    elif await db.agents.find_one({"email": {"$regex": r"@seed\.example\.com$"}}):
+        print(f"{db.name} already has seeded agents; rerun with --drop to replace them")
+        await mongodb.close_database_connection()
         return
-    
-    agent_id = agent["_id"]
-    
-    # Create some test applications
-    applications = [
-        {
-            "agent_id": agent_id,
-            "status": ApplicationStatus.APPROVED,
-            "bio_submitted_at": datetime.utcnow() - timedelta(days=7),
-            "document_uploaded_at": datetime.utcnow() - timedelta(days=6),
-            "created_at": datetime.utcnow() - timedelta(days=7),
-            "updated_at": datetime.utcnow() - timedelta(days=6)
-        },
-        {
-            "agent_id": agent_id,
-            "status": ApplicationStatus.FORWARDED,
-            "bio_submitted_at": datetime.utcnow() - timedelta(days=5),
-            "document_uploaded_at": datetime.utcnow() - timedelta(days=4),
-            "created_at": datetime.utcnow() - timedelta(days=5),
-            "updated_at": datetime.utcnow() - timedelta(days=4)
-        },
-        {
-            "agent_id": agent_id,
-            "status": ApplicationStatus.REVIEWED,
-            "bio_submitted_at": datetime.utcnow() - timedelta(days=3),
-            "document_uploaded_at": datetime.utcnow() - timedelta(days=2),
-            "created_at": datetime.utcnow() - timedelta(days=3),
-            "updated_at": datetime.utcnow() - timedelta(days=2)
-        }
-    ]
-    
-    # Insert the test applications
-    result = await db.applications.insert_many(applications)
-    print(f"Inserted {len(result.inserted_ids)} test applications")
-    
-    # Close MongoDB connection
-    await mongodb.close_mongo_connection()
+
+    seeder = Seeder(args)
+    throughput = Throughput()
+    print(f"Seeding {db.name} (seed {args.seed}, anchor {args.anchor})")
+
+    async def jobs():
+        for batch, numbers in batches(args.agents, args.batch_size):
+            yield {"agents": seeder.agents(batch, numbers)}
+        for batch, numbers in batches(args.agents * args.links_per_agent, args.batch_size):
+            yield {"application_links": seeder.links(batch, numbers)}
+        for batch, numbers in batches(args.applications, args.batch_size):
+            applications, documents = seeder.applications(batch, numbers)
+            yield {"applications": applications, "application_documents": documents}
+            # Let the inserts in flight make progress between batches
+            await asyncio.sleep(0)
+
+    await insert_all(db, jobs(), args.concurrency, throughput)
+    throughput.report()
+
+    # Building indexes once is much faster than maintaining them per insert
+    started = time.perf_counter()
+    await mongodb.create_indexes()
+    await ensure_lifecycle_indexes(db)
+    print(f"Built indexes in {time.perf_counter() - started:.1f}s")
+    print(f"Log in as agent0@seed.example.com with password {args.password!r}")
+
+    await mongodb.close_database_connection()
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(init_db()) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=10)
+    parser.add_argument("--links-per-agent", type=int, default=5)
+    parser.add_argument("--applications", type=int, default=1000)
+    parser.add_argument("--documents-per-application", type=float, default=3.0, help="mean, for applications past submission")
+    parser.add_argument("--status-mix", default=DEFAULT_STATUS_MIX, help="relative weights per status")
+    parser.add_argument("--agent-skew", type=float, default=1.0, help="0 spreads applications evenly over agents")
+    parser.add_argument("--days", type=int, default=365, help="how far back records are created")
+    parser.add_argument("--anchor", type=lambda value: datetime.strptime(value, "%Y-%m-%d").date(),
+                        default=datetime.utcnow().date(), help="date records are relative to (default: today, UTC)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=4, help="insert_many calls in flight")
+    parser.add_argument("--db-name", help=f"database to seed (default: {settings.MONGODB_DB_NAME})")
+    parser.add_argument("--drop", action="store_true", help="drop the seeded collections first")
+    parser.add_argument("--password", default="password123")
+    args = parser.parse_args()
+    asyncio.run(init_db(args))
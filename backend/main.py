@@ -1,12 +1,20 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.database import mongodb
-from app.api.v1.endpoints import auth_router, applications_router, analytics_router, links_router
+from app.core.live_updates import application_changes
+from app.core.lifecycle import ensure_lifecycle_indexes, start_lifecycle_task
+from app.core.notification_digests import start_digest_task
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.deadlines import DeadlineMiddleware
+from app.core.health import loop_lag
+from app.core.structured_logging import RequestIdMiddleware, setup_logging
+from app.api.v1.endpoints import auth_router, applications_router, analytics_router, links_router, events_router, files_router, admin_router, agent_router, health_router
+from app.api.v1.endpoints.applications import autosave_buffer
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging; records are queued and written off the event loop
+log_listener = setup_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -14,6 +22,12 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
+# Innermost: per-route time budgets applied to Mongo, storage and email calls
+app.add_middleware(DeadlineMiddleware)
+
+# Shed abusive traffic on public endpoints; added before CORS so rejections still carry CORS headers
+app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -24,28 +38,56 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+# Outermost, so every log line for a request (rate limiting included) carries its id
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers
 app.include_router(auth_router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(applications_router, prefix=f"{settings.API_V1_STR}/applications", tags=["applications"])
 app.include_router(analytics_router, prefix=f"{settings.API_V1_STR}/analytics", tags=["analytics"])
 app.include_router(links_router, prefix=f"{settings.API_V1_STR}/links", tags=["links"])
+app.include_router(events_router, prefix=f"{settings.API_V1_STR}/events", tags=["events"])
+app.include_router(files_router, prefix=f"{settings.API_V1_STR}/files", tags=["files"])
+app.include_router(admin_router, prefix=f"{settings.API_V1_STR}/admin", tags=["admin"])
+app.include_router(agent_router, prefix=f"{settings.API_V1_STR}/agent", tags=["agent"])
+# Probes for load balancers and orchestrators live at the root
+app.include_router(health_router, tags=["health"])
 
 @app.on_event("startup")
 async def startup_db_client():
     try:
         await mongodb.connect_to_database()
+        await mongodb.create_indexes()
+        await ensure_lifecycle_indexes(mongodb.get_db())
         logger.info("Successfully connected to MongoDB")
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {str(e)}")
-        raise HTTPException(status_code=500, detail="Database connection failed")
+        # Fails startup, so the server exits instead of serving without a database
+        raise RuntimeError("Database connection failed") from e
+    app.state.lifecycle_task = start_lifecycle_task()
+    app.state.digest_task = start_digest_task()
+    app.state.loop_lag_task = loop_lag.start()
+    app.state.accepting_traffic = True
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    # /readyz starts failing so load balancers stop routing here
+    app.state.accepting_traffic = False
+    for task_name in ("lifecycle_task", "digest_task", "loop_lag_task"):
+        task = getattr(app.state, task_name, None)
+        if task:
+            task.cancel()
+    await application_changes.close()
+    try:
+        await autosave_buffer.flush_all()
+    except Exception as e:
+        logger.error(f"Error flushing buffered autosaves: {str(e)}")
     try:
         await mongodb.close_database_connection()
         logger.info("Successfully closed MongoDB connection")
     except Exception as e:
         logger.error(f"Error closing MongoDB connection: {str(e)}")
+    log_listener.stop()
 
 @app.get("/")
 async def root():
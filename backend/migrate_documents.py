@@ -0,0 +1,76 @@
+from datetime import datetime
+from pymongo import UpdateOne
+from app.core.database import mongodb
+
+BATCH_SIZE = 500
+
+async def migrate_documents():
+    """Move embedded `documents` arrays and legacy top-level `document_url`
+    fields out of `applications` into the `application_documents` collection."""
+    await mongodb.connect_to_database()
+    await mongodb.create_indexes()
+    db = mongodb.get_db()
+
+    query = {"$or": [
+        {"documents.0": {"$exists": True}},
+        {"document_url": {"$exists": True}}
+    ]}
+    projection = {"documents": 1, "document_url": 1, "document_type": 1, "document_uploaded_at": 1, "updated_at": 1}
+
+    migrated_applications = 0
+    migrated_documents = 0
+    document_ops = []
+    application_ops = []
+
+    async for application in db.applications.find(query, projection):
+        application_id = str(application["_id"])
+
+        documents = list(application.get("documents") or [])
+        legacy_url = application.get("document_url")
+        if legacy_url and not any(doc.get("url") == legacy_url for doc in documents):
+            documents.append({
+                "type": application.get("document_type") or "Unknown",
+                "url": legacy_url,
+                "uploaded_at": application.get("document_uploaded_at") or application.get("updated_at") or datetime.utcnow()
+            })
+
+        for doc in documents:
+            # Upserted by (application, url), so a rerun finds what it wrote
+            document_ops.append(UpdateOne(
+                {"application_id": application_id, "url": doc["url"]},
+                {"$setOnInsert": {
+                    "type": doc.get("type") or "Unknown",
+                    "uploaded_at": doc.get("uploaded_at") or datetime.utcnow()
+                }},
+                upsert=True
+            ))
+
+        application_ops.append(UpdateOne(
+            {"_id": application["_id"]},
+            {"$unset": {"documents": "", "document_url": "", "document_type": ""}}
+        ))
+        migrated_applications += 1
+        migrated_documents += len(documents)
+
+        if len(application_ops) >= BATCH_SIZE:
+            await _flush(db, document_ops, application_ops)
+
+    await _flush(db, document_ops, application_ops)
+    print(f"Moved {migrated_documents} documents from {migrated_applications} applications")
+
+    await mongodb.close_database_connection()
+
+async def _flush(db, document_ops, application_ops):
+    # Documents are written before the source fields are removed, so a rerun
+    # after a crash picks the application up again; the upserts keep it from
+    # recording its documents twice
+    if document_ops:
+        await db.application_documents.bulk_write(document_ops, ordered=False)
+    if application_ops:
+        await db.applications.bulk_write(application_ops, ordered=False)
+    document_ops.clear()
+    application_ops.clear()
+
+if __name__ == "__main__":
+    import asyncio
+    asyncio.run(migrate_documents())
@@ -5,6 +5,7 @@ import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@
 import { Badge } from "@/components/ui/badge";
 import { Skeleton } from "@/components/ui/skeleton";
 import { useApplication } from "@/hooks/useApplication";
+import { useApplicationEvents } from "@/hooks/useApplicationEvents";
 import { ApplicationDisplay, ApplicationStatus } from "@/types/application";
 
 interface RecentApplicationsProps {
@@ -16,6 +17,9 @@ export const RecentApplications = ({ isLoading: parentLoading }: RecentApplicati
   const [applications, setApplications] = useState<ApplicationDisplay[]>([]);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  // Bumped by change events so the list refreshes without polling
+  const [refreshKey, setRefreshKey] = useState(0);
+  useApplicationEvents(() => setRefreshKey(key => key + 1));
 
   useEffect(() => {
     const fetchApplications = async () => {
@@ -41,7 +45,8 @@ export const RecentApplications = ({ isLoading: parentLoading }: RecentApplicati
     };
 
     fetchApplications();
-  }, [getApplications]);
+    // Not keyed on getApplications: it is recreated on every render
+  }, [refreshKey]);
 
   const getStatusBadgeVariant = (status: ApplicationStatus) => {
     switch (status) {
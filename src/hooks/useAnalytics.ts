@@ -1,7 +1,8 @@
 
-import { useState } from 'react';
-import { useQuery } from '@tanstack/react-query';
+import { useCallback } from 'react';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
 import { apiClient } from '@/lib/api/apiClient';
+import { useApplicationEvents } from '@/hooks/useApplicationEvents';
 
 export interface AnalyticsData {
   totalApplications: number;
@@ -15,37 +16,39 @@ export interface AnalyticsData {
 }
 
 export const useAnalytics = () => {
+  const queryClient = useQueryClient();
   const { data, isLoading, error, refetch } = useQuery({
     queryKey: ['dashboardAnalytics'],
     queryFn: async () => {
       try {
-        // This is a mock for now since we don't have the actual API
+        const response = await apiClient.getDashboardAnalytics();
         return {
-          totalApplications: 24,
-          forwardedApplications: 8,
-          inReviewApplications: 6,
-          averageCompletionTime: 75, // in minutes
-          weeklyBreakdown: [
-            { week: 'Week 1', count: 5 },
-            { week: 'Week 2', count: 7 },
-            { week: 'Week 3', count: 3 },
-            { week: 'Week 4', count: 9 }
-          ]
+          totalApplications: response.totalApplications,
+          // Approved applications are the ones passed on to landlords
+          forwardedApplications: response.approvedApplications,
+          inReviewApplications: response.inReviewApplications,
+          averageCompletionTime: Math.round(response.averageCompletionTime),
+          weeklyBreakdown: response.weeklyBreakdown
         } as AnalyticsData;
       } catch (error) {
         console.error("Error fetching analytics data:", error);
         throw error;
       }
-    }
+    },
+    // Change events invalidate the query; no need to refetch on focus
+    refetchOnWindowFocus: false
   });
 
-  const fetchDashboardData = async () => {
-    return await refetch();
-  };
+  // Refetch when any of the agent's applications changes, instead of polling
+  useApplicationEvents(() => {
+    queryClient.invalidateQueries({ queryKey: ['dashboardAnalytics'] });
+  });
 
-  const refreshData = async () => {
+  const fetchDashboardData = useCallback(async () => {
     return await refetch();
-  };
+  }, [refetch]);
+
+  const refreshData = fetchDashboardData;
 
   return {
     dashboardData: data,
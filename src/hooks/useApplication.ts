@@ -100,7 +100,7 @@ export const useApplication = (applicationId?: string) => {
             });
             setState(prev => ({
                 ...prev,
-                application: updatedApplication,
+                application: { ...updatedApplication, documents: updatedApplication.documents ?? prev.application?.documents },
                 isLoading: false,
             }));
             return updatedApplication;
@@ -122,7 +122,7 @@ export const useApplication = (applicationId?: string) => {
             } as Partial<Application>);
             setState(prev => ({
                 ...prev,
-                application: updatedApplication,
+                application: { ...updatedApplication, documents: updatedApplication.documents ?? prev.application?.documents },
                 isLoading: false,
             }));
             return updatedApplication;
@@ -144,7 +144,7 @@ export const useApplication = (applicationId?: string) => {
             } as Partial<Application>);
             setState(prev => ({
                 ...prev,
-                application: updatedApplication,
+                application: { ...updatedApplication, documents: updatedApplication.documents ?? prev.application?.documents },
                 isLoading: false,
             }));
             return updatedApplication;
@@ -166,7 +166,7 @@ export const useApplication = (applicationId?: string) => {
             });
             setState(prev => ({
                 ...prev,
-                application: updatedApplication,
+                application: { ...updatedApplication, documents: updatedApplication.documents ?? prev.application?.documents },
                 isLoading: false,
             }));
             return updatedApplication;
@@ -180,6 +180,22 @@ export const useApplication = (applicationId?: string) => {
         }
     };
 
+    const uploadDocuments = async (documents: { file: File; type: string }[]) => {
+        try {
+            setState(prev => ({ ...prev, isLoading: true, error: null }));
+            const result = await apiClient.uploadDocuments(applicationId!, documents);
+            setState(prev => ({ ...prev, isLoading: false }));
+            return result;
+        } catch (error) {
+            setState(prev => ({
+                ...prev,
+                isLoading: false,
+                error: error instanceof Error ? error.message : 'Failed to upload documents',
+            }));
+            throw error;
+        }
+    };
+
     const uploadDocument = async (file: File, type: string) => {
         try {
             setState(prev => ({ ...prev, isLoading: true, error: null }));
@@ -208,7 +224,7 @@ export const useApplication = (applicationId?: string) => {
             });
             setState(prev => ({
                 ...prev,
-                application: updatedApplication,
+                application: { ...updatedApplication, documents: updatedApplication.documents ?? prev.application?.documents },
                 isLoading: false,
             }));
             return updatedApplication;
@@ -230,6 +246,7 @@ export const useApplication = (applicationId?: string) => {
         updateIncome,
         updateOREAForm,
         uploadDocument,
+        uploadDocuments,
         updateStatus,
         getApplicationStatistics,
         getApplications
@@ -0,0 +1,82 @@
+import { useEffect, useRef } from 'react';
+import { apiClient } from '@/lib/api/apiClient';
+
+// Change stream operation types the API forwards, plus "resync" when it lost track
+const APPLICATION_EVENT_TYPES = ['insert', 'update', 'replace', 'delete', 'resync'];
+const RECONNECT_DELAY_MS = 5000;
+
+type Listener = () => void;
+
+// One stream per tab, shared by every component that wants change events
+const listeners = new Set<Listener>();
+let source: EventSource | null = null;
+let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
+let connecting = false;
+
+const notify = () => listeners.forEach(listener => listener());
+
+const connect = async (reconnecting: boolean) => {
+    if (source || connecting || listeners.size === 0) {
+        return;
+    }
+    connecting = true;
+    try {
+        const opened = await apiClient.openApplicationEvents();
+        if (listeners.size === 0) {
+            opened.close();
+            return;
+        }
+        source = opened;
+        APPLICATION_EVENT_TYPES.forEach(type => opened.addEventListener(type, notify));
+        opened.onopen = () => {
+            // Anything that changed while disconnected was missed
+            if (reconnecting) {
+                notify();
+            }
+        };
+        opened.onerror = () => {
+            // Tickets are single-use, so the browser's own retry would be refused
+            opened.close();
+            source = null;
+            scheduleReconnect();
+        };
+    } catch {
+        scheduleReconnect();
+    } finally {
+        connecting = false;
+    }
+};
+
+const scheduleReconnect = () => {
+    clearTimeout(reconnectTimer);
+    if (listeners.size > 0) {
+        reconnectTimer = setTimeout(() => connect(true), RECONNECT_DELAY_MS);
+    }
+};
+
+const disconnect = () => {
+    clearTimeout(reconnectTimer);
+    source?.close();
+    source = null;
+};
+
+/**
+ * Calls `onChange` whenever one of the agent's applications changes, so
+ * views can refetch instead of polling.
+ */
+export const useApplicationEvents = (onChange: () => void) => {
+    const onChangeRef = useRef(onChange);
+    onChangeRef.current = onChange;
+
+    useEffect(() => {
+        const listener = () => onChangeRef.current();
+        listeners.add(listener);
+        connect(false);
+        return () => {
+            listeners.delete(listener);
+            if (listeners.size === 0) {
+                disconnect();
+            }
+        };
+    }, []);
+};
@@ -22,6 +22,48 @@ interface ApplicationResponse {
     updated_at: string;
 }
 
+// crypto.randomUUID only exists in secure contexts (HTTPS or localhost);
+// getRandomValues is available everywhere, so fall back to 128 random bits
+const newIdempotencyKey = (): string => {
+    if (typeof crypto.randomUUID === 'function') {
+        return crypto.randomUUID();
+    }
+    const bytes = crypto.getRandomValues(new Uint8Array(16));
+    return Array.from(bytes, byte => byte.toString(16).padStart(2, '0')).join('');
+};
+
+// Matches the API's MAX_DOCUMENTS_PER_BATCH; larger uploads are sent in several batches
+const MAX_DOCUMENTS_PER_BATCH = 10;
+
+interface PresignedUpload {
+    key: string;
+    method: 'POST' | 'PUT';
+    url: string;
+    fields: Record<string, string>;
+    headers: Record<string, string>;
+    expires_at: string;
+}
+
+interface ImageVariant {
+    width: number;
+    height: number;
+    url: string;
+}
+
+export interface PublicBranding {
+    brand_name?: string;
+    brand_color?: string;
+    logo_url?: string;
+    logo_variants?: ImageVariant[];
+    background_image_url?: string;
+    background_image_variants?: ImageVariant[];
+}
+
+interface LinkBootstrap {
+    isValid: boolean;
+    branding: PublicBranding | null;
+}
+
 interface ApiError {
     message: string;
     status?: number;
@@ -182,18 +224,76 @@ class ApiClient {
         });
     }
 
-    public async uploadDocument(id: string, file: File, type?: string): Promise<void> {
-        const formData = new FormData();
-        formData.append('file', file);
-        if (type) {
-            formData.append('document_type', type);
+    private async sendToStorage(upload: PresignedUpload, file: File): Promise<void> {
+        let response: Response;
+        if (upload.method === 'POST') {
+            const formData = new FormData();
+            Object.entries(upload.fields).forEach(([name, value]) => formData.append(name, value));
+            formData.append('file', file);
+            response = await fetch(upload.url, { method: 'POST', body: formData });
+        } else {
+            response = await fetch(upload.url, { method: 'PUT', headers: upload.headers, body: file });
+        }
+        if (!response.ok) {
+            throw { message: 'Upload failed', status: response.status } as ApiError;
         }
+    }
+
+    public async uploadDocument(id: string, file: File, type?: string): Promise<void> {
+        // Ask the API for a presigned upload, send the file straight to storage, then record it
+        const { upload } = await this.request<{ upload: PresignedUpload }>({
+            method: 'POST',
+            url: API_CONFIG.ENDPOINTS.APPLICATIONS.PRESIGN_DOCUMENT(id),
+            data: { content_type: file.type, size: file.size, document_type: type },
+        });
+
+        await this.sendToStorage(upload, file);
 
         await this.request({
             method: 'POST',
-            url: API_CONFIG.ENDPOINTS.APPLICATIONS.DOCUMENTS(id),
-            data: formData,
+            url: API_CONFIG.ENDPOINTS.APPLICATIONS.CONFIRM_DOCUMENT(id),
+            data: { key: upload.key, document_type: type },
+        });
+    }
+
+    public async uploadDocuments(id: string, documents: { file: File; type: string }[]): Promise<{ document_urls: string[] }> {
+        // Presigned like uploadDocument, but one presign and one confirm call
+        // (and one notification to the agent) per batch
+        const documentUrls: string[] = [];
+        for (let start = 0; start < documents.length; start += MAX_DOCUMENTS_PER_BATCH) {
+            const batch = documents.slice(start, start + MAX_DOCUMENTS_PER_BATCH);
+            const { uploads } = await this.request<{ uploads: { upload: PresignedUpload }[] }>({
+                method: 'POST',
+                url: API_CONFIG.ENDPOINTS.APPLICATIONS.PRESIGN_DOCUMENTS(id),
+                data: {
+                    documents: batch.map(({ file, type }) => ({ content_type: file.type, size: file.size, document_type: type })),
+                },
+            });
+
+            await Promise.all(uploads.map(({ upload }, index) => this.sendToStorage(upload, batch[index].file)));
+
+            const { document_urls } = await this.request<{ document_urls: string[] }>({
+                method: 'POST',
+                url: API_CONFIG.ENDPOINTS.APPLICATIONS.CONFIRM_DOCUMENTS(id),
+                data: {
+                    documents: uploads.map(({ upload }, index) => ({ key: upload.key, document_type: batch[index].type })),
+                },
+            });
+            documentUrls.push(...document_urls);
+        }
+
+        return { document_urls: documentUrls };
+    }
+
+    public async openApplicationEvents(): Promise<EventSource> {
+        // EventSource can't send the bearer token, so trade it for a single-use ticket
+        const { ticket } = await this.request<{ ticket: string }>({
+            method: 'POST',
+            url: API_CONFIG.ENDPOINTS.EVENTS.TICKETS,
         });
+        return new EventSource(
+            `${API_CONFIG.BASE_URL}${API_CONFIG.ENDPOINTS.EVENTS.APPLICATIONS}?ticket=${encodeURIComponent(ticket)}`
+        );
     }
 
     public async getDashboardAnalytics(): Promise<any> {
@@ -217,6 +317,19 @@ class ApiClient {
         });
     }
 
+    public async generateApplicationLinks(options: {
+        count: number;
+        expires_in_days?: number;
+        max_uses?: number;
+        label?: string;
+    }): Promise<{ links: { link_id: string; url: string }[]; expires_at: string | null; max_uses: number | null }> {
+        return this.request({
+            method: 'POST',
+            url: API_CONFIG.ENDPOINTS.LINKS.BULK,
+            data: options,
+        });
+    }
+
     public async validateApplicationLink(linkId: string): Promise<{ isValid: boolean }> {
         return this.request<{ isValid: boolean }>({
           method: 'GET',
@@ -224,11 +337,27 @@ class ApiClient {
         });
       }
     
+      public async bootstrapApplicationLink(linkId: string): Promise<LinkBootstrap> {
+        return this.request<LinkBootstrap>({
+          method: 'GET',
+          url: API_CONFIG.ENDPOINTS.LINKS.BOOTSTRAP(linkId)
+        });
+      }
+    
       public async startApplication(linkId: string): Promise<Application> {
+        // Reuse one key per link for this browser session so refreshes and
+        // double-clicks resume the same draft instead of creating new ones
+        const storageKey = `application-start:${linkId}`;
+        let idempotencyKey = sessionStorage.getItem(storageKey);
+        if (!idempotencyKey) {
+          idempotencyKey = newIdempotencyKey();
+          sessionStorage.setItem(storageKey, idempotencyKey);
+        }
+
         return this.request<Application>({
           method: 'POST',
           url: `${API_CONFIG.ENDPOINTS.APPLICATIONS.BASE}/start`,
-          data: { link_id: linkId }
+          data: { link_id: linkId, idempotency_key: idempotencyKey }
         });
       }
 }
@@ -14,12 +14,23 @@ export const API_CONFIG = {
             BASE: '/api/v1/applications',
             BY_ID: (id: string) => `/api/v1/applications/${id}`,
             DOCUMENTS: (id: string) => `/api/v1/applications/${id}/documents`,
+            DOCUMENTS_BATCH: (id: string) => `/api/v1/applications/${id}/documents/batch`,
+            PRESIGN_DOCUMENT: (id: string) => `/api/v1/applications/${id}/documents/presign`,
+            CONFIRM_DOCUMENT: (id: string) => `/api/v1/applications/${id}/documents/confirm`,
+            PRESIGN_DOCUMENTS: (id: string) => `/api/v1/applications/${id}/documents/presign/batch`,
+            CONFIRM_DOCUMENTS: (id: string) => `/api/v1/applications/${id}/documents/confirm/batch`,
             BY_LINK: '/api/v1/applications/by-link',
             UPDATE_STATUS: '/api/v1/applications/update-status',
         },
         LINKS: {
             GENERATE: '/api/v1/links/generate',
+            BULK: '/api/v1/links/bulk',
             VALIDATE: (linkId: string) => `/api/v1/links/validate/${linkId}`,
+            BOOTSTRAP: (linkId: string) => `/api/v1/links/bootstrap/${linkId}`,
+        },
+        EVENTS: {
+            TICKETS: '/api/v1/events/tickets',
+            APPLICATIONS: '/api/v1/events/applications',
         },
         ANALYTICS: {
             DASHBOARD: '/api/v1/analytics/dashboard',
@@ -4,7 +4,7 @@ import Layout from "@/components/layout/Layout";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card";
 import { useToast } from "@/hooks/use-toast";
-import { apiClient } from "@/lib/api/apiClient";
+import { apiClient, PublicBranding } from "@/lib/api/apiClient";
 import { Skeleton } from "@/components/ui/skeleton";
 
 const ApplicationLink = () => {
@@ -13,6 +13,7 @@ const ApplicationLink = () => {
   const { toast } = useToast();
   const [isLoading, setIsLoading] = useState(true);
   const [isValid, setIsValid] = useState(false);
+  const [branding, setBranding] = useState<PublicBranding | null>(null);
   const [startingApp, setStartingApp] = useState(false);
 
   useEffect(() => {
@@ -24,8 +25,10 @@ const ApplicationLink = () => {
           throw new Error("Invalid link ID");
         }
 
-        const response = await apiClient.validateApplicationLink(linkId);
+        // One cacheable request for link validity and the agent's branding
+        const response = await apiClient.bootstrapApplicationLink(linkId);
         setIsValid(response.isValid);
+        setBranding(response.branding);
       } catch (error) {
         console.error("Link validation error:", error);
         toast({
@@ -107,7 +110,18 @@ const ApplicationLink = () => {
       <div className="py-12 px-4 sm:px-6 lg:px-8 max-w-4xl mx-auto">
         <Card className="shadow-lg">
           <CardHeader className="text-center">
-            <CardTitle className="text-3xl font-bold text-rentmate-primary">Rental Application</CardTitle>
+            {branding?.logo_variants?.length ? (
+              <img
+                src={branding.logo_variants[0].url}
+                srcSet={branding.logo_variants.map((variant) => `${variant.url} ${variant.width}w`).join(", ")}
+                sizes="128px"
+                alt={branding.brand_name || "Agent logo"}
+                className="h-16 mx-auto mb-4 object-contain"
+              />
+            ) : null}
+            <CardTitle className="text-3xl font-bold text-rentmate-primary" style={branding?.brand_color ? { color: branding.brand_color } : undefined}>
+              {branding?.brand_name ? `${branding.brand_name} Rental Application` : "Rental Application"}
+            </CardTitle>
             <CardDescription className="text-lg">
               You've been invited to complete a rental application
             </CardDescription>
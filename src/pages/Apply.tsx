@@ -22,7 +22,7 @@ const Apply = () => {
     error, 
     updateBioInfo,
     updateOREAForm, 
-    uploadDocument,
+    uploadDocuments,
     updateStatus 
   } = useApplication(id);
 
@@ -111,45 +111,46 @@ const Apply = () => {
     try {
       setCanGoNext(false);
       
-      // Process file uploads
-      const uploadPromises = [];
+      // Collect every file and upload them together in one request
+      const documents: { file: File; type: string }[] = [];
       
       // Handle paystubs (multiple files)
       if (data.paystubs && data.paystubs.length > 0) {
         for (let i = 0; i < data.paystubs.length; i++) {
-          uploadPromises.push(uploadDocument(data.paystubs[i], 'paystubs'));
+          documents.push({ file: data.paystubs[i], type: 'paystubs' });
         }
       }
       
       // Handle government ID
       if (data.governmentId && data.governmentId.length > 0) {
-        uploadPromises.push(uploadDocument(data.governmentId[0], 'governmentId'));
+        documents.push({ file: data.governmentId[0], type: 'governmentId' });
       }
       
       // Handle employment letter
       if (data.employmentLetter && data.employmentLetter.length > 0) {
-        uploadPromises.push(uploadDocument(data.employmentLetter[0], 'employmentLetter'));
+        documents.push({ file: data.employmentLetter[0], type: 'employmentLetter' });
       }
       
       // Handle self-employed documents if applicable
       if (data.isSelfEmployed === 'yes') {
         if (data.noticeOfAssessment && data.noticeOfAssessment.length > 0) {
-          uploadPromises.push(uploadDocument(data.noticeOfAssessment[0], 'noticeOfAssessment'));
+          documents.push({ file: data.noticeOfAssessment[0], type: 'noticeOfAssessment' });
         }
         
         if (data.t5Form && data.t5Form.length > 0) {
-          uploadPromises.push(uploadDocument(data.t5Form[0], 't5Form'));
+          documents.push({ file: data.t5Form[0], type: 't5Form' });
         }
         
         if (data.bankStatements && data.bankStatements.length > 0) {
           for (let i = 0; i < data.bankStatements.length; i++) {
-            uploadPromises.push(uploadDocument(data.bankStatements[i], 'bankStatements'));
+            documents.push({ file: data.bankStatements[i], type: 'bankStatements' });
           }
         }
       }
       
-      // Wait for all uploads to complete
-      await Promise.all(uploadPromises);
+      if (documents.length > 0) {
+        await uploadDocuments(documents);
+      }
       
       setCurrentStep(3);
       setCanGoNext(true);